@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Generation Profile Benchmark - latency, thinking tokens and score agreement per profile
+Runs the full pipeline on a fixed candidate set once per profile and compares scores with the reference profile
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+local_gemini = module_loader.load_module("[SHARED][CODE]_Local_Gemini.py", "local_gemini")
+vertex_client = master.vertex_client
+generation_profiles = master.generation_profiles
+
+# Default benchmark settings; scores of every profile are compared with REFERENCE_PROFILE
+DEFAULT_CANDIDATES = 3
+REFERENCE_PROFILE = "thorough"
+DEFAULT_OUTPUT_FILE = "[BENCH][OUTPUT]_Generation_Profiles.json"
+
+# Minimal one-page PDF used as the offline benchmark CV
+SAMPLE_PDF = (
+    b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n"
+    b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >> endobj\n"
+    b"trailer << /Root 1 0 R >>\n%%EOF\n"
+)
+
+def make_sample_cvs(cv_dir, count):
+    """Write count distinct sample CV PDFs and return their paths"""
+    paths = []
+    for index in range(count):
+        path = os.path.join(cv_dir, f"candidate_{index:03d}.pdf")
+        with open(path, "wb") as f:
+            f.write(SAMPLE_PDF + f"% candidate {index}\n".encode("ascii"))
+        paths.append(path)
+    return paths
+
+def configure_backend(live, output_tokens_per_second):
+    """Disable response caching (every profile must really run) and pick the backend"""
+    master.response_cache.configure(enabled=False)
+    if live:
+        return None
+    backend = local_gemini.LocalGeminiBackend(
+        output_tokens_per_second=output_tokens_per_second,
+        responder=local_gemini.schema_responder,
+        simulate_thinking=True
+    )
+    vertex_client.set_model_factory(backend)
+    return backend
+
+def run_candidate(cv_file, profile, output_dir):
+    """Run the complete pipeline for one candidate under one profile"""
+    os.makedirs(output_dir, exist_ok=True)
+    pipeline = master.HRAutomationPipeline(cv_file, master.DEFAULT_JOB_DESCRIPTION, output_dir=output_dir,
+                                           deduplicate=False, prescreen="off", generation_profile=profile, store_results=False, resume=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        success = pipeline.run_complete_pipeline()
+
+    final_report = pipeline.results.get("final_report", {})
+    call_summary = pipeline.call_summary or {}
+    return {
+        "cv_file": cv_file,
+        "success": success,
+        "duration_seconds": round(pipeline.total_duration, 3),
+        "critical_path_seconds": round(pipeline.critical_path_seconds, 3),
+        "scores": final_report.get("phase_scores", {}),
+        "recommendation": final_report.get("overall_assessment", {}).get("recommendation"),
+        "thinking_tokens": call_summary.get("thinking_tokens", 0),
+        "output_tokens": call_summary.get("output_tokens", 0),
+        "estimated_cost_usd": call_summary.get("estimated_cost_usd", 0.0)
+    }
+
+def score_agreement(runs, reference_runs):
+    """Mean absolute score difference and recommendation match rate against the reference runs"""
+    differences = {"screening_score": [], "assessment_score": []}
+    matches = 0
+    for run, reference in zip(runs, reference_runs):
+        for name, values in differences.items():
+            if name in run["scores"] and name in reference["scores"]:
+                values.append(abs(run["scores"][name] - reference["scores"][name]))
+        matches += 1 if run["recommendation"] == reference["recommendation"] else 0
+    return {
+        "mean_abs_screening_diff": round(sum(differences["screening_score"]) / len(differences["screening_score"]), 2) if differences["screening_score"] else None,
+        "mean_abs_assessment_diff": round(sum(differences["assessment_score"]) / len(differences["assessment_score"]), 2) if differences["assessment_score"] else None,
+        "recommendation_agreement": round(matches / len(runs), 3) if runs else None
+    }
+
+def summarize_profile(profile, runs):
+    """Latency and token totals of one profile's runs"""
+    count = len(runs)
+    return {
+        "profile": profile,
+        "settings": generation_profiles.PROFILES[profile],
+        "successful_runs": sum(1 for run in runs if run["success"]),
+        "mean_duration_seconds": round(sum(run["duration_seconds"] for run in runs) / count, 3),
+        "mean_critical_path_seconds": round(sum(run["critical_path_seconds"] for run in runs) / count, 3),
+        "mean_thinking_tokens": round(sum(run["thinking_tokens"] for run in runs) / count, 1),
+        "estimated_cost_usd": round(sum(run["estimated_cost_usd"] for run in runs), 6),
+        "runs": runs
+    }
+
+def run_benchmark(cv_files=None, profiles=None, candidates=DEFAULT_CANDIDATES, live=False,
+                  output_tokens_per_second=local_gemini.OUTPUT_TOKENS_PER_SECOND):
+    """Run every profile over the same candidates and compare each with the reference profile"""
+    profiles = profiles or list(generation_profiles.PROFILES)
+    work_dir = tempfile.mkdtemp(prefix="hr_profiles_")
+    try:
+        configure_backend(live, output_tokens_per_second)
+        cv_files = cv_files or make_sample_cvs(work_dir, candidates)
+
+        runs = {}
+        for profile in profiles:
+            runs[profile] = [
+                run_candidate(cv_file, profile, os.path.join(work_dir, profile, f"candidate_{index:03d}"))
+                for index, cv_file in enumerate(cv_files)
+            ]
+
+        reference = REFERENCE_PROFILE if REFERENCE_PROFILE in runs else profiles[0]
+        results = []
+        for profile in profiles:
+            summary = summarize_profile(profile, runs[profile])
+            summary["agreement_with_reference"] = score_agreement(runs[profile], runs[reference])
+            results.append(summary)
+        return {"live": live, "reference_profile": reference, "candidates": len(cv_files), "profiles": results}
+    finally:
+        if not live:
+            vertex_client.set_model_factory(None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def print_report(report):
+    """Print one comparison line per profile"""
+    print(f"\n   {'profile':<10} {'mean s':>8} {'crit. s':>8} {'thinking':>9} {'cost $':>9} {'Δscreen':>8} {'Δassess':>8} {'rec. agree':>10}")
+    for result in report["profiles"]:
+        agreement = result["agreement_with_reference"]
+        print(f"   {result['profile']:<10} {result['mean_duration_seconds']:>8} {result['mean_critical_path_seconds']:>8} {result['mean_thinking_tokens']:>9} "
+              f"{result['estimated_cost_usd']:>9.4f} {str(agreement['mean_abs_screening_diff']):>8} {str(agreement['mean_abs_assessment_diff']):>8} {str(agreement['recommendation_agreement']):>10}")
+    print(f"\n   Score differences are against the '{report['reference_profile']}' profile on {report['candidates']} candidates")
+
+def parse_arguments(argv=None):
+    """Parse benchmark options"""
+    parser = argparse.ArgumentParser(description="Compare generation profiles on a fixed candidate set")
+    parser.add_argument("cv_files", nargs="*", help="CV PDFs to use (default: synthetic sample CVs)")
+    parser.add_argument("--profiles", default=",".join(generation_profiles.PROFILES), help="Comma-separated profiles to compare")
+    parser.add_argument("--candidates", type=int, default=DEFAULT_CANDIDATES, help="Number of synthetic candidates when no CV files are given")
+    parser.add_argument("--live", action="store_true", help="Run on Vertex AI (offline runs use the local stand-in with simulated thinking)")
+    parser.add_argument("--output-tps", type=float, default=local_gemini.OUTPUT_TOKENS_PER_SECOND, help="Simulated output (and thinking) tokens per second offline")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="File to save the JSON report to")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    print("📋 MINMA INC. GENERATION PROFILE BENCHMARK")
+    print("=" * 55)
+
+    missing = [cv_file for cv_file in args.cv_files if not os.path.exists(cv_file)]
+    if missing:
+        print(f"❌ CV files not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    benchmark_report = run_benchmark(
+        cv_files=args.cv_files,
+        profiles=[generation_profiles.validate(name.strip()) for name in args.profiles.split(",") if name.strip()],
+        candidates=args.candidates,
+        live=args.live,
+        output_tokens_per_second=args.output_tps
+    )
+    print_report(benchmark_report)
+    if not args.live:
+        print("\nℹ️  Offline scores come from a deterministic stand-in and always agree; run with --live to measure real score agreement")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(benchmark_report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Benchmark report saved to: {args.output}")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Phase 0 Text-Layer Benchmark - PDF upload vs locally extracted text (and slimmed PDF size)
+Compares input tokens and upload bytes offline; with --live also measures real prompt tokens and latency on Vertex AI
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+pdf_preprocessor = module_loader.load_module("[SHARED][CODE]_PDF_Preprocessor.py", "pdf_preprocessor")
+phase0_module = module_loader.load_module("[PHASE_0][CODE]_CV_Analysis.py", "phase0")
+
+# Sample CVs shipped with the recruitment workflow
+DEFAULT_CV_FILES = ["CV-IT-JP.pdf", "rirekisyovi.pdf"]
+DEFAULT_OUTPUT_FILE = "[BENCH][OUTPUT]_PDF_Text_Layer.json"
+
+def time_request(contents, live):
+    """Send one Phase 0 request to Vertex AI and return (wall seconds, prompt tokens)
+
+    Offline there is nothing meaningful to time: the server-side PDF rasterization
+    this stage avoids cannot be simulated locally, so (None, None) is returned.
+    """
+    if not live:
+        return None, None
+    started = time.perf_counter()
+    response = vertex_client.generate_content(
+        contents, model_name=phase0_module.MODEL_NAME, system_prompt=phase0_module.SYSTEM_PROMPT,
+        generation_config=phase0_module.GENERATION_CONFIG, use_cache=False, phase="bench_phase_0"
+    )
+    wall = time.perf_counter() - started
+    usage = getattr(response, "usage_metadata", None)
+    return round(wall, 4), getattr(usage, "prompt_token_count", None)
+
+def benchmark_cv(cv_file, live):
+    """Compare the whole-PDF request with the text-layer request for one CV"""
+    with open(cv_file, "rb") as f:
+        pdf_data = f.read()
+
+    # Baseline is the original upload; slimming is reported separately
+    pdf_contents, _ = pdf_preprocessor.prepare_pdf_contents(pdf_data, use_text_layer=False, optimize=False)
+    text_contents, report = pdf_preprocessor.prepare_pdf_contents(pdf_data, use_text_layer=True)
+    _, optimization = pdf_preprocessor.optimize_pdf(pdf_data)
+
+    pdf_latency, pdf_prompt_tokens = time_request(pdf_contents, live)
+    result = {
+        "cv_file": cv_file,
+        "pdf_bytes": len(pdf_data),
+        "mode": report["mode"],
+        "backend": report["backend"],
+        "pages": report["pages"],
+        "text_pages": report["text_pages"],
+        "scanned_pages": report["scanned_pages"],
+        "extraction_seconds": report["extraction_seconds"],
+        "pdf_optimization": optimization,
+        "pdf": {"estimated_input_tokens": report["pdf_tokens"], "prompt_tokens": pdf_prompt_tokens, "latency_seconds": pdf_latency}
+    }
+
+    if report["mode"] != "pdf":
+        text_latency, text_prompt_tokens = time_request(text_contents, live)
+        result["text_layer"] = {
+            "estimated_input_tokens": report["input_tokens"],
+            "prompt_tokens": text_prompt_tokens,
+            # Local extraction is part of the text-layer path's latency
+            "latency_seconds": round(text_latency + report["extraction_seconds"], 4) if text_latency is not None else None
+        }
+    return result
+
+def run_benchmark(cv_files, live=False):
+    """Benchmark every available CV file"""
+    return [benchmark_cv(cv_file, live) for cv_file in cv_files]
+
+def format_measured(side):
+    """Render measured prompt tokens and latency (live runs only)"""
+    if side["latency_seconds"] is None:
+        return ""
+    return f" | measured: {side['prompt_tokens']} prompt tokens, {side['latency_seconds']}s"
+
+def print_results(results):
+    """Print a comparison line per CV"""
+    for result in results:
+        print(f"\n📄 {result['cv_file']} ({round(result['pdf_bytes'] / 1024, 1)} KB, mode: {result['mode']}, backend: {result['backend']})")
+        pdf = result["pdf"]
+        print(f"   PDF upload:  ~{pdf['estimated_input_tokens']} tokens{format_measured(pdf)}")
+        optimization = result["pdf_optimization"]
+        if optimization["bytes_saved"]:
+            print(f"   Slimmed PDF: {round(optimization['original_bytes'] / 1024, 1)} KB → {round(optimization['optimized_bytes'] / 1024, 1)} KB (~{optimization['upload_seconds_saved']}s upload saved at {pdf_preprocessor.UPLOAD_MBPS} Mbps)")
+        text = result.get("text_layer")
+        if text:
+            saved = pdf["estimated_input_tokens"] - text["estimated_input_tokens"]
+            print(f"   Text layer:  ~{text['estimated_input_tokens']} tokens ({saved:+d} saved, local extraction {result['extraction_seconds']}s){format_measured(text)}")
+        else:
+            print("   Text layer:  not used (no backend or no usable text layer)")
+
+def parse_arguments(argv=None):
+    """Parse benchmark options"""
+    parser = argparse.ArgumentParser(description="Compare Phase 0 PDF upload with local text-layer extraction")
+    parser.add_argument("cv_files", nargs="*", default=DEFAULT_CV_FILES, help="CV PDFs to benchmark")
+    parser.add_argument("--live", action="store_true", help="Send the requests to Vertex AI and measure real latency/tokens")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="File to save the JSON results to")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    print("📋 MINMA INC. PHASE 0 TEXT-LAYER BENCHMARK")
+    print("=" * 55)
+
+    available = [cv_file for cv_file in args.cv_files if os.path.exists(cv_file)]
+    for cv_file in set(args.cv_files) - set(available):
+        print(f"⚠️  File not found, skipped: {cv_file}")
+    if not available:
+        print("❌ No CV files to benchmark")
+        sys.exit(1)
+
+    results = run_benchmark(available, live=args.live)
+    print_results(results)
+    if not args.live:
+        print("\nℹ️  Token counts are estimates; run with --live to measure prompt tokens and latency on Vertex AI")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Benchmark results saved to: {args.output}")
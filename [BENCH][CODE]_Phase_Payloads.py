@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Inter-Phase Payload Benchmark - indented full JSON vs projected, minified payloads
+Compares the input tokens each phase prompt spends on earlier phase results (estimated offline, counted with --live)
+"""
+
+import os
+import json
+import argparse
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+local_gemini = module_loader.load_module("[SHARED][CODE]_Local_Gemini.py", "local_gemini")
+phase0_module = module_loader.load_module("[PHASE_0][CODE]_CV_Analysis.py", "phase0")
+phase1_module = module_loader.load_module("[PHASE_1][CODE]_Initial_Screening.py", "phase1")
+phase2_module = module_loader.load_module("[PHASE_2][CODE]_Technical_Assessment.py", "phase2")
+phase3_module = module_loader.load_module("[PHASE_3][CODE]_Interview_Briefing.py", "phase3")
+phase4_module = module_loader.load_module("[PHASE_4][CODE]_Culture_Fit_Assessment.py", "phase4")
+
+DEFAULT_OUTPUT_FILE = "[BENCH][OUTPUT]_Phase_Payloads.json"
+
+# Saved phase outputs read from --results-dir, with the schema each must follow
+PHASE_OUTPUTS = {
+    "phase_0": ("[PHASE_0][OUTPUT]_CV_Analysis.json", phase0_module.RESPONSE_SCHEMA),
+    "phase_1": ("[PHASE_1][OUTPUT]_Initial_Screening.json", phase1_module.RESPONSE_SCHEMA),
+    "phase_2": ("[PHASE_2][OUTPUT]_Technical_Assessment.json", phase2_module.RESPONSE_SCHEMA)
+}
+
+def load_phase_outputs(results_dir):
+    """Load saved phase outputs, falling back to schema-filled samples (source is reported)"""
+    outputs = {}
+    for phase, (file_name, schema) in PHASE_OUTPUTS.items():
+        file_path = os.path.join(results_dir, file_name)
+        if os.path.exists(file_path):
+            outputs[phase] = (json_output.load_json_output(file_path, schema), file_path)
+        else:
+            outputs[phase] = (local_gemini.sample_from_schema(schema), "schema sample")
+    return outputs
+
+def count_tokens(text, live):
+    """Estimated tokens of text, or the Vertex AI count with --live"""
+    if live:
+        return vertex_client.get_model(phase1_module.MODEL_NAME).count_tokens(text).total_tokens
+    return vertex_client.estimate_tokens(text)
+
+def compare(phase, baseline_payloads, payloads, system_prompt, source, live):
+    """Token and byte comparison of one phase's inter-phase payloads"""
+    baseline_text = "\n".join(baseline_payloads)
+    text = "\n".join(payloads)
+    baseline_tokens = count_tokens(baseline_text, live)
+    tokens = count_tokens(text, live)
+    system_tokens = vertex_client.estimate_tokens(system_prompt)
+    return {
+        "phase": phase,
+        "source": source,
+        "baseline": {"bytes": len(baseline_text.encode("utf-8")), "tokens": baseline_tokens},
+        "compact": {"bytes": len(text.encode("utf-8")), "tokens": tokens},
+        "tokens_saved": baseline_tokens - tokens,
+        "payload_reduction_percent": round((baseline_tokens - tokens) / baseline_tokens * 100, 1) if baseline_tokens else 0.0,
+        # Share of the whole request input (system prompt + payload) that the change removes
+        "request_reduction_percent": round((baseline_tokens - tokens) / (baseline_tokens + system_tokens) * 100, 1) if baseline_tokens else 0.0
+    }
+
+def indented(data):
+    """The previous payload format: the full result as indented JSON"""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def run_benchmark(results_dir=".", live=False):
+    """Compare the payloads of every phase that embeds structured input"""
+    outputs = load_phase_outputs(results_dir)
+    phase0_data, phase0_source = outputs["phase_0"]
+    screening_data, screening_source = outputs["phase_1"]
+    assessment_data, assessment_source = outputs["phase_2"]
+    interview_responses = phase2_module.get_sample_interview_responses()
+    team_feedback = phase4_module.get_sample_team_feedback()
+
+    return [
+        # Phase 1 used to paste the saved Phase 0 file verbatim
+        compare("phase_1", [indented(phase0_data)], [phase1_module.candidate_payload(indented(phase0_data))],
+                phase1_module.SYSTEM_PROMPT, phase0_source, live),
+        compare("phase_2", [indented(interview_responses)], [json_output.compact_json(interview_responses)],
+                phase2_module.SYSTEM_PROMPT, "sample interview responses", live),
+        compare("phase_3", [indented(screening_data), indented(assessment_data)],
+                [json_output.compact_json(screening_data, phase3_module.SCREENING_PROJECTION), json_output.compact_json(assessment_data, phase3_module.ASSESSMENT_PROJECTION)],
+                phase3_module.BRIEFING_SYSTEM_PROMPT, f"{screening_source} + {assessment_source}", live),
+        compare("phase_4", [indented(team_feedback)], [json_output.compact_json(team_feedback)],
+                phase4_module.FEEDBACK_SYSTEM_PROMPT, "sample team feedback", live)
+    ]
+
+def print_results(results):
+    """Print one comparison line per phase"""
+    print(f"\n   {'phase':<9} {'baseline':>10} {'compact':>10} {'saved':>8} {'payload':>9} {'request':>9}  source")
+    for result in results:
+        print(f"   {result['phase']:<9} {result['baseline']['tokens']:>10} {result['compact']['tokens']:>10} {result['tokens_saved']:>8} "
+              f"{result['payload_reduction_percent']:>8}% {result['request_reduction_percent']:>8}%  {result['source']}")
+
+def parse_arguments(argv=None):
+    """Parse benchmark options"""
+    parser = argparse.ArgumentParser(description="Measure token reduction of projected, minified inter-phase payloads")
+    parser.add_argument("--results-dir", default=".", help="Folder with saved phase outputs (schema samples are used for missing ones)")
+    parser.add_argument("--live", action="store_true", help="Count tokens with Vertex AI instead of the local estimate")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="File to save the JSON results to")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    print("📋 MINMA INC. INTER-PHASE PAYLOAD BENCHMARK")
+    print("=" * 55)
+
+    results = run_benchmark(args.results_dir, live=args.live)
+    print_results(results)
+    if not args.live:
+        print("\nℹ️  Token counts are estimates; run with --live to count them with Vertex AI")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Benchmark results saved to: {args.output}")
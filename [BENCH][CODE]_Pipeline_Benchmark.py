@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+HR Automation Pipeline Benchmark - offline, using the local Gemini stand-in
+Measures end-to-end throughput, per-phase orchestration overhead and scaling with concurrency
+"""
+
+import io
+import os
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import contextlib
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+# Module import time is the "init" overhead every fresh process pays
+_import_start = time.perf_counter()
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+IMPORT_SECONDS = time.perf_counter() - _import_start
+
+local_gemini = module_loader.load_module("[SHARED][CODE]_Local_Gemini.py", "local_gemini")
+vertex_client = master.vertex_client
+call_metrics = master.call_metrics
+
+# Default benchmark settings
+DEFAULT_CANDIDATES = 8
+DEFAULT_CONCURRENCY = [1, 2, 4, 8]
+DEFAULT_OUTPUT_FILE = "[BENCH][OUTPUT]_Pipeline_Benchmark.json"
+
+# Minimal one-page PDF used as the benchmark CV (its bytes only feed the cache key and token estimate)
+SAMPLE_PDF = (
+    b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n"
+    b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >> endobj\n"
+    b"trailer << /Root 1 0 R >>\n%%EOF\n"
+)
+
+class InstrumentedPipeline(master.HRAutomationPipeline):
+    """Pipeline that also times result parsing and file writes per phase"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.save_timings = {}
+
+    def save_result(self, result, filename, phase_name, schema=None):
+        """Time parse + validate + write of each saved result"""
+        started = time.perf_counter()
+        try:
+            return super().save_result(result, filename, phase_name, schema)
+        finally:
+            phase_key = phase_name.split("_feedback")[0].split("_responses")[0]
+            self.save_timings[phase_key] = self.save_timings.get(phase_key, 0.0) + time.perf_counter() - started
+
+def make_sample_cvs(cv_dir, count):
+    """Write count distinct sample CV PDFs and return their paths"""
+    paths = []
+    for index in range(count):
+        path = os.path.join(cv_dir, f"candidate_{index:03d}.pdf")
+        with open(path, "wb") as f:
+            f.write(SAMPLE_PDF + f"% candidate {index}\n".encode("ascii"))
+        paths.append(path)
+    return paths
+
+def configure_backend(base_latency, output_tokens_per_second, simulate_latency):
+    """Route all Gemini calls to a fresh local stand-in and disable caching/throttling"""
+    backend = local_gemini.LocalGeminiBackend(
+        base_latency=base_latency,
+        output_tokens_per_second=output_tokens_per_second,
+        simulate_latency=simulate_latency,
+        responder=local_gemini.schema_responder
+    )
+    vertex_client.set_model_factory(backend)
+    master.response_cache.configure(enabled=False)
+    master.request_scheduler.configure(requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000)
+    return backend
+
+def run_pipeline_quietly(cv_file, output_dir):
+    """Run one complete pipeline with its console output suppressed"""
+    os.makedirs(output_dir, exist_ok=True)
+    pipeline = InstrumentedPipeline(cv_file, master.DEFAULT_JOB_DESCRIPTION, output_dir=output_dir, deduplicate=False, prescreen="off", store_results=False, resume=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        success = pipeline.run_complete_pipeline()
+    return pipeline, success
+
+def measure_phase_overhead(cv_files, work_dir):
+    """Split each phase's wall time into model time, parse/write time and everything else"""
+    per_phase = {}
+    for index, cv_file in enumerate(cv_files):
+        pipeline, success = run_pipeline_quietly(cv_file, os.path.join(work_dir, f"overhead_{index}"))
+        if not success:
+            raise RuntimeError(f"Benchmark pipeline failed for {cv_file}")
+
+        model_seconds = {}
+        for record in call_metrics.get_records(pipeline.run_id):
+            model_seconds[record["phase"]] = model_seconds.get(record["phase"], 0.0) + record["wall_seconds"]
+
+        for phase in pipeline.PHASE_GRAPH:
+            total = pipeline.phase_timings.get(phase["name"], 0.0)
+            model = model_seconds.get(phase["key"], 0.0)
+            save = pipeline.save_timings.get(phase["key"], 0.0)
+            samples = per_phase.setdefault(phase["key"], {"total": [], "model": [], "parse_and_write": [], "prompt_and_orchestration": []})
+            samples["total"].append(total)
+            samples["model"].append(model)
+            samples["parse_and_write"].append(save)
+            samples["prompt_and_orchestration"].append(max(0.0, total - model - save))
+
+    return {
+        phase: {name: round(sum(values) / len(values) * 1000, 3) for name, values in samples.items()}
+        for phase, samples in per_phase.items()
+    }
+
+def measure_init():
+    """Measure module import time and first-model creation time"""
+    started = time.perf_counter()
+    vertex_client.get_model(master.phase0_module.MODEL_NAME, master.phase0_module.SYSTEM_PROMPT)
+    return {
+        "import_seconds": round(IMPORT_SECONDS, 4),
+        "first_model_seconds": round(time.perf_counter() - started, 6)
+    }
+
+def measure_scaling(cv_files, concurrency_levels, work_dir, use_async=False):
+    """Run the whole candidate set at each concurrency level and report throughput
+
+    With use_async, candidates run as tasks on one event loop (BatchPipelineRunner.run_async)
+    instead of worker threads.
+    """
+    results = []
+    baseline = None
+    mode = "asyncio" if use_async else "threads"
+    for workers in concurrency_levels:
+        output_root = os.path.join(work_dir, f"scaling_{mode}_{workers}")
+        candidates = [
+            {"candidate_id": os.path.splitext(os.path.basename(cv_file))[0], "cv_file": cv_file, "job_description": master.DEFAULT_JOB_DESCRIPTION}
+            for cv_file in cv_files
+        ]
+        runner = master.BatchPipelineRunner(candidates, max_workers=workers, output_root=output_root, pipeline_options={"deduplicate": False, "prescreen": "off", "store_results": False, "resume": False})
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = asyncio.run(runner.run_async()) if use_async else runner.run()
+
+        throughput = summary["candidates_per_minute"] or 0.0
+        baseline = baseline or throughput
+        results.append({
+            "mode": mode,
+            "workers": workers,
+            "wall_time_seconds": summary["wall_time_seconds"],
+            "candidates_per_minute": throughput,
+            "speedup": round(throughput / baseline, 2) if baseline else None,
+            "parallel_efficiency": round(throughput / baseline / workers, 2) if baseline else None,
+            "failed_candidates": summary["failed_candidates"]
+        })
+    return results
+
+def run_benchmark(candidates=DEFAULT_CANDIDATES, concurrency_levels=DEFAULT_CONCURRENCY, base_latency=local_gemini.BASE_LATENCY_SECONDS,
+                  output_tokens_per_second=local_gemini.OUTPUT_TOKENS_PER_SECOND, simulate_latency=True, use_async=False):
+    """Run every benchmark section and return the report"""
+    work_dir = tempfile.mkdtemp(prefix="hr_bench_")
+    try:
+        backend = configure_backend(base_latency, output_tokens_per_second, simulate_latency)
+        cv_files = make_sample_cvs(work_dir, candidates)
+
+        report = {
+            "settings": {
+                "candidates": candidates,
+                "concurrency_levels": concurrency_levels,
+                "base_latency_seconds": base_latency,
+                "output_tokens_per_second": output_tokens_per_second,
+                "simulate_latency": simulate_latency,
+                "async": use_async
+            },
+            "init": measure_init()
+        }
+
+        # Single-candidate runs expose the fixed overhead around each model call
+        overhead_runs = cv_files[:min(3, len(cv_files))]
+        report["phase_overhead_ms"] = measure_phase_overhead(overhead_runs, work_dir)
+        report["concurrency_scaling"] = measure_scaling(cv_files, concurrency_levels, work_dir)
+        if use_async:
+            report["concurrency_scaling"] += measure_scaling(cv_files, concurrency_levels, work_dir, use_async=True)
+        report["backend"] = backend.get_stats()
+        return report
+    finally:
+        vertex_client.set_model_factory(None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def print_report(report):
+    """Print the benchmark results"""
+    init = report["init"]
+    print(f"\n🔌 Init: module import {init['import_seconds']}s, first model {init['first_model_seconds']}s")
+
+    print("\n📊 PER-PHASE OVERHEAD (mean ms per candidate):")
+    print(f"   {'phase':<10} {'total':>10} {'model':>10} {'parse+io':>10} {'other':>10}")
+    for phase, stats in report["phase_overhead_ms"].items():
+        print(f"   {phase:<10} {stats['total']:>10} {stats['model']:>10} {stats['parse_and_write']:>10} {stats['prompt_and_orchestration']:>10}")
+
+    print("\n🚀 CONCURRENCY SCALING:")
+    for row in report["concurrency_scaling"]:
+        print(f"   {row['mode']:<8} {row['workers']:>3} workers: {row['candidates_per_minute']:>9} candidates/min  speedup x{row['speedup']}  efficiency {row['parallel_efficiency']}  ({row['wall_time_seconds']}s)")
+
+def parse_arguments(argv=None):
+    """Parse benchmark options"""
+    parser = argparse.ArgumentParser(description="Offline HR pipeline benchmark with a local Gemini stand-in")
+    parser.add_argument("--candidates", type=int, default=DEFAULT_CANDIDATES, help="Number of synthetic candidates")
+    parser.add_argument("--concurrency", default=",".join(str(n) for n in DEFAULT_CONCURRENCY), help="Comma-separated worker counts")
+    parser.add_argument("--base-latency", type=float, default=local_gemini.BASE_LATENCY_SECONDS, help="Simulated per-request latency in seconds")
+    parser.add_argument("--output-tps", type=float, default=local_gemini.OUTPUT_TOKENS_PER_SECOND, help="Simulated output tokens per second")
+    parser.add_argument("--no-latency", action="store_true", help="Do not sleep for simulated latency (measures pure overhead)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Also measure scaling with candidates as tasks on one event loop")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="File to save the JSON report to")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    print("📋 MINMA INC. HR PIPELINE BENCHMARK (LOCAL STAND-IN)")
+    print("=" * 60)
+
+    benchmark_report = run_benchmark(
+        candidates=args.candidates,
+        concurrency_levels=[int(n) for n in args.concurrency.split(",") if n.strip()],
+        base_latency=args.base_latency,
+        output_tokens_per_second=args.output_tps,
+        simulate_latency=not args.no_latency,
+        use_async=args.use_async
+    )
+    print_report(benchmark_report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(benchmark_report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Benchmark report saved to: {args.output}")
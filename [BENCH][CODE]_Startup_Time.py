@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark - master script import time and time to first phase in fresh processes
+Phase modules load lazily; the eager figure shows what importing all of them up front would add
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+MASTER_FILE = "[MASTER][CODE]_HR_Automation_System.py"
+
+# Default benchmark settings and budgets (time to first phase includes interpreter start-up)
+DEFAULT_RUNS = 5
+IMPORT_BUDGET_SECONDS = float(os.environ.get("HR_IMPORT_BUDGET_SECONDS", "0.5"))
+FIRST_PHASE_BUDGET_SECONDS = float(os.environ.get("HR_FIRST_PHASE_BUDGET_SECONDS", "1.5"))
+DEFAULT_OUTPUT_FILE = "[BENCH][OUTPUT]_Startup_Time.json"
+
+# Minimal one-page PDF used as the benchmark CV
+SAMPLE_PDF = (
+    b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n"
+    b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >> endobj\n"
+    b"trailer << /Root 1 0 R >>\n%%EOF\n"
+)
+
+# Runs in a fresh interpreter: import the master script, then start a pipeline and stop
+# as soon as its first phase begins. Prints one JSON line with the measurements.
+DRIVER = r"""
+import os, sys, json, time, importlib.util
+cv_file, output_dir, phases, eager = sys.argv[1], sys.argv[2], sys.argv[3] or None, sys.argv[4] == "1"
+
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("hr_master", MASTER_FILE)
+master = importlib.util.module_from_spec(spec)
+sys.modules["hr_master"] = master
+spec.loader.exec_module(master)
+import_seconds = time.perf_counter() - started
+
+eager_seconds = 0.0
+if eager:
+    started = time.perf_counter()
+    for module in master.PHASE_MODULES.values():
+        module.load()
+    eager_seconds = time.perf_counter() - started
+
+loaded_at_import = sorted(key for key, module in master.PHASE_MODULES.items() if module.loaded)
+
+def first_phase(self, phase):
+    print(json.dumps({"import_seconds": import_seconds, "eager_import_seconds": eager_seconds, "first_phase": phase["key"],
+                      "first_phase_at": time.time(), "phase_modules_loaded_at_import": loaded_at_import}), file=sys.__stdout__, flush=True)
+    os._exit(0)
+
+master.HRAutomationPipeline.run_single_phase = first_phase
+with open(os.devnull, "w") as devnull:
+    sys.stdout = devnull
+    master.HRAutomationPipeline(cv_file, master.DEFAULT_JOB_DESCRIPTION, output_dir=output_dir, store_results=False,
+                                deduplicate=False, resume=False, phases=phases).run_complete_pipeline()
+sys.stdout = sys.__stdout__
+print(json.dumps({"error": "no phase started (selected phases whose inputs are missing are skipped)"}), flush=True)
+""".replace("MASTER_FILE", repr(MASTER_FILE))
+
+def measure_once(cv_file, output_dir, phases=None, eager=False):
+    """Start one fresh process and return its import and time-to-first-phase figures"""
+    started = time.time()
+    completed = subprocess.run(
+        [sys.executable, "-c", DRIVER, cv_file, output_dir, phases or "", "1" if eager else "0"],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"Startup driver failed: {completed.stderr.strip()[-500:]}")
+    result = json.loads(lines[-1])
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    result["time_to_first_phase_seconds"] = result.pop("first_phase_at") - started
+    return result
+
+def summarize(samples, name):
+    """Median and worst value of one measurement"""
+    values = [sample[name] for sample in samples]
+    return {"median": round(statistics.median(values), 4), "max": round(max(values), 4)}
+
+def run_benchmark(runs=DEFAULT_RUNS, phases=None):
+    """Measure lazy start-up (and eager phase-module loading for comparison) over several processes"""
+    work_dir = tempfile.mkdtemp(prefix="hr_startup_")
+    try:
+        cv_file = os.path.join(work_dir, "candidate.pdf")
+        with open(cv_file, "wb") as f:
+            f.write(SAMPLE_PDF)
+
+        lazy = [measure_once(cv_file, os.path.join(work_dir, f"lazy_{index}"), phases) for index in range(runs)]
+        eager = [measure_once(cv_file, os.path.join(work_dir, f"eager_{index}"), phases, eager=True) for index in range(runs)]
+
+        report = {
+            "runs": runs,
+            "phases": phases or "all",
+            "first_phase": lazy[0]["first_phase"],
+            "phase_modules_loaded_at_import": lazy[0]["phase_modules_loaded_at_import"],
+            "import_seconds": summarize(lazy, "import_seconds"),
+            "time_to_first_phase_seconds": summarize(lazy, "time_to_first_phase_seconds"),
+            "eager_phase_module_seconds": summarize(eager, "eager_import_seconds"),
+            "eager_time_to_first_phase_seconds": summarize(eager, "time_to_first_phase_seconds"),
+            "budgets": {"import_seconds": IMPORT_BUDGET_SECONDS, "time_to_first_phase_seconds": FIRST_PHASE_BUDGET_SECONDS}
+        }
+        report["within_budget"] = (report["import_seconds"]["median"] <= IMPORT_BUDGET_SECONDS
+                                   and report["time_to_first_phase_seconds"]["median"] <= FIRST_PHASE_BUDGET_SECONDS)
+        return report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def print_report(report):
+    """Print lazy and eager start-up figures against the budgets"""
+    print(f"\n   Phase modules loaded at import: {', '.join(report['phase_modules_loaded_at_import']) or 'none'}")
+    print(f"   {'measurement':<34} {'median s':>9} {'max s':>9} {'budget s':>9}")
+    rows = [
+        ("master import", report["import_seconds"], report["budgets"]["import_seconds"]),
+        (f"time to first phase ({report['first_phase']})", report["time_to_first_phase_seconds"], report["budgets"]["time_to_first_phase_seconds"]),
+        ("eager phase-module import", report["eager_phase_module_seconds"], None),
+        ("eager time to first phase", report["eager_time_to_first_phase_seconds"], None)
+    ]
+    for name, values, budget in rows:
+        print(f"   {name:<34} {values['median']:>9} {values['max']:>9} {budget if budget is not None else '-':>9}")
+
+def parse_arguments(argv=None):
+    """Parse benchmark options"""
+    parser = argparse.ArgumentParser(description="Measure master script start-up time against a budget")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Fresh processes per measurement")
+    parser.add_argument("--phases", help="Phase subset passed to the pipeline, e.g. 2,4 (default: all phases)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="File to save the JSON report to")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    print("📋 MINMA INC. STARTUP TIME BENCHMARK")
+    print("=" * 55)
+
+    benchmark_report = run_benchmark(runs=args.runs, phases=args.phases)
+    print_report(benchmark_report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(benchmark_report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Benchmark report saved to: {args.output}")
+
+    if not benchmark_report["within_budget"]:
+        print("❌ Start-up time is over budget")
+        sys.exit(1)
+    print("✅ Start-up time within budget")
@@ -9,73 +9,268 @@ import json
 import sys
 from pathlib import Path
 import time
-import importlib.util
+import uuid
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
-# Import all phase modules using importlib for files with special characters
-def import_module_from_file(file_path, module_name):
-    """Import a module from file path"""
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load module from {file_path}")
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
 
-# Import phase modules
-phase0_module = import_module_from_file("[PHASE_0][CODE]_CV_Analysis.py", "phase0")
-phase1_module = import_module_from_file("[PHASE_1][CODE]_Initial_Screening.py", "phase1")
-phase2_module = import_module_from_file("[PHASE_2][CODE]_Technical_Assessment.py", "phase2")
-phase3_module = import_module_from_file("[PHASE_3][CODE]_Interview_Briefing.py", "phase3")
-phase4_module = import_module_from_file("[PHASE_4][CODE]_Culture_Fit_Assessment.py", "phase4")
+# Shared Vertex AI client pool (one credential load / vertexai.init per process)
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+response_cache = vertex_client.response_cache
+generation_profiles = vertex_client.generation_profiles
+request_scheduler = vertex_client.request_scheduler
+call_metrics = vertex_client.call_metrics
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
 
-# Extract functions from modules
-extract_cv_info_phase0 = phase0_module.extract_cv_info_phase0
-screen_candidate_phase1 = phase1_module.screen_candidate_phase1
-assess_candidate_phase2 = phase2_module.assess_candidate_phase2
-generate_briefing_sheet_phase3 = phase3_module.generate_briefing_sheet_phase3
-analyze_team_feedback_phase4 = phase4_module.analyze_team_feedback_phase4
+# Exact / near-duplicate CV index consulted before Phase 0
+duplicate_index = module_loader.load_module("[SHARED][CODE]_Duplicate_Index.py", "duplicate_index")
+
+# Indexed SQLite store of candidate results (queried instead of scanning JSON files)
+results_store = module_loader.load_module("[SHARED][CODE]_Results_Store.py", "results_store")
+
+# Per-phase input manifests used to resume runs without recomputing unchanged phases
+checkpoints = module_loader.load_module("[SHARED][CODE]_Checkpoints.py", "checkpoints")
+
+# Phase modules are imported lazily, on first use: report-only or single-phase runs never
+# pay for the prompts, schemas and PDF backends of phases they do not execute
+_module_lock = threading.RLock()
+
+class LazyModule:
+    """Module proxy that imports the module file on first attribute access"""
+    
+    def __init__(self, file_path, module_name):
+        self._file_path = file_path
+        self._module_name = module_name
+        self._module = None
+    
+    def load(self):
+        """Import the module (once) and return it"""
+        if self._module is None:
+            # One lock for every lazy import: phase modules load shared modules of their own
+            with _module_lock:
+                if self._module is None:
+                    self._module = module_loader.load_module(self._file_path, self._module_name)
+        return self._module
+    
+    @property
+    def loaded(self):
+        return self._module is not None
+    
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+def lazy_function(module, name):
+    """Function that resolves module.name when first called"""
+    def call(*args, **kwargs):
+        return getattr(module, name)(*args, **kwargs)
+    call.__name__ = name
+    return call
+
+# Phase modules
+phase0_module = LazyModule("[PHASE_0][CODE]_CV_Analysis.py", "phase0")
+phase1_module = LazyModule("[PHASE_1][CODE]_Initial_Screening.py", "phase1")
+phase2_module = LazyModule("[PHASE_2][CODE]_Technical_Assessment.py", "phase2")
+phase3_module = LazyModule("[PHASE_3][CODE]_Interview_Briefing.py", "phase3")
+phase4_module = LazyModule("[PHASE_4][CODE]_Culture_Fit_Assessment.py", "phase4")
+PHASE_MODULES = {"phase_0": phase0_module, "phase_1": phase1_module, "phase_2": phase2_module, "phase_3": phase3_module, "phase_4": phase4_module}
+
+# Phase entry points (each loads its module on first call)
+extract_cv_info_phase0 = lazy_function(phase0_module, "extract_cv_info_phase0")
+screen_candidate_phase1 = lazy_function(phase1_module, "screen_candidate_phase1")
+prescreen_candidate_phase1 = lazy_function(phase1_module, "prescreen_candidate_phase1")
+prescreen_screening_result = lazy_function(phase1_module, "prescreen_screening_result")
+assess_candidate_phase2 = lazy_function(phase2_module, "assess_candidate_phase2")
+generate_briefing_sheet_phase3 = lazy_function(phase3_module, "generate_briefing_sheet_phase3")
+analyze_team_feedback_phase4 = lazy_function(phase4_module, "analyze_team_feedback_phase4")
+generate_team_checklist_phase4 = lazy_function(phase4_module, "generate_team_checklist_phase4")
+
+# Async entry points (one event loop can keep many candidates' Gemini calls in flight)
+extract_cv_info_phase0_async = lazy_function(phase0_module, "extract_cv_info_phase0_async")
+screen_candidate_phase1_async = lazy_function(phase1_module, "screen_candidate_phase1_async")
+assess_candidate_phase2_async = lazy_function(phase2_module, "assess_candidate_phase2_async")
+generate_briefing_sheet_phase3_async = lazy_function(phase3_module, "generate_briefing_sheet_phase3_async")
+analyze_team_feedback_phase4_async = lazy_function(phase4_module, "analyze_team_feedback_phase4_async")
+generate_team_checklist_phase4_async = lazy_function(phase4_module, "generate_team_checklist_phase4_async")
+
+# Local pre-screen rules consulted before Gemini screening
+prescreen_rules = module_loader.load_module("[SHARED][CODE]_Prescreen_Rules.py", "prescreen_rules")
+
+# Tiered model routing (fast model first, escalating to the phase's own model)
+model_router = module_loader.load_module("[SHARED][CODE]_Model_Router.py", "model_router")
+
+# Job description used when none is provided (can be customized)
+DEFAULT_JOB_DESCRIPTION = "Software Engineer at Minma Vietnam - Hanoi office, focusing on e-commerce platform development"
+
+# Root of the per-candidate run directories of single runs (override with HR_RUNS_ROOT)
+RUNS_ROOT = os.environ.get("HR_RUNS_ROOT", "Output")
+
+# Sample interview responses used for the automated Phase 2 flow
+SAMPLE_INTERVIEW_RESPONSES = {
+    "accountability": {
+        "question": "What was the most difficult experience in your previous job, and what do you think was the cause? What actions did you personally take to improve the situation?",
+        "answer": "In my previous role, we faced a critical system outage that affected customer services. I took responsibility by immediately coordinating with the team, implementing a rollback plan, and conducting a thorough post-mortem to prevent future occurrences."
+    },
+    "self_improvement": {
+        "question": "Is there anything you are currently studying outside of work hours related to our business? Please be specific.",
+        "answer": "I'm currently learning Japanese (JLPT N3 level) and studying Node.js microservices architecture through online courses to better align with Minma's tech stack."
+    },
+    "work_ethic_result_orientation": {
+        "question": "What are your long-term career goals? Why do you think our company is the best place to achieve them?",
+        "answer": "I aim to become a technical lead in e-commerce platforms. Minma's focus on marketplace innovation and Japan-Vietnam collaboration provides the perfect environment for both technical growth and cultural learning."
+    },
+    "company_knowledge_alignment": {
+        "question": "Please describe our business in your own words.",
+        "answer": "Minma operates Curashi no Market, connecting users with 400+ service categories, and Senkyaku for SME digitalization. The company bridges Japanese market needs with Vietnamese technical talent."
+    },
+    "weekend_activities": {
+        "question": "How do you usually spend your weekends and holidays to refresh yourself?",
+        "answer": "I enjoy reading technology blogs, practicing Japanese language, and hiking with friends. I also contribute to open-source projects related to web development."
+    }
+}
+
+# Sample team feedback used for the automated Phase 4 flow
+SAMPLE_TEAM_FEEDBACK = {
+    "member_1": {
+        "member_name": "Tanaka-san",
+        "member_role": "Senior Developer",
+        "observations": {
+            "communication_effectiveness": "Clear and professional communication, adapted well to different conversation styles",
+            "values_demonstration": "Showed customer-focused thinking when discussing past projects",
+            "cultural_adaptation": "Demonstrated good understanding of Japanese business etiquette",
+            "team_chemistry": "Built natural rapport, showed genuine interest in our technical challenges"
+        },
+        "overall_impression": "Positive - would fit well with our development team culture"
+    },
+    "member_2": {
+        "member_name": "Nguyen Minh",
+        "member_role": "QA Engineer", 
+        "observations": {
+            "communication_effectiveness": "Good technical explanations, asked thoughtful questions",
+            "values_demonstration": "Emphasized quality and continuous learning",
+            "cultural_adaptation": "Comfortable with multicultural environment",
+            "team_chemistry": "Friendly approach, engaged well in technical discussions"
+        },
+        "overall_impression": "Very positive - strong technical mindset and team collaboration potential"
+    },
+    "member_3": {
+        "member_name": "Yamamoto-san",
+        "member_role": "Product Manager",
+        "observations": {
+            "communication_effectiveness": "Excellent communication, understood business requirements well",
+            "values_demonstration": "Strong customer focus, asked relevant questions about user experience",
+            "cultural_adaptation": "Respectful and professional, good cultural awareness",
+            "team_chemistry": "Enthusiastic about company mission, would contribute well to team dynamics"
+        },
+        "overall_impression": "Highly recommended - excellent culture fit and business understanding"
+    }
+}
+
+def sanitize_candidate_id(name):
+    """Filesystem-safe candidate id derived from a file name or label"""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in Path(name).stem) or "candidate"
+
+def run_directory(candidate_id, cv_sha256, job_description):
+    """Default run directory: <candidate id>-<digest of the CV content and job>
+
+    Runs of different CVs (or jobs) never share a directory even when the file names
+    match, while a rerun of the same CV and job finds its checkpoints again.
+    """
+    run_key = checkpoints.digest([cv_sha256, (job_description or "").strip()])[:12]
+    return os.path.join(RUNS_ROOT, f"{candidate_id}-{run_key}")
 
 class HRAutomationPipeline:
     """Complete HR automation pipeline orchestrator"""
     
-    def __init__(self, cv_file_path="CV-IT-JP.pdf", job_description="Software Engineer at Minma Vietnam - Hanoi"):
+    # Phase dependency graph (listed in topological order). Each phase declares the
+    # phase outputs it requires; phases whose inputs are ready run concurrently.
+    # "outputs" and "state" are what a checkpoint restores when the phase is reused;
+    # "output_file" is the main output loaded when a phase is not selected with --phases.
+    PHASE_GRAPH = [
+        {"key": "phase_0", "name": "CV Extraction", "method": "phase_0_cv_extraction", "requires": [],
+         "outputs": ["phase_0"], "state": ["duplicate_of"], "output_file": "[PHASE_0][OUTPUT]_CV_Analysis.json"},
+        {"key": "phase_1", "name": "Screening Analysis", "method": "phase_1_screening", "requires": ["phase_0"],
+         "outputs": ["phase_1_prescreen", "phase_1"], "state": ["prescreen"], "output_file": "[PHASE_1][OUTPUT]_Initial_Screening.json"},
+        {"key": "phase_2", "name": "Assessment Interview", "method": "phase_2_assessment", "requires": [],
+         "outputs": ["phase_2_responses", "phase_2"], "state": [], "output_file": "[PHASE_2][OUTPUT]_Technical_Assessment.json"},
+        {"key": "phase_3", "name": "Interview Preparation", "method": "phase_3_interview_preparation", "requires": ["phase_1", "phase_2"],
+         "outputs": ["phase_3"], "state": [], "output_file": "[PHASE_3][OUTPUT]_Interview_Briefing.json"},
+        {"key": "phase_4", "name": "Culture Fit Assessment", "method": "phase_4_culture_assessment", "requires": [],
+         "outputs": ["phase_4_checklist", "phase_4_feedback", "phase_4"], "state": [], "output_file": "[PHASE_4][OUTPUT]_Culture_Fit_Report.json"}
+    ]
+    
+    def __init__(self, cv_file_path="CV-IT-JP.pdf", job_description="Software Engineer at Minma Vietnam - Hanoi", output_dir=None, max_parallel_phases=3, stream=False, deduplicate=True,
+                 prescreen=None, prescreen_reject_below=None, generation_profile=None, candidate_id=None, store_results=True,
+                 resume=True, phases=None):
         self.cv_file_path = cv_file_path
+        # Label of this candidate (defaults to the CV file name); results are stored under the CV's sha256
+        self.candidate_id = candidate_id or sanitize_candidate_id(cv_file_path)
+        self._cv_sha256 = None
+        self.store_results = store_results
+        self.stored_record = None
         self.job_description = job_description
+        # Every output of this candidate is written once, into its own run directory
+        self.output_dir = output_dir or run_directory(self.candidate_id, self.cv_sha256, job_description)
+        self.max_parallel_phases = max_parallel_phases
+        self.stream = stream
+        self.deduplicate = deduplicate
+        self.duplicate_of = None
+        self.prescreen_mode = prescreen or prescreen_rules.PRESCREEN_MODE
+        if self.prescreen_mode not in prescreen_rules.PRESCREEN_MODES:
+            raise ValueError(f"Unknown pre-screen mode: {self.prescreen_mode}")
+        self.prescreen_reject_below = prescreen_reject_below
+        # Profile name ("fast", "balanced", "thorough") or {phase key: profile name}
+        self.generation_profile = generation_profiles.validate(generation_profile or generation_profiles.DEFAULT_PROFILE)
+        self.prescreen = None
+        # Reuse checkpointed phases whose inputs are unchanged (key -> reused/recomputed and why)
+        self.resume = resume
+        self.checkpoint_status = {}
+        # Phases to execute; the others are loaded from existing outputs in output_dir
+        self.selected_phases = self.parse_phases(phases)
+        # Phases deliberately not run for this candidate (key -> reason)
+        self.skipped_phases = {}
         self.results = {}
         self.output_files = {}
+        self.phase_timings = {}
+        self.critical_path = []
+        self.critical_path_seconds = 0.0
+        self.total_duration = None
+        # Tags every Gemini call made by this run in call_metrics
+        self.run_id = uuid.uuid4().hex[:12]
+        self.call_summary = None
+        self.routing_summary = None
         
+    @property
+    def cv_sha256(self):
+        """sha256 of the CV file, or None while it does not exist (e.g. an upload not yet saved)"""
+        if self._cv_sha256 is None and os.path.isfile(self.cv_file_path):
+            self._cv_sha256 = checkpoints.file_digest(self.cv_file_path)
+        return self._cv_sha256
+    
     def print_phase_header(self, phase_name, phase_number):
         """Print formatted phase header"""
         print(f"\n{'='*70}")
         print(f"🚀 PHASE {phase_number}: {phase_name}")
         print('='*70)
         
-    def save_result(self, result, filename, phase_name):
-        """Save result to file and track output"""
+    def save_result(self, result, filename, phase_name, schema=None):
+        """Parse (once), validate and save a phase result, then track the output"""
+        filename = os.path.join(self.output_dir, filename)
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                if isinstance(result, str):
-                    try:
-                        # Clean response text (remove markdown if present)
-                        cleaned_result = result.strip()
-                        if cleaned_result.startswith("```json"):
-                            cleaned_result = cleaned_result[7:]
-                        if cleaned_result.endswith("```"):
-                            cleaned_result = cleaned_result[:-3]
-                        cleaned_result = cleaned_result.strip()
-                        
-                        # Try to parse as JSON first
-                        result_json = json.loads(cleaned_result)
-                        json.dump(result_json, f, indent=2, ensure_ascii=False)
-                        self.results[phase_name] = result_json
-                    except json.JSONDecodeError:
-                        # If not JSON, save as text
-                        f.write(result)
-                        self.results[phase_name] = result
-                else:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                    self.results[phase_name] = result
+            if isinstance(result, str):
+                try:
+                    result = json_output.parse_json_output(result, schema)
+                except json_output.JSONOutputError as e:
+                    # Keep the raw text for inspection, but never pass it on as a usable result
+                    json_output.write_text_atomic(filename, result)
+                    print(f"❌ {phase_name} output is not valid JSON ({e}); raw text saved to: {filename}")
+                    return False
             
+            json_output.write_json_atomic(filename, result)
+            self.results[phase_name] = result
             self.output_files[phase_name] = filename
             print(f"✅ {phase_name} results saved to: {filename}")
             return True
@@ -83,169 +278,274 @@ class HRAutomationPipeline:
             print(f"❌ Error saving {phase_name} results: {e}")
             return False
     
-    def phase_0_cv_extraction(self):
-        """Phase 0: Extract information from CV PDF"""
+    # Each phase is split around its Gemini call: prepare_phase_N returns (done, context),
+    # where done is the phase result when no call is needed, and finish_phase_N saves the
+    # output. phase_N_* makes the call synchronously, phase_N_*_async awaits it and runs
+    # prepare/finish (file, index and store I/O) in worker threads to keep the loop free.
+    
+    def prepare_phase_0(self):
+        """Check the CV and reuse a duplicate's extraction; returns (done, duplicate_key)"""
         self.print_phase_header("CV INFORMATION EXTRACTION", 0)
         
         if not os.path.exists(self.cv_file_path):
             print(f"❌ CV file not found: {self.cv_file_path}")
-            return False
+            return False, None
         
         print(f"📄 Processing CV: {self.cv_file_path}")
-        print("⏳ Extracting candidate information...")
         
-        result = extract_cv_info_phase0(self.cv_file_path)
+        # Duplicates of an already-processed CV reuse its extraction instead of calling Gemini
+        duplicate_key = None
+        if self.deduplicate:
+            with open(self.cv_file_path, "rb") as f:
+                duplicate_key = (duplicate_index.fingerprint(f.read()), self.extraction_inputs_digest())
+            if self.duplicate_reuse_allowed() and self.reuse_duplicate_extraction(*duplicate_key):
+                return True, None
+        
+        print("⏳ Extracting candidate information...")
+        return None, duplicate_key
+    
+    def finish_phase_0(self, result, duplicate_key):
+        """Save the extraction and index the CV for duplicate detection"""
         if not result:
             print("❌ Phase 0 failed: CV extraction error")
             return False
         
+        saved = self.save_result(result, "[PHASE_0][OUTPUT]_CV_Analysis.json", "phase_0", phase0_module.RESPONSE_SCHEMA)
+        if saved and duplicate_key:
+            cv_fingerprint, inputs_digest = duplicate_key
+            duplicate_index.get_shared_index().add(cv_fingerprint, os.path.abspath(self.cv_file_path), os.path.abspath(self.output_files["phase_0"]),
+                                                   self.results["phase_0"], inputs_digest)
+        return saved
+    
+    def phase_0_cv_extraction(self):
+        """Phase 0: Extract information from CV PDF"""
+        done, duplicate_key = self.prepare_phase_0()
+        if done is not None:
+            return done
+        return self.finish_phase_0(extract_cv_info_phase0(self.cv_file_path), duplicate_key)
+    
+    async def phase_0_cv_extraction_async(self):
+        """phase_0_cv_extraction for coroutines"""
+        done, duplicate_key = await asyncio.to_thread(self.prepare_phase_0)
+        if done is not None:
+            return done
+        result = await extract_cv_info_phase0_async(self.cv_file_path)
+        return await asyncio.to_thread(self.finish_phase_0, result, duplicate_key)
+    
+    def extraction_inputs_digest(self):
+        """Digest of the Phase 0 inputs other than the CV itself (prompt, schema, model, generation profile)"""
+        inputs = self.phase_inputs("phase_0")
+        del inputs["cv_file"]
+        return checkpoints.digest(inputs)
+    
+    def duplicate_reuse_allowed(self):
+        """A duplicate's extraction stands in for a Phase 0 checkpoint: not with resume disabled, a forced
+        re-run or an invalidated checkpoint (a checkpoint of another CV in this directory does not count)"""
+        status = self.checkpoint_status.get("phase_0")
+        if status is None:
+            return self.resume
+        return status["status"] != "recomputed" or status["reason"] in ("no checkpoint", "changed: cv_file")
+    
+    def reuse_duplicate_extraction(self, cv_fingerprint, inputs_digest):
+        """Reuse the Phase 0 output of an exact or near-duplicate CV processed earlier with the same inputs"""
+        match = duplicate_index.get_shared_index().find(cv_fingerprint, inputs_digest)
+        if not match:
+            return False
+        
+        # The extraction stored in the index, not the (possibly since overwritten) output file of the earlier run
+        try:
+            result = json_output.parse_json_output(match["phase0_result"], phase0_module.RESPONSE_SCHEMA)
+        except json_output.JSONOutputError as e:
+            print(f"⚠️  Duplicate of {match['cv_file']} found but its stored Phase 0 extraction is unusable ({e}); extracting again")
+            return False
+        
+        print(f"♻️  {match['match'].title()} duplicate of {match['cv_file']} (similarity {match['similarity']}): reusing its Phase 0 extraction")
+        self.duplicate_of = {key: value for key, value in match.items() if key != "phase0_result"}
         return self.save_result(result, "[PHASE_0][OUTPUT]_CV_Analysis.json", "phase_0")
     
-    def phase_1_screening(self):
-        """Phase 1: Screen candidate based on extracted CV data"""
+    def prepare_phase_1(self):
+        """Check the Phase 0 output and run the local pre-screen; returns (done, phase0_file)"""
         self.print_phase_header("CANDIDATE SCREENING ANALYSIS", 1)
         
         phase0_file = self.output_files.get("phase_0")
         if not phase0_file or not os.path.exists(phase0_file):
             print("❌ Phase 1 failed: Phase 0 output not available")
-            return False
+            return False, None
+        
+        # Clear mismatches can be settled by the local rules without a Gemini call
+        if self.prescreen_mode != "off":
+            settled = self.prescreen_candidate(phase0_file)
+            if settled is not None:
+                return settled, None
         
         print("📊 Analyzing candidate qualification...")
         print("⏳ Calculating screening scores...")
-        
-        result = screen_candidate_phase1(phase0_file, self.job_description)
+        return None, phase0_file
+    
+    def finish_phase_1(self, result):
+        """Save the screening analysis"""
         if not result:
             print("❌ Phase 1 failed: Screening analysis error")
             return False
         
-        return self.save_result(result, "[PHASE_1][OUTPUT]_Initial_Screening.json", "phase_1")
+        return self.save_result(result, "[PHASE_1][OUTPUT]_Initial_Screening.json", "phase_1", phase1_module.RESPONSE_SCHEMA)
     
-    def phase_2_assessment(self):
-        """Phase 2: Assess candidate through structured interview questions"""
-        self.print_phase_header("CANDIDATE ASSESSMENT INTERVIEW", 2)
+    def phase_1_screening(self):
+        """Phase 1: Screen candidate based on extracted CV data"""
+        done, phase0_file = self.prepare_phase_1()
+        if done is not None:
+            return done
+        return self.finish_phase_1(screen_candidate_phase1(phase0_file, self.job_description))
+    
+    async def phase_1_screening_async(self):
+        """phase_1_screening for coroutines"""
+        done, phase0_file = await asyncio.to_thread(self.prepare_phase_1)
+        if done is not None:
+            return done
+        result = await screen_candidate_phase1_async(phase0_file, self.job_description)
+        return await asyncio.to_thread(self.finish_phase_1, result)
+    
+    def prescreen_candidate(self, phase0_file):
+        """Triage the Phase 0 output locally; return None to continue with Gemini screening, else Phase 1 success"""
+        triage = prescreen_candidate_phase1(phase0_file, self.job_description, self.prescreen_reject_below)
+        self.save_result(triage, "[PHASE_1][OUTPUT]_Prescreen.json", "phase_1_prescreen")
+        self.prescreen = dict(triage, mode=self.prescreen_mode, action="screen", phases_avoided=[], calls_avoided=0)
         
-        # Use sample interview responses for automated flow
-        sample_responses = {
-            "accountability": {
-                "question": "What was the most difficult experience in your previous job, and what do you think was the cause? What actions did you personally take to improve the situation?",
-                "answer": "In my previous role, we faced a critical system outage that affected customer services. I took responsibility by immediately coordinating with the team, implementing a rollback plan, and conducting a thorough post-mortem to prevent future occurrences."
-            },
-            "self_improvement": {
-                "question": "Is there anything you are currently studying outside of work hours related to our business? Please be specific.",
-                "answer": "I'm currently learning Japanese (JLPT N3 level) and studying Node.js microservices architecture through online courses to better align with Minma's tech stack."
-            },
-            "work_ethic_result_orientation": {
-                "question": "What are your long-term career goals? Why do you think our company is the best place to achieve them?",
-                "answer": "I aim to become a technical lead in e-commerce platforms. Minma's focus on marketplace innovation and Japan-Vietnam collaboration provides the perfect environment for both technical growth and cultural learning."
-            },
-            "company_knowledge_alignment": {
-                "question": "Please describe our business in your own words.",
-                "answer": "Minma operates Curashi no Market, connecting users with 400+ service categories, and Senkyaku for SME digitalization. The company bridges Japanese market needs with Vietnamese technical talent."
-            },
-            "weekend_activities": {
-                "question": "How do you usually spend your weekends and holidays to refresh yourself?",
-                "answer": "I enjoy reading technology blogs, practicing Japanese language, and hiking with friends. I also contribute to open-source projects related to web development."
-            }
-        }
+        if triage["decision"] != "reject":
+            print(f"🔎 Local pre-screen: triage score {triage['triage_score']} ({triage['profile']}), continuing with Gemini screening")
+            return None
+        
+        print(f"🚫 Local pre-screen reject: triage score {triage['triage_score']} ({triage['profile']}) - {'; '.join(triage['reasons'])}")
+        if self.prescreen_mode == "skip":
+            # The triage stands in for Phase 1; briefing interviewers on a clear reject is not worth a call
+            self.skipped_phases["phase_3"] = "candidate rejected by the local pre-screen"
+            success = self.save_result(prescreen_screening_result(triage), "[PHASE_1][OUTPUT]_Initial_Screening.json", "phase_1")
+        else:
+            self.skipped_phases["phase_1"] = "deferred by the local pre-screen"
+            print("⏸️  Gemini screening deferred; re-run with --prescreen off to screen this candidate")
+            success = True
+        
+        # Phase 1 and Phase 3 each make a single Gemini call
+        self.prescreen.update(action=self.prescreen_mode, phases_avoided=["phase_1", "phase_3"], calls_avoided=2)
+        return success
+    
+    def prepare_phase_2(self):
+        """Announce the assessment; returns (None, interview responses)"""
+        self.print_phase_header("CANDIDATE ASSESSMENT INTERVIEW", 2)
         
         print("🤖 Using sample interview responses for automated assessment...")
         print("⏳ Analyzing candidate responses...")
-        
-        result = assess_candidate_phase2(sample_responses)
+        return None, SAMPLE_INTERVIEW_RESPONSES
+    
+    def finish_phase_2(self, result):
+        """Save the interview responses and their assessment"""
         if not result:
             print("❌ Phase 2 failed: Assessment analysis error")
             return False
         
         # Also save the interview responses
-        self.save_result(sample_responses, "[SAMPLE]_Interview_Responses.json", "phase_2_responses")
+        self.save_result(SAMPLE_INTERVIEW_RESPONSES, "[SAMPLE]_Interview_Responses.json", "phase_2_responses")
         
-        return self.save_result(result, "[PHASE_2][OUTPUT]_Technical_Assessment.json", "phase_2")
+        return self.save_result(result, "[PHASE_2][OUTPUT]_Technical_Assessment.json", "phase_2", phase2_module.RESPONSE_SCHEMA)
     
-    def phase_3_interview_preparation(self):
-        """Phase 3: Generate interviewer briefing sheet"""
+    def phase_2_assessment(self):
+        """Phase 2: Assess candidate through structured interview questions"""
+        _, responses = self.prepare_phase_2()
+        return self.finish_phase_2(assess_candidate_phase2(responses))
+    
+    async def phase_2_assessment_async(self):
+        """phase_2_assessment for coroutines"""
+        _, responses = self.prepare_phase_2()
+        result = await assess_candidate_phase2_async(responses)
+        return await asyncio.to_thread(self.finish_phase_2, result)
+    
+    def prepare_phase_3(self):
+        """Check the Phase 1 and Phase 2 results; returns (done, progress_file)"""
         self.print_phase_header("INTERVIEW PREPARATION & BRIEFING", 3)
         
-        phase1_file = self.output_files.get("phase_1")
-        phase2_file = self.output_files.get("phase_2")
-        
-        if not phase1_file or not os.path.exists(phase1_file):
+        # Previous results were parsed and validated once when they were saved
+        if self.results.get("phase_1") is None:
             print("❌ Phase 3 failed: Phase 1 output not available")
-            return False
+            return False, None
             
-        if not phase2_file or not os.path.exists(phase2_file):
+        if self.results.get("phase_2") is None:
             print("❌ Phase 3 failed: Phase 2 output not available")
-            return False
-        
-        # Load previous results
-        with open(phase1_file, 'r', encoding='utf-8') as f:
-            screening_data = json.load(f)
-        
-        with open(phase2_file, 'r', encoding='utf-8') as f:
-            assessment_data = json.load(f)
+            return False, None
         
         print("📋 Generating interviewer briefing sheet...")
         print("⏳ Compiling candidate insights and recommendations...")
         
-        result = generate_briefing_sheet_phase3(screening_data, assessment_data, self.job_description)
+        progress_file = os.path.join(self.output_dir, "[PHASE_3][PROGRESS]_Interview_Briefing.json") if self.stream else None
+        return None, progress_file
+    
+    def finish_phase_3(self, result):
+        """Save the briefing sheet"""
         if not result:
             print("❌ Phase 3 failed: Briefing generation error")
             return False
         
-        return self.save_result(result, "[PHASE_3][OUTPUT]_Interview_Briefing.json", "phase_3")
+        return self.save_result(result, "[PHASE_3][OUTPUT]_Interview_Briefing.json", "phase_3", phase3_module.BRIEFING_RESPONSE_SCHEMA)
     
-    def phase_4_culture_assessment(self):
-        """Phase 4: Assess culture fit through team feedback"""
+    def phase_3_interview_preparation(self):
+        """Phase 3: Generate interviewer briefing sheet"""
+        done, progress_file = self.prepare_phase_3()
+        if done is not None:
+            return done
+        return self.finish_phase_3(generate_briefing_sheet_phase3(self.results["phase_1"], self.results["phase_2"], self.job_description,
+                                                                  stream=self.stream, progress_file=progress_file))
+    
+    async def phase_3_interview_preparation_async(self):
+        """phase_3_interview_preparation for coroutines"""
+        done, progress_file = self.prepare_phase_3()
+        if done is not None:
+            return done
+        result = await generate_briefing_sheet_phase3_async(self.results["phase_1"], self.results["phase_2"], self.job_description,
+                                                            stream=self.stream, progress_file=progress_file)
+        return await asyncio.to_thread(self.finish_phase_3, result)
+    
+    def prepare_phase_4(self):
+        """Announce the culture assessment; returns (None, job profile of the checklist)"""
         self.print_phase_header("CULTURE FIT & TEAM ASSESSMENT", 4)
         
-        # Use sample team feedback for automated flow
-        sample_team_feedback = {
-            "member_1": {
-                "member_name": "Tanaka-san",
-                "member_role": "Senior Developer",
-                "observations": {
-                    "communication_effectiveness": "Clear and professional communication, adapted well to different conversation styles",
-                    "values_demonstration": "Showed customer-focused thinking when discussing past projects",
-                    "cultural_adaptation": "Demonstrated good understanding of Japanese business etiquette",
-                    "team_chemistry": "Built natural rapport, showed genuine interest in our technical challenges"
-                },
-                "overall_impression": "Positive - would fit well with our development team culture"
-            },
-            "member_2": {
-                "member_name": "Nguyen Minh",
-                "member_role": "QA Engineer", 
-                "observations": {
-                    "communication_effectiveness": "Good technical explanations, asked thoughtful questions",
-                    "values_demonstration": "Emphasized quality and continuous learning",
-                    "cultural_adaptation": "Comfortable with multicultural environment",
-                    "team_chemistry": "Friendly approach, engaged well in technical discussions"
-                },
-                "overall_impression": "Very positive - strong technical mindset and team collaboration potential"
-            },
-            "member_3": {
-                "member_name": "Yamamoto-san",
-                "member_role": "Product Manager",
-                "observations": {
-                    "communication_effectiveness": "Excellent communication, understood business requirements well",
-                    "values_demonstration": "Strong customer focus, asked relevant questions about user experience",
-                    "cultural_adaptation": "Respectful and professional, good cultural awareness",
-                    "team_chemistry": "Enthusiastic about company mission, would contribute well to team dynamics"
-                },
-                "overall_impression": "Highly recommended - excellent culture fit and business understanding"
-            }
-        }
+        # The office-tour checklist is built once per job profile and served from the artifact cache
+        return None, prescreen_rules.select_profile(self.job_description)
+    
+    def save_checklist(self, checklist, job_profile):
+        """Save the team observation checklist and return the feedback analysis progress file"""
+        if checklist:
+            self.save_result(checklist, "[PHASE_4][OUTPUT]_Team_Checklist.json", "phase_4_checklist", phase4_module.CHECKLIST_RESPONSE_SCHEMA)
+        else:
+            print(f"⚠️  Team observation checklist for {job_profile} not available; continuing with the feedback analysis")
         
         print("👥 Using sample team feedback for automated assessment...")
         print("⏳ Analyzing culture fit and team compatibility...")
         
-        result = analyze_team_feedback_phase4(sample_team_feedback)
+        return os.path.join(self.output_dir, "[PHASE_4][PROGRESS]_Culture_Fit_Report.json") if self.stream else None
+    
+    def finish_phase_4(self, result):
+        """Save the team feedback and the culture fit report"""
         if not result:
             print("❌ Phase 4 failed: Culture assessment error")
             return False
         
         # Save team feedback as well
-        self.save_result(sample_team_feedback, "[PHASE_4][OUTPUT]_Team_Feedback.json", "phase_4_feedback")
+        self.save_result(SAMPLE_TEAM_FEEDBACK, "[PHASE_4][OUTPUT]_Team_Feedback.json", "phase_4_feedback")
         
-        return self.save_result(result, "[PHASE_4][OUTPUT]_Culture_Fit_Report.json", "phase_4")
+        return self.save_result(result, "[PHASE_4][OUTPUT]_Culture_Fit_Report.json", "phase_4", phase4_module.FEEDBACK_RESPONSE_SCHEMA)
+    
+    def phase_4_culture_assessment(self):
+        """Phase 4: Assess culture fit through team feedback"""
+        _, job_profile = self.prepare_phase_4()
+        progress_file = self.save_checklist(generate_team_checklist_phase4(job_profile), job_profile)
+        return self.finish_phase_4(analyze_team_feedback_phase4(SAMPLE_TEAM_FEEDBACK, stream=self.stream, progress_file=progress_file))
+    
+    async def phase_4_culture_assessment_async(self):
+        """phase_4_culture_assessment for coroutines"""
+        _, job_profile = self.prepare_phase_4()
+        checklist = await generate_team_checklist_phase4_async(job_profile)
+        progress_file = await asyncio.to_thread(self.save_checklist, checklist, job_profile)
+        result = await analyze_team_feedback_phase4_async(SAMPLE_TEAM_FEEDBACK, stream=self.stream, progress_file=progress_file)
+        return await asyncio.to_thread(self.finish_phase_4, result)
     
     def generate_final_report(self):
         """Generate comprehensive final recruitment report"""
@@ -258,23 +558,30 @@ class HRAutomationPipeline:
             "candidate_summary": {
                 "cv_file": self.cv_file_path,
                 "job_description": self.job_description,
-                "assessment_date": time.strftime("%Y-%m-%d %H:%M:%S")
+                "assessment_date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "generation_profile": self.generation_profile,
+                "duplicate_of": self.duplicate_of
             },
             "phase_scores": {},
             "overall_assessment": {},
             "recommendations": {}
         }
         
-        # Extract scores from each phase
-        if "phase_1" in self.results:
-            screening_data = self.results["phase_1"]
-            if isinstance(screening_data, dict) and "screening_score" in screening_data:
-                final_report["phase_scores"]["screening_score"] = screening_data["screening_score"]
+        # Extract scores and review flags as indexed in the results store (read back from it when results are stored)
+        if self.store_results:
+            self.stored_record = self.store_candidate()
+        indexed = self.stored_record or results_store.candidate_fields(self.results)
+        # A pre-screen reject only has a partial, rule-based screening score: it is reported
+        # here, but neither indexed as a screening score nor averaged with model scores
+        prescreen_rejected = bool(self.prescreen) and self.prescreen["action"] != "screen"
+        screening_score = (self.results.get("phase_1") or {}).get("screening_score") if prescreen_rejected else indexed["screening_score"]
+        if screening_score is not None:
+            final_report["phase_scores"]["screening_score"] = screening_score
+        
+        if indexed["assessment_score"] is not None:
+            final_report["phase_scores"]["assessment_score"] = indexed["assessment_score"]
         
-        if "phase_2" in self.results:
-            assessment_data = self.results["phase_2"]
-            if isinstance(assessment_data, dict) and "assessment_score" in assessment_data:
-                final_report["phase_scores"]["assessment_score"] = assessment_data["assessment_score"]
+        final_report["phase_scores"]["review_flags"] = indexed["flag_count"]
         
         if "phase_3" in self.results:
             interview_data = self.results["phase_3"]
@@ -286,7 +593,7 @@ class HRAutomationPipeline:
         
         # Calculate overall recommendation
         scores = []
-        if "screening_score" in final_report["phase_scores"]:
+        if "screening_score" in final_report["phase_scores"] and not prescreen_rejected:
             scores.append(final_report["phase_scores"]["screening_score"])
         if "assessment_score" in final_report["phase_scores"]:
             scores.append(final_report["phase_scores"]["assessment_score"])
@@ -306,6 +613,47 @@ class HRAutomationPipeline:
             
             final_report["overall_assessment"]["recommendation"] = recommendation
         
+        # Local pre-screen triage and the Gemini calls it avoided
+        final_report["prescreen"] = self.prescreen
+        if prescreen_rejected:
+            final_report["overall_assessment"]["prescreen_decision"] = f"Rejected by the local pre-screen ({self.prescreen['action']}); human confirmation required"
+            # Without a Gemini screening score the average only reflects the assessment
+            final_report["overall_assessment"].pop("average_score", None)
+            final_report["overall_assessment"]["recommendation"] = "SCREENING DEFERRED" if self.prescreen["action"] == "defer" else "REJECTED BY PRE-SCREEN"
+        
+        # Add phase timing and the critical path through the phase graph
+        final_report["pipeline_timing"] = {
+            "phase_seconds": {name: round(seconds, 2) for name, seconds in self.phase_timings.items()},
+            "critical_path": self.critical_path,
+            "critical_path_seconds": round(self.critical_path_seconds, 2)
+        }
+        
+        # Add per-phase latency, token usage and estimated cost of the Gemini calls
+        call_records = call_metrics.get_records(self.run_id)
+        self.call_summary = call_metrics.summarize(call_records)
+        final_report["call_metrics"] = self.call_summary
+        
+        # Add tiered routing decisions, escalations and estimated savings
+        self.routing_summary = model_router.summarize(model_router.get_decisions(self.run_id))
+        final_report["model_routing"] = self.routing_summary
+        
+        metrics_file = os.path.join(self.output_dir, "[METRICS][OUTPUT]_Call_Metrics.jsonl")
+        call_metrics.write_jsonl(metrics_file, call_records)
+        self.output_files["call_metrics"] = metrics_file
+        
+        # Phases reused from checkpoints versus recomputed this run
+        final_report["checkpoints"] = self.checkpoint_summary()
+        
+        # Complete the stored row with the overall assessment and cost of this run
+        if self.stored_record:
+            self.stored_record = self.store_assessment(final_report)
+            final_report["results_store"] = {
+                "db_path": results_store.get_shared_store().db_path,
+                "candidate_id": self.candidate_id,
+                "cv_sha256": self.cv_sha256,
+                "job_key": results_store.job_key(self.job_description)
+            }
+        
         # Add file references
         final_report["output_files"] = self.output_files
         
@@ -323,99 +671,839 @@ class HRAutomationPipeline:
         
         return True
     
-    def generate_additional_reports(self):
-        """Generate additional documentation and guide files"""
-        self.print_phase_header("ADDITIONAL DOCUMENTATION", "DOCS")
+    def store_candidate(self):
+        """Save this run's phase results to the results store and return the stored row"""
+        if not self.cv_sha256:
+            print("⚠️  Could not store results: CV file not found")
+            return None
+        try:
+            store = results_store.get_shared_store()
+            phase_results = {phase["key"]: self.results[phase["key"]] for phase in self.PHASE_GRAPH if phase["key"] in self.results}
+            store.save_candidate(
+                self.candidate_id, self.cv_sha256, self.job_description, phase_results,
+                cv_file=self.cv_file_path,
+                run_id=self.run_id,
+                prescreen_action=self.prescreen["action"] if self.prescreen else None
+            )
+            print(f"🗄️  Results stored as {self.candidate_id} ({self.cv_sha256[:12]}) in {store.db_path}")
+            return store.get_candidate(self.cv_sha256, self.job_description)
+        except Exception as e:
+            # The JSON outputs are still written, so a store failure never fails the run
+            print(f"⚠️  Could not store results: {e}")
+            return None
+    
+    def store_assessment(self, final_report):
+        """Record the final report's overall assessment and cost on the stored row and return it"""
+        try:
+            store = results_store.get_shared_store()
+            store.update_candidate(
+                self.cv_sha256, self.job_description,
+                average_score=final_report["overall_assessment"].get("average_score"),
+                recommendation=final_report["overall_assessment"].get("recommendation"),
+                estimated_cost_usd=self.call_summary["estimated_cost_usd"] if self.call_summary else None
+            )
+            return store.get_candidate(self.cv_sha256, self.job_description)
+        except Exception as e:
+            print(f"⚠️  Could not store the overall assessment: {e}")
+            return self.stored_record
+    
+    def load_stored_output(self, phase):
+        """Load a phase result stored for this CV and job by an earlier run, whatever its output directory"""
+        if not (self.store_results and self.cv_sha256):
+            return False
+        try:
+            stored = results_store.get_shared_store().get_results(self.cv_sha256, self.job_description)
+        except Exception as e:
+            print(f"⚠️  Could not read the results store: {e}")
+            return False
+        if stored.get(phase["key"]) is None:
+            return False
+        self.results[phase["key"]] = stored[phase["key"]]
+        return True
+    
+    def phase_inputs(self, key):
+        """Digests of everything a phase's output depends on (upstream outputs must be loaded)"""
+        if key == "phase_0":
+            with open(self.cv_file_path, "rb") as f:
+                inputs = {"cv_file": f.read(), "prompt": [phase0_module.SYSTEM_PROMPT, phase0_module.RESPONSE_SCHEMA],
+                          "model": model_router.route_for(key, phase0_module.MODEL_NAME)}
+        elif key == "phase_1":
+            inputs = {"phase_0": self.results["phase_0"], "job_description": self.job_description,
+                      "prompt": [phase1_module.SYSTEM_PROMPT, phase1_module.RESPONSE_SCHEMA, phase1_module.PHASE0_PROJECTION],
+                      "model": phase1_module.MODEL_NAME, "prescreen": [self.prescreen_mode, self.prescreen_reject_below]}
+        elif key == "phase_2":
+            inputs = {"interview_responses": SAMPLE_INTERVIEW_RESPONSES, "prompt": [phase2_module.SYSTEM_PROMPT, phase2_module.RESPONSE_SCHEMA],
+                      "model": phase2_module.MODEL_NAME}
+        elif key == "phase_3":
+            inputs = {"phase_1": self.results["phase_1"], "phase_2": self.results["phase_2"], "job_description": self.job_description,
+                      "prompt": [phase3_module.BRIEFING_SYSTEM_PROMPT, phase3_module.BRIEFING_RESPONSE_SCHEMA,
+                                 phase3_module.SCREENING_PROJECTION, phase3_module.ASSESSMENT_PROJECTION],
+                      "model": phase3_module.MODEL_NAME}
+        else:
+            inputs = {"team_feedback": SAMPLE_TEAM_FEEDBACK, "prompt": [phase4_module.FEEDBACK_SYSTEM_PROMPT, phase4_module.FEEDBACK_RESPONSE_SCHEMA],
+                      "model": phase4_module.MODEL_NAME,
+                      "checklist": [phase4_module.CHECKLIST_PROMPT_VERSION, prescreen_rules.select_profile(self.job_description)]}
+        inputs["generation_profile"] = generation_profiles.resolve(key, self.generation_profile)
+        return {name: checkpoints.digest(value) for name, value in inputs.items()}
+    
+    @classmethod
+    def parse_phases(cls, phases):
+        """Phase keys selected by "1,3", ["phase_1", 3] or "none"; None selects every phase"""
+        keys = [phase["key"] for phase in cls.PHASE_GRAPH]
+        if phases is None:
+            return set(keys)
+        if isinstance(phases, str):
+            phases = [] if phases.strip().lower() == "none" else phases.split(",")
+        selected = set()
+        for phase in phases:
+            key = str(phase).strip().lower()
+            key = key if key.startswith("phase_") else f"phase_{key}"
+            if key not in keys:
+                raise ValueError(f"Unknown phase: {phase} (expected 0-4 or none)")
+            selected.add(key)
+        return selected
+    
+    def restore_outputs(self, manifest):
+        """Load the outputs and pipeline state recorded in a checkpoint manifest"""
+        for name, output in manifest["outputs"].items():
+            file_path = os.path.join(self.output_dir, output["file"])
+            self.results[name] = json_output.load_json_output(file_path)
+            self.output_files[name] = file_path
+        for attribute, value in manifest["state"].items():
+            if attribute == "skipped_phases":
+                self.skipped_phases.update(value)
+            else:
+                setattr(self, attribute, value)
+    
+    def load_existing_outputs(self, phase):
+        """Load the saved outputs of a phase that is not executed this run"""
+        manifest = checkpoints.load_manifest(self.output_dir, phase["key"])
+        try:
+            if manifest is not None:
+                self.restore_outputs(manifest)
+            else:
+                # Outputs written without a checkpoint (e.g. by the standalone phase scripts)
+                file_path = os.path.join(self.output_dir, phase["output_file"])
+                self.results[phase["key"]] = json_output.load_json_output(file_path)
+                self.output_files[phase["key"]] = file_path
+        except (OSError, json_output.JSONOutputError) as e:
+            if self.load_stored_output(phase):
+                self.checkpoint_status[phase["key"]] = {"status": "loaded", "reason": "not selected; read from the results store"}
+                print(f"🗄️  {phase['name']} loaded from the results store (not selected)")
+                return True
+            print(f"⚠️  {phase['name']} not selected and no usable output in {self.output_dir} or the results store ({e})")
+            return False
+        self.checkpoint_status[phase["key"]] = {"status": "loaded", "reason": "not selected"}
+        print(f"📂 {phase['name']} loaded from existing outputs (not selected)")
+        return True
+    
+    def reuse_checkpoint(self, phase, inputs):
+        """Load a phase's outputs from its checkpoint if its inputs are unchanged"""
+        manifest, reason = checkpoints.check(self.output_dir, phase["key"], inputs)
+        if manifest is None:
+            self.checkpoint_status[phase["key"]] = {"status": "recomputed", "reason": reason}
+            return False
         
-        print("📋 Generating documentation files...")
+        self.restore_outputs(manifest)
+        self.checkpoint_status[phase["key"]] = {"status": "reused", "reason": "inputs unchanged", "run_id": manifest["run_id"]}
+        print(f"♻️  {phase['name']} reused from checkpoint (inputs unchanged since run {manifest['run_id']})")
+        return True
+    
+    def save_checkpoint(self, phase, inputs, skipped_before):
+        """Write the manifest of a phase that just completed"""
+        outputs = {name: self.output_files[name] for name in phase["outputs"] if name in self.output_files}
+        state = {attribute: getattr(self, attribute) for attribute in phase["state"]}
+        # Phases this phase decided to skip (e.g. Phase 3 after a pre-screen reject)
+        skipped = {key: reason for key, reason in self.skipped_phases.items() if key not in skipped_before}
+        if skipped:
+            state["skipped_phases"] = skipped
+        try:
+            checkpoints.write_manifest(self.output_dir, phase["key"], inputs, outputs, state, self.run_id)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Could not write {phase['name']} checkpoint: {e}")
+    
+    def begin_phase(self, phase):
+        """Compute a phase's input digests and reuse its checkpoint if they are unchanged; returns (inputs, reused)"""
+        try:
+            inputs = self.phase_inputs(phase["key"])
+        except (OSError, KeyError):
+            # Missing CV or upstream output: the phase itself reports the problem
+            inputs = None
         
-        # Create the Output directory if it doesn't exist
-        output_dir = "Output"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            print(f"📁 Created output directory: {output_dir}")
+        # Explicitly selected subsets always re-execute their phases
+        forced = len(self.selected_phases) < len(self.PHASE_GRAPH)
+        if self.resume and not forced and inputs and self.reuse_checkpoint(phase, inputs):
+            return inputs, True
+        if forced or not self.resume:
+            self.checkpoint_status[phase["key"]] = {"status": "recomputed", "reason": "selected with --phases" if forced else "resume disabled"}
+        return inputs, False
+    
+    def report_phase(self, phase, success):
+        """Print a phase's outcome"""
+        if success:
+            print(f"✅ {phase['name']} completed successfully")
+        else:
+            print(f"❌ {phase['name']} failed")
+            print("⚠️  Continuing with remaining phases...")
+    
+    def run_single_phase(self, phase):
+        """Run one phase of the graph (or reuse its checkpoint) and record its duration"""
+        phase_start = time.time()
+        try:
+            inputs, success = self.begin_phase(phase)
+            if not success:
+                skipped_before = set(self.skipped_phases)
+                with call_metrics.call_context(self.run_id, phase["key"]), generation_profiles.profile_context(self.generation_profile):
+                    success = bool(getattr(self, phase["method"])())
+                if success and inputs and phase["key"] not in self.skipped_phases:
+                    self.save_checkpoint(phase, inputs, skipped_before)
+            self.report_phase(phase, success)
+        except Exception as e:
+            print(f"❌ {phase['name']} error: {e}")
+            print("⚠️  Continuing with remaining phases...")
+            success = False
+        self.phase_timings[phase["name"]] = time.time() - phase_start
+        return success
+    
+    async def run_single_phase_async(self, phase):
+        """run_single_phase for coroutines (awaits the phase's _async method; checkpoint I/O runs in a thread)"""
+        phase_start = time.time()
+        try:
+            inputs, success = await asyncio.to_thread(self.begin_phase, phase)
+            if not success:
+                skipped_before = set(self.skipped_phases)
+                with call_metrics.call_context(self.run_id, phase["key"]), generation_profiles.profile_context(self.generation_profile):
+                    success = bool(await getattr(self, phase["method"] + "_async")())
+                if success and inputs and phase["key"] not in self.skipped_phases:
+                    await asyncio.to_thread(self.save_checkpoint, phase, inputs, skipped_before)
+            self.report_phase(phase, success)
+        except Exception as e:
+            print(f"❌ {phase['name']} error: {e}")
+            print("⚠️  Continuing with remaining phases...")
+            success = False
+        self.phase_timings[phase["name"]] = time.time() - phase_start
+        return success
+    
+    def start_phase_graph(self):
+        """Set up graph execution: returns (pending, completed, failed) after loading unselected phases"""
+        pending = {phase["key"]: phase for phase in self.PHASE_GRAPH}
+        completed = set()
+        failed = set()
         
-        # Copy all output files to Output directory
-        self.copy_outputs_to_folder()
+        # Phases not selected provide their existing outputs to the selected ones
+        for phase in self.PHASE_GRAPH:
+            if phase["key"] not in self.selected_phases:
+                del pending[phase["key"]]
+                (completed if self.load_existing_outputs(phase) else failed).add(phase["key"])
+        return pending, completed, failed
+    
+    def skip_unreachable_phases(self, pending, failed):
+        """Drop pending phases whose inputs can no longer be produced, or that were skipped on purpose"""
+        skipped = True
+        while skipped:
+            skipped = False
+            for key, phase in list(pending.items()):
+                missing = [dep for dep in phase["requires"] if dep in failed]
+                deferred = [dep for dep in phase["requires"] if dep in self.skipped_phases]
+                if missing:
+                    print(f"⏭️  {phase['name']} skipped: missing {', '.join(missing)} output")
+                    failed.add(key)
+                elif deferred or key in self.skipped_phases:
+                    self.skipped_phases.setdefault(key, f"{', '.join(deferred)} was not run")
+                    print(f"⏭️  {phase['name']} skipped: {self.skipped_phases[key]}")
+                else:
+                    continue
+                del pending[key]
+                skipped = True
+    
+    def ready_phases(self, pending, completed):
+        """Remove and return the pending phases whose required phases have all succeeded"""
+        ready = [phase for phase in pending.values() if all(dep in completed for dep in phase["requires"])]
+        for phase in ready:
+            del pending[phase["key"]]
+        return ready
+    
+    def record_phase_result(self, phase, success, completed, failed):
+        """File a finished phase under completed or failed (phases it skipped on purpose under neither)"""
+        if phase["key"] in self.skipped_phases:
+            return
+        (completed if success else failed).add(phase["key"])
+    
+    def run_phase_graph(self):
+        """Execute every phase as soon as the phases it requires have succeeded"""
+        pending, completed, failed = self.start_phase_graph()
+        running = {}
         
-        print("✅ Additional reports generation completed!")
-        return True
+        with ThreadPoolExecutor(max_workers=self.max_parallel_phases) as executor:
+            while pending or running:
+                self.skip_unreachable_phases(pending, failed)
+                
+                # Start every phase whose inputs are ready
+                for phase in self.ready_phases(pending, completed):
+                    running[executor.submit(self.run_single_phase, phase)] = phase
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.record_phase_result(running.pop(future), future.result(), completed, failed)
+        
+        return len(completed & self.selected_phases)
     
-    def copy_outputs_to_folder(self):
-        """Copy all generated output files to Output folder"""
-        import shutil
+    async def run_phase_graph_async(self):
+        """run_phase_graph on the running event loop: ready phases run as concurrent tasks"""
+        pending, completed, failed = await asyncio.to_thread(self.start_phase_graph)
+        running = {}
+        # Same bound on concurrent phases as the thread pool of run_phase_graph
+        limit = asyncio.Semaphore(self.max_parallel_phases)
+        
+        async def run_limited(phase):
+            async with limit:
+                return await self.run_single_phase_async(phase)
         
-        output_dir = "Output"
+        while pending or running:
+            self.skip_unreachable_phases(pending, failed)
+            
+            for phase in self.ready_phases(pending, completed):
+                running[asyncio.ensure_future(run_limited(phase))] = phase
+            
+            if not running:
+                break
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                self.record_phase_result(running.pop(task), task.result(), completed, failed)
         
-        for phase_name, filename in self.output_files.items():
-            if os.path.exists(filename):
-                dest_path = os.path.join(output_dir, filename)
-                shutil.copy2(filename, dest_path)
-                print(f"📄 Copied {filename} → {dest_path}")
+        return len(completed & self.selected_phases)
     
-    def run_complete_pipeline(self):
-        """Execute the complete HR automation pipeline"""
+    def compute_critical_path(self):
+        """Return the chain of dependent phases with the longest measured duration"""
+        names = {phase["key"]: phase["name"] for phase in self.PHASE_GRAPH}
+        finish = {}
+        previous = {}
+        for phase in self.PHASE_GRAPH:
+            if phase["name"] not in self.phase_timings:
+                continue
+            ready_deps = [dep for dep in phase["requires"] if dep in finish]
+            slowest_dep = max(ready_deps, key=finish.get) if ready_deps else None
+            finish[phase["key"]] = self.phase_timings[phase["name"]] + (finish[slowest_dep] if slowest_dep else 0.0)
+            previous[phase["key"]] = slowest_dep
+        
+        if not finish:
+            return [], 0.0
+        
+        key = max(finish, key=finish.get)
+        total = finish[key]
+        path = []
+        while key:
+            path.append(names[key])
+            key = previous[key]
+        return list(reversed(path)), total
+    
+    def checkpoint_summary(self):
+        """Phases reused from checkpoints and phases recomputed, with the reason"""
+        return {
+            "reused": [key for key, status in sorted(self.checkpoint_status.items()) if status["status"] == "reused"],
+            "recomputed": {key: status["reason"] for key, status in sorted(self.checkpoint_status.items()) if status["status"] == "recomputed"},
+            "loaded": [key for key, status in sorted(self.checkpoint_status.items()) if status["status"] == "loaded"]
+        }
+    
+    def print_checkpoint_summary(self):
+        """Print which phases were reused and which were recomputed"""
+        summary = self.checkpoint_summary()
+        print(f"♻️  Checkpoints: {len(summary['reused'])} phases reused, {len(summary['recomputed'])} recomputed")
+        if summary["reused"]:
+            print(f"   - reused: {', '.join(summary['reused'])}")
+        if summary["loaded"]:
+            print(f"   - loaded (not selected): {', '.join(summary['loaded'])}")
+        for key, reason in summary["recomputed"].items():
+            print(f"   - {key} recomputed ({reason})")
+    
+    def print_phase_timings(self):
+        """Print per-phase durations and the critical path"""
+        print("⏱️  Phase Timings:")
+        for phase in self.PHASE_GRAPH:
+            if phase["name"] in self.phase_timings:
+                print(f"   - {phase['name']}: {round(self.phase_timings[phase['name']], 2)} seconds")
+        if self.critical_path:
+            print(f"🧭 Critical Path: {' → '.join(self.critical_path)} ({round(self.critical_path_seconds, 2)} seconds)")
+    
+    def print_client_stats(self, client_stats_start):
+        """Print Vertex AI client pool usage for this run"""
+        client_stats = vertex_client.get_stats()
+        init_calls = client_stats["vertex_init_calls"] - client_stats_start["vertex_init_calls"]
+        model_creations = client_stats["model_creations"] - client_stats_start["model_creations"]
+        model_reuses = client_stats["model_reuses"] - client_stats_start["model_reuses"]
+        print(f"🔌 Vertex AI init calls: {init_calls} (models created: {model_creations}, reused: {model_reuses})")
+    
+    def print_cache_stats(self, cache_stats_start):
+        """Print response cache hit/miss statistics for this run"""
+        cache_stats = response_cache.shared_cache.get_stats()
+        hits = cache_stats["hits"] - cache_stats_start["hits"]
+        misses = cache_stats["misses"] - cache_stats_start["misses"]
+        bypassed = cache_stats["bypassed"] - cache_stats_start["bypassed"]
+        if bypassed:
+            print(f"💾 Response cache: bypassed ({bypassed} calls)")
+            return
+        lookups = hits + misses
+        hit_rate = round(hits / lookups * 100, 1) if lookups else 0.0
+        print(f"💾 Response cache: {hits} hits, {misses} misses ({hit_rate}% hit rate, {round(cache_stats['size_bytes'] / 1024, 1)} KB on disk)")
+    
+    def print_call_metrics(self):
+        """Print per-phase Gemini latency, token usage and estimated cost"""
+        summary = self.call_summary
+        if not summary or not summary["calls"]:
+            return
+        print("🧮 Gemini Calls by Phase:")
+        for phase, totals in summary["by_phase"].items():
+            print(f"   - {phase}: {totals['calls']} calls, {totals['wall_seconds']}s, {totals['prompt_tokens']} prompt / {totals['output_tokens'] + totals['thinking_tokens']} output tokens, ${totals['estimated_cost_usd']:.4f}")
+        print(f"💰 Estimated Gemini cost: ${summary['estimated_cost_usd']:.4f} ({summary['prompt_tokens']} prompt / {summary['output_tokens'] + summary['thinking_tokens']} output tokens)")
+    
+    def print_routing_summary(self):
+        """Print tiered model routing decisions for this run"""
+        summary = self.routing_summary
+        if not summary or not summary["routed_requests"]:
+            return
+        print(f"🔀 Model Routing: {summary['routed_requests']} routed requests, {summary['escalations']} escalated, estimated savings ${summary['estimated_savings_usd']:.4f}")
+        for phase, totals in summary["by_phase"].items():
+            served_by = ", ".join(f"{model} x{count}" for model, count in totals["served_by"].items())
+            print(f"   - {phase}: {served_by} (mean {totals['mean_wall_seconds']}s)")
+    
+    def print_scheduler_stats(self, scheduler_stats_start):
+        """Print request scheduler throttling and retry metrics for this run"""
+        stats = request_scheduler.shared_scheduler.get_stats()
+        requests = stats["requests"] - scheduler_stats_start["requests"]
+        retries = stats["retries"] - scheduler_stats_start["retries"]
+        throttle_seconds = stats["throttle_seconds"] - scheduler_stats_start["throttle_seconds"]
+        backoff_seconds = stats["backoff_seconds"] - scheduler_stats_start["backoff_seconds"]
+        print(f"🚦 Vertex AI requests: {requests} (retries: {retries}, throttled: {round(throttle_seconds, 2)}s, backoff: {round(backoff_seconds, 2)}s, max queue depth: {stats['max_queue_depth']})")
+    
+    def start_run(self):
+        """Print the run header, create the run directory and snapshot the shared counters"""
         print("🏁 MINMA INC. HR AUTOMATION - COMPLETE PIPELINE")
         print("=" * 70)
         print(f"📄 CV File: {self.cv_file_path}")
         print(f"💼 Position: {self.job_description}")
+        print(f"🧠 Generation Profile: {self.generation_profile}")
+        print(f"📁 Run Directory: {self.output_dir}")
         print("=" * 70)
         
-        start_time = time.time()
-        
-        # Execute all phases in sequence
-        phases = [
-            ("CV Extraction", self.phase_0_cv_extraction),
-            ("Screening Analysis", self.phase_1_screening),
-            ("Assessment Interview", self.phase_2_assessment),
-            ("Interview Preparation", self.phase_3_interview_preparation),
-            ("Culture Fit Assessment", self.phase_4_culture_assessment)
-        ]
-        
-        success_count = 0
-        for phase_name, phase_func in phases:
-            try:
-                if phase_func():
-                    success_count += 1
-                    print(f"✅ {phase_name} completed successfully")
-                else:
-                    print(f"❌ {phase_name} failed")
-                    print("⚠️  Continuing with remaining phases...")
-            except Exception as e:
-                print(f"❌ {phase_name} error: {e}")
-                print("⚠️  Continuing with remaining phases...")
+        os.makedirs(self.output_dir, exist_ok=True)
+        return {
+            "start_time": time.time(),
+            "client": vertex_client.get_stats(),
+            "cache": response_cache.shared_cache.get_stats(),
+            "scheduler": request_scheduler.shared_scheduler.get_stats()
+        }
+    
+    def finish_run(self, run_start, success_count):
+        """Write the final report, print the run summary and return overall success"""
+        phases = [phase for phase in self.PHASE_GRAPH if phase["key"] in self.selected_phases]
+        self.critical_path, self.critical_path_seconds = self.compute_critical_path()
         
         # Generate final report regardless of individual phase failures
         self.generate_final_report()
         
-        # Generate additional output files
-        self.generate_additional_reports()
-        
         end_time = time.time()
-        duration = round(end_time - start_time, 2)
+        self.total_duration = end_time - run_start["start_time"]
+        duration = round(self.total_duration, 2)
         
         print(f"\n🏁 PIPELINE EXECUTION COMPLETED")
         print("=" * 50)
         print(f"⏱️  Total Duration: {duration} seconds")
         print(f"✅ Successful Phases: {success_count}/{len(phases)}")
-        print(f"📁 Results saved in current directory")
+        if self.skipped_phases:
+            print(f"⏭️  Skipped Phases: {', '.join(sorted(self.skipped_phases))} ({self.prescreen['calls_avoided'] if self.prescreen else 0} Gemini calls avoided by the local pre-screen)")
+        self.print_phase_timings()
+        self.print_checkpoint_summary()
+        self.print_call_metrics()
+        self.print_routing_summary()
+        self.print_client_stats(run_start["client"])
+        self.print_cache_stats(run_start["cache"])
+        self.print_scheduler_stats(run_start["scheduler"])
+        print(f"📁 Results saved in: {self.output_dir}")
         
-        if success_count == len(phases):
+        failed_count = len(phases) - success_count - len(self.selected_phases & set(self.skipped_phases))
+        if failed_count == 0:
             print("\n🎉 ALL PHASES COMPLETED SUCCESSFULLY!")
             print("🎯 Complete candidate evaluation ready for HR review")
         else:
-            print(f"\n⚠️  {len(phases) - success_count} phases had issues")
+            print(f"\n⚠️  {failed_count} phases had issues")
             print("📋 Review individual phase outputs for details")
         
-        return success_count == len(phases)
+        return failed_count == 0
+    
+    def run_complete_pipeline(self):
+        """Execute the complete HR automation pipeline"""
+        run_start = self.start_run()
+        # Execute phases as a dependency graph (independent phases run concurrently)
+        return self.finish_run(run_start, self.run_phase_graph())
+    
+    async def run(self):
+        """Execute the complete pipeline on the running event loop (async run_complete_pipeline)
+
+        Gemini calls are awaited instead of blocking a thread, so one event loop can run
+        many candidates' pipelines concurrently. Keep the loop for the life of the process:
+        the SDK's async clients are bound to the loop that first used them.
+        """
+        # Run setup and the final report (run directory, checkpoints, results store) stay off the loop
+        run_start = await asyncio.to_thread(self.start_run)
+        success_count = await self.run_phase_graph_async()
+        return await asyncio.to_thread(self.finish_run, run_start, success_count)
 
-def main():
+def percentile(values, pct):
+    """Return the pct-th percentile of values using linear interpolation"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+class BatchPipelineRunner:
+    """Run one HRAutomationPipeline per candidate under a bounded concurrency limit"""
+    
+    def __init__(self, candidates, max_workers=4, output_root="Batch_Output", pipeline_options=None):
+        self.candidates = candidates
+        self.max_workers = max_workers
+        self.output_root = output_root
+        self.pipeline_options = pipeline_options or {}
+        self.records = []
+    
+    @staticmethod
+    def candidate_id_for(cv_file, used_ids):
+        """Derive a unique, filesystem-safe candidate id from the CV file name"""
+        base_id = sanitize_candidate_id(cv_file)
+        candidate_id = base_id
+        suffix = 2
+        while candidate_id in used_ids:
+            candidate_id = f"{base_id}_{suffix}"
+            suffix += 1
+        used_ids.add(candidate_id)
+        return candidate_id
+    
+    @classmethod
+    def from_directory(cls, cv_dir, job_description, **kwargs):
+        """Build a batch from every PDF in a folder, all for the same job description"""
+        used_ids = set()
+        candidates = []
+        for cv_file in sorted(Path(cv_dir).glob("*.pdf")):
+            candidates.append({
+                "candidate_id": cls.candidate_id_for(cv_file, used_ids),
+                "cv_file": str(cv_file),
+                "job_description": job_description
+            })
+        return cls(candidates, **kwargs)
+    
+    @classmethod
+    def from_manifest(cls, manifest_path, default_job_description, **kwargs):
+        """Build a batch from a JSON manifest of {"cv_file", "job_description"} entries"""
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        entries = manifest.get("candidates", []) if isinstance(manifest, dict) else manifest
+        
+        # CV paths in the manifest are relative to the manifest itself
+        base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        used_ids = set()
+        candidates = []
+        for entry in entries:
+            cv_file = entry["cv_file"]
+            if not os.path.isabs(cv_file):
+                cv_file = os.path.join(base_dir, cv_file)
+            candidate_id = entry.get("candidate_id")
+            if candidate_id and candidate_id not in used_ids:
+                used_ids.add(candidate_id)
+            else:
+                candidate_id = cls.candidate_id_for(cv_file, used_ids)
+            candidates.append({
+                "candidate_id": candidate_id,
+                "cv_file": cv_file,
+                "job_description": entry.get("job_description") or default_job_description
+            })
+        return cls(candidates, **kwargs)
+    
+    def start_candidate(self, candidate):
+        """Create a candidate's output directory and pipeline"""
+        output_dir = os.path.join(self.output_root, candidate["candidate_id"])
+        os.makedirs(output_dir, exist_ok=True)
+        
+        return HRAutomationPipeline(candidate["cv_file"], candidate["job_description"], output_dir=output_dir,
+                                    candidate_id=candidate["candidate_id"], **self.pipeline_options)
+    
+    def candidate_record(self, candidate, pipeline, success):
+        """Summary record of one candidate's run"""
+        return {
+            "candidate_id": candidate["candidate_id"],
+            "cv_file": candidate["cv_file"],
+            "cv_sha256": pipeline.cv_sha256,
+            "output_dir": pipeline.output_dir,
+            "success": success,
+            "duration": pipeline.total_duration,
+            "phase_timings": pipeline.phase_timings,
+            "duplicate_of": pipeline.duplicate_of["cv_file"] if pipeline.duplicate_of else None,
+            "prescreen_action": pipeline.prescreen["action"] if pipeline.prescreen else None,
+            "phases_reused": sum(1 for status in pipeline.checkpoint_status.values() if status["status"] == "reused"),
+            "gemini_calls_avoided": pipeline.prescreen["calls_avoided"] if pipeline.prescreen else 0,
+            "estimated_cost_usd": pipeline.call_summary["estimated_cost_usd"] if pipeline.call_summary else 0.0,
+            "routing_escalations": pipeline.routing_summary["escalations"] if pipeline.routing_summary else 0,
+            "routing_savings_usd": pipeline.routing_summary["estimated_savings_usd"] if pipeline.routing_summary else 0.0,
+            "total_tokens": pipeline.call_summary["prompt_tokens"] + pipeline.call_summary["output_tokens"] + pipeline.call_summary["thinking_tokens"] if pipeline.call_summary else 0
+        }
+    
+    def run_candidate(self, candidate):
+        """Run the complete pipeline for one candidate in its own output directory"""
+        pipeline = self.start_candidate(candidate)
+        try:
+            success = pipeline.run_complete_pipeline()
+        except Exception as e:
+            print(f"❌ Candidate {candidate['candidate_id']} error: {e}")
+            success = False
+        return self.candidate_record(candidate, pipeline, success)
+    
+    async def run_candidate_async(self, candidate):
+        """run_candidate for coroutines"""
+        pipeline = self.start_candidate(candidate)
+        try:
+            success = await pipeline.run()
+        except Exception as e:
+            print(f"❌ Candidate {candidate['candidate_id']} error: {e}")
+            success = False
+        return self.candidate_record(candidate, pipeline, success)
+    
+    def add_record(self, record):
+        """Collect a finished candidate's record and report progress"""
+        self.records.append(record)
+        status = "✅" if record["success"] else "❌"
+        print(f"{status} [{len(self.records)}/{len(self.candidates)}] {record['candidate_id']} finished")
+    
+    def finish(self, start_time):
+        """Save and print the aggregate summary of a completed batch"""
+        wall_time = time.time() - start_time
+        summary = self.build_summary(wall_time)
+        
+        summary_file = os.path.join(self.output_root, "[BATCH][OUTPUT]_Batch_Summary.json")
+        json_output.write_json_atomic(summary_file, summary)
+        
+        self.print_summary(summary)
+        print(f"📁 Batch summary saved to: {summary_file}")
+        return summary
+    
+    def run(self):
+        """Execute all candidates concurrently and return the aggregate summary"""
+        os.makedirs(self.output_root, exist_ok=True)
+        start_time = time.time()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.run_candidate, candidate) for candidate in self.candidates]
+            for future in as_completed(futures):
+                self.add_record(future.result())
+        
+        return self.finish(start_time)
+    
+    async def run_async(self):
+        """run on the running event loop: up to max_workers candidates are in flight as tasks, not threads"""
+        os.makedirs(self.output_root, exist_ok=True)
+        start_time = time.time()
+        limit = asyncio.Semaphore(self.max_workers)
+        
+        async def run_limited(candidate):
+            async with limit:
+                return await self.run_candidate_async(candidate)
+        
+        for task in asyncio.as_completed([run_limited(candidate) for candidate in self.candidates]):
+            self.add_record(await task)
+        
+        return self.finish(start_time)
+    
+    def build_summary(self, wall_time):
+        """Aggregate throughput and per-phase latency percentiles"""
+        phase_latencies = {}
+        for record in self.records:
+            for phase_name, seconds in record["phase_timings"].items():
+                phase_latencies.setdefault(phase_name, []).append(seconds)
+        
+        latency_percentiles = {}
+        for phase_name, values in phase_latencies.items():
+            latency_percentiles[phase_name] = {
+                "count": len(values),
+                "p50": round(percentile(values, 50), 3),
+                "p90": round(percentile(values, 90), 3),
+                "p99": round(percentile(values, 99), 3),
+                "max": round(max(values), 3)
+            }
+        
+        succeeded = sum(1 for record in self.records if record["success"])
+        total_cost = sum(record["estimated_cost_usd"] for record in self.records)
+        return {
+            "total_candidates": len(self.records),
+            "successful_candidates": succeeded,
+            "failed_candidates": len(self.records) - succeeded,
+            "duplicates_reused": sum(1 for record in self.records if record["duplicate_of"]),
+            "prescreen_rejects": sum(1 for record in self.records if record["prescreen_action"] in ("skip", "defer")),
+            "gemini_calls_avoided": sum(record["gemini_calls_avoided"] for record in self.records),
+            "phases_reused": sum(record["phases_reused"] for record in self.records),
+            "max_workers": self.max_workers,
+            "wall_time_seconds": round(wall_time, 2),
+            "candidates_per_minute": round(len(self.records) / wall_time * 60, 2) if wall_time > 0 else None,
+            "phase_latency_seconds": latency_percentiles,
+            "estimated_cost_usd": round(total_cost, 6),
+            "estimated_cost_per_candidate_usd": round(total_cost / len(self.records), 6) if self.records else None,
+            "routing_escalations": sum(record["routing_escalations"] for record in self.records),
+            "routing_savings_usd": round(sum(record["routing_savings_usd"] for record in self.records), 6),
+            "top_candidates": self.top_candidates(),
+            "candidates": sorted(self.records, key=lambda record: record["candidate_id"])
+        }
+    
+    def top_candidates(self, limit=10):
+        """Best stored candidates of this batch by average score"""
+        if not self.pipeline_options.get("store_results", True):
+            return []
+        try:
+            store = results_store.get_shared_store()
+            # Rows are keyed by CV content, so only this batch's CVs are ranked even if a file name was used before
+            jobs = {candidate["candidate_id"]: candidate["job_description"] for candidate in self.candidates}
+            rows = []
+            for job_description in sorted(set(jobs.values())):
+                cv_sha256s = [record["cv_sha256"] for record in self.records if record["cv_sha256"] and jobs[record["candidate_id"]] == job_description]
+                rows.extend(store.query(job_description=job_description, cv_sha256s=cv_sha256s, order_by="average_score", limit=limit))
+        except Exception as e:
+            print(f"⚠️  Could not query the results store: {e}")
+            return []
+        rows.sort(key=lambda row: (row["average_score"] is None, -(row["average_score"] or 0), row["candidate_id"]))
+        return [{name: row[name] for name in ("candidate_id", "screening_score", "assessment_score", "average_score", "recommendation", "jlpt_level", "experience_years", "flag_count")}
+                for row in rows[:limit]]
+    
+    def print_summary(self, summary):
+        """Print the aggregate batch report"""
+        print("\n🏁 BATCH EXECUTION COMPLETED")
+        print("=" * 70)
+        print(f"👥 Candidates: {summary['successful_candidates']}/{summary['total_candidates']} successful ({summary['duplicates_reused']} duplicates reused)")
+        if summary["prescreen_rejects"]:
+            print(f"🚫 Local pre-screen: {summary['prescreen_rejects']} clear rejects, {summary['gemini_calls_avoided']} Gemini calls avoided")
+        if summary["phases_reused"]:
+            print(f"♻️  Checkpoints: {summary['phases_reused']} phases reused from earlier runs")
+        print(f"⏱️  Wall Time: {summary['wall_time_seconds']} seconds ({summary['max_workers']} workers)")
+        print(f"🚀 Throughput: {summary['candidates_per_minute']} candidates/minute")
+        print(f"💰 Estimated Gemini cost: ${summary['estimated_cost_usd']:.4f} (${summary['estimated_cost_per_candidate_usd'] or 0:.4f} per candidate)")
+        print(f"🔀 Model routing: ${summary['routing_savings_usd']:.4f} estimated savings ({summary['routing_escalations']} escalations)")
+        print("\n📊 PER-PHASE LATENCY (seconds):")
+        for phase_name, stats in summary["phase_latency_seconds"].items():
+            print(f"   {phase_name:<25} p50={stats['p50']:<8} p90={stats['p90']:<8} p99={stats['p99']:<8} max={stats['max']}")
+        if summary["top_candidates"]:
+            print("\n🏆 TOP CANDIDATES:")
+            print_candidate_rows(summary["top_candidates"])
+
+def print_candidate_rows(rows):
+    """Print one line per stored candidate row"""
+    for row in rows:
+        jlpt = "native" if row["jlpt_level"] == 0 else (f"N{row['jlpt_level']}" if row["jlpt_level"] and row["jlpt_level"] <= 5 else "-")
+        years = f"{row['experience_years']}y" if row["experience_years"] is not None else "-"
+        print(f"   {row['candidate_id']:<30} avg={str(row['average_score']):<7} screen={str(row['screening_score']):<5} assess={str(row['assessment_score']):<5} "
+              f"jlpt={jlpt:<7} exp={years:<6} flags={row['flag_count']}  {row['recommendation'] or ''}")
+
+def query_results_store(args):
+    """Print stored candidates matching the --query filters"""
+    store = results_store.get_shared_store()
+    rows = store.query(
+        job_description=None if args.any_job else args.job_description,
+        min_screening_score=args.min_screening,
+        min_assessment_score=args.min_assessment,
+        max_jlpt_level=args.max_jlpt,
+        flag_type=args.flag_type,
+        order_by=args.order_by,
+        limit=args.limit
+    )
+    print(f"🗄️  {len(rows)} matching candidates in {store.db_path}")
+    print_candidate_rows(rows)
+    return rows
+
+def parse_arguments(argv=None):
+    """Parse command line options for single or batch runs"""
+    parser = argparse.ArgumentParser(description="Minma Inc. HR automation pipeline")
+    parser.add_argument("--cv", help="CV file for a single-candidate run")
+    parser.add_argument("--batch", metavar="DIR", help="Folder of CV PDFs to process concurrently")
+    parser.add_argument("--manifest", metavar="FILE", help="JSON manifest of {cv_file, job_description} entries")
+    parser.add_argument("--job-description", default=DEFAULT_JOB_DESCRIPTION, help="Job description used when none is given per candidate")
+    parser.add_argument("--max-workers", type=int, default=4, help="Maximum candidates processed concurrently in batch mode")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run on one asyncio event loop instead of worker threads (allows hundreds of concurrent candidates)")
+    parser.add_argument("--output-root", default="Batch_Output", help="Root folder for per-candidate batch outputs")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the Gemini response cache for this run")
+    parser.add_argument("--stream", action="store_true", help="Stream Phase 3/4 outputs and save sections as they complete")
+    parser.add_argument("--no-dedupe", action="store_true", help="Process every CV even if an identical or near-identical CV was seen before")
+    parser.add_argument("--prescreen", choices=prescreen_rules.PRESCREEN_MODES, help="Local pre-screen for clear rejects: skip or defer their Gemini screening (default: HR_PRESCREEN or off)")
+    parser.add_argument("--prescreen-reject-below", type=int, help="Triage score below which the pre-screen rejects a candidate")
+    parser.add_argument("--profile", choices=list(generation_profiles.PROFILES), help="Generation profile (thinking budget, output limit, temperature) for every phase (default: HR_GENERATION_PROFILE or thorough)")
+    parser.add_argument("--no-routing", action="store_true", help="Run every phase on its own model (no fast-model first tier)")
+    parser.add_argument("--rpm", type=int, help="Vertex AI requests-per-minute budget")
+    parser.add_argument("--tpm", type=int, help="Vertex AI tokens-per-minute budget")
+    parser.add_argument("--phases", help="Comma-separated phases to execute, e.g. 1,3 (\"none\" only rebuilds the final report); the others are loaded from existing outputs")
+    parser.add_argument("--output-dir", help="Run directory of a single-candidate run (default: Output/<candidate id>-<CV and job digest>)")
+    parser.add_argument("--no-resume", action="store_true", help="Recompute every phase even if its checkpointed inputs are unchanged")
+    parser.add_argument("--no-store", action="store_true", help="Do not save results to the SQLite results store (JSON outputs are still written)")
+    parser.add_argument("--query", action="store_true", help="Query stored candidates for --job-description instead of running the pipeline")
+    parser.add_argument("--any-job", action="store_true", help="With --query, match candidates of every job description")
+    parser.add_argument("--min-screening", type=int, help="With --query, minimum screening score")
+    parser.add_argument("--min-assessment", type=int, help="With --query, minimum assessment score")
+    parser.add_argument("--max-jlpt", help="With --query, weakest accepted JLPT level (e.g. N2 matches N1, N2 and native)")
+    parser.add_argument("--flag-type", help="With --query, only candidates with a review flag of this type")
+    parser.add_argument("--order-by", default="average_score", choices=sorted(results_store.ORDER_COLUMNS), help="With --query, column to sort by (best first)")
+    parser.add_argument("--limit", type=int, help="With --query, maximum candidates to list")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_arguments(argv)
+    
     print("🚀 MINMA INC. HR AUTOMATION MASTER SCRIPT")
     print("=" * 60)
     
+    if args.query:
+        query_results_store(args)
+        return True
+    
+    if args.phases is not None:
+        try:
+            HRAutomationPipeline.parse_phases(args.phases)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+    
+    if args.no_cache:
+        response_cache.configure(enabled=False)
+        print("💾 Response cache bypassed for this run")
+    
+    if args.no_routing:
+        model_router.configure(enabled=False)
+        print("🔀 Model routing disabled for this run")
+    
+    if args.rpm or args.tpm:
+        request_scheduler.configure(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+        print(f"🚦 Rate limits: {args.rpm or request_scheduler.REQUESTS_PER_MINUTE} requests/min, {args.tpm or request_scheduler.TOKENS_PER_MINUTE} tokens/min")
+    
+    pipeline_options = {"stream": args.stream, "deduplicate": not args.no_dedupe, "prescreen": args.prescreen, "prescreen_reject_below": args.prescreen_reject_below,
+                        "generation_profile": args.profile, "store_results": not args.no_store,
+                        "resume": not args.no_resume, "phases": args.phases}
+    
+    # Batch mode: one pipeline per candidate under a bounded concurrency limit
+    if args.batch or args.manifest:
+        batch_options = {"max_workers": args.max_workers, "output_root": args.output_root, "pipeline_options": pipeline_options}
+        if args.manifest:
+            runner = BatchPipelineRunner.from_manifest(args.manifest, args.job_description, **batch_options)
+        else:
+            runner = BatchPipelineRunner.from_directory(args.batch, args.job_description, **batch_options)
+        
+        if not runner.candidates:
+            print("❌ No CV files found for batch run!")
+            return False
+        
+        print(f"👥 Batch of {len(runner.candidates)} candidates, {args.max_workers} concurrent {'tasks' if args.use_async else 'workers'}")
+        summary = asyncio.run(runner.run_async()) if args.use_async else runner.run()
+        return summary["failed_candidates"] == 0
+    
     # Check available CV files
-    cv_files = ["IT Communicator 3.pdf", "CV-IT-JP.pdf", "rirekisyovi.pdf"]
+    cv_files = [args.cv] if args.cv else ["IT Communicator 3.pdf", "CV-IT-JP.pdf", "rirekisyovi.pdf"]
     available_cvs = [cv for cv in cv_files if os.path.exists(cv)]
     
     if not available_cvs:
@@ -429,12 +1517,9 @@ def main():
     cv_file = available_cvs[0]
     print(f"📄 Using CV file: {cv_file}")
     
-    # Job description (can be customized)
-    job_desc = "Software Engineer at Minma Vietnam - Hanoi office, focusing on e-commerce platform development"
-    
     # Initialize and run pipeline
-    pipeline = HRAutomationPipeline(cv_file, job_desc)
-    return pipeline.run_complete_pipeline()
+    pipeline = HRAutomationPipeline(cv_file, args.job_description, output_dir=args.output_dir, **pipeline_options)
+    return asyncio.run(pipeline.run()) if args.use_async else pipeline.run_complete_pipeline()
 
 if __name__ == "__main__":
     success = main()
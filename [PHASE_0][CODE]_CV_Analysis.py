@@ -5,38 +5,107 @@ Advanced extraction following Minma Inc.'s recruitment requirements
 """
 
 import os
-import vertexai
-from google.oauth2 import service_account
-from vertexai.generative_models import GenerativeModel, Part
+import json
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+# Shared Vertex AI client pool (credentials and models are initialized once per process)
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Tiered routing: extraction runs on the fast model first and escalates to MODEL_NAME when in doubt
+model_router = module_loader.load_module("[SHARED][CODE]_Model_Router.py", "model_router")
+
+# Local text-layer extraction (the PDF is only uploaded for scanned pages)
+pdf_preprocessor = module_loader.load_module("[SHARED][CODE]_PDF_Preprocessor.py", "pdf_preprocessor")
 
 # Vertex AI configuration
-KEY_PATH = os.path.join("key", "vertex-minmavn-94ace6513e6e.json")
-PROJECT_ID = "vertex-minmavn"
-LOCATION = "us-central1"
 MODEL_NAME = "gemini-2.5-pro"
 
-def extract_cv_info_phase0(pdf_path, job_title="Software Engineer", department="Dev Team", location="Minma Vietnam - Hanoi"):
-    """Extract CV information using Phase 0 system prompt from Minma's HR system"""
-    try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
-        
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
-        
-        # Read PDF file
-        with open(pdf_path, "rb") as f:
-            pdf_data = f.read()
-        
-        # Create PDF part from bytes
-        pdf_file = Part.from_data(
-            data=pdf_data,
-            mime_type="application/pdf"
-        )
-        
-        # Phase 0 System Prompt
-        system_prompt = """<role>
+# Page-chunked extraction for long CVs (HR_PHASE0_CHUNKING=0 always sends one request)
+CHUNKING_ENABLED = os.environ.get("HR_PHASE0_CHUNKING", "1").lower() not in ("0", "false", "no")
+CHUNK_MIN_PAGES = 5
+CHUNK_PAGES = 3
+MAX_CHUNK_WORKERS = 4
+CHUNK_NOTE = """This request contains pages {first}-{last} of a {total}-page CV. Extract only the information shown on these pages and leave all other fields empty; the partial extractions are merged afterwards."""
+
+# Phase 0 response schema (mirrors the structured output format in SYSTEM_PROMPT)
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+_PERIOD_FIELDS = {"start_year": _STRING, "start_month": _STRING, "end_year": _STRING, "end_month": _STRING}
+
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "candidate_info": {
+            "type": "object",
+            "properties": {
+                "photo_url": _STRING,
+                "personal_details": {
+                    "type": "object",
+                    "properties": {name: _STRING for name in ["name", "furigana", "gender", "birthdate", "age", "address", "phone", "email", "other_contact"]}
+                },
+                "education": {
+                    "type": "array",
+                    "items": {"type": "object", "properties": dict(_PERIOD_FIELDS, school=_STRING, department=_STRING, degree=_STRING, status=_STRING)}
+                },
+                "work_experience": {
+                    "type": "array",
+                    "items": {"type": "object", "properties": dict(_PERIOD_FIELDS, company=_STRING, position=_STRING, responsibilities=_STRING_LIST)}
+                },
+                "licenses": {
+                    "type": "array",
+                    "items": {"type": "object", "properties": {"year": _STRING, "month": _STRING, "name": _STRING, "score": _STRING}}
+                },
+                "skills": {
+                    "type": "object",
+                    "properties": {
+                        "technical_skills": _STRING_LIST,
+                        "soft_skills": _STRING_LIST,
+                        "languages": _STRING_LIST,
+                        "japanese_proficiency": _STRING
+                    }
+                },
+                "motivation": {
+                    "type": "object",
+                    "properties": {name: _STRING for name in ["hobbies", "strengths", "career_goals", "reason_for_applying"]}
+                },
+                "work_preferences": {
+                    "type": "object",
+                    "properties": {name: _STRING for name in ["work_start_time", "work_overtime_willingness", "commute_time"]}
+                },
+                "compliance_commitment": _STRING,
+                "notes": _STRING
+            },
+            "required": ["personal_details", "education", "work_experience", "skills"]
+        },
+        "minma_culture_fit_indicators": {
+            "type": "object",
+            "properties": {name: _STRING for name in ["honesty_values", "customer_focus", "teamwork_style", "learning_attitude"]}
+        },
+        "extraction_quality": {
+            "type": "object",
+            "properties": {
+                "completeness_score": _STRING,
+                "confidence_level": {"type": "string", "enum": ["high", "medium", "low"]},
+                "missing_information": _STRING_LIST,
+                "minma_specific_gaps": _STRING_LIST
+            },
+            "required": ["completeness_score", "confidence_level"]
+        }
+    },
+    "required": ["candidate_info", "minma_culture_fit_indicators", "extraction_quality"]
+}
+
+# Request application/json constrained to the response schema
+GENERATION_CONFIG = json_output.json_generation_config(RESPONSE_SCHEMA)
+
+# Phase 0 System Prompt
+SYSTEM_PROMPT = """<role>
 You are a highly specialized AI-powered CV Information Extraction Specialist for Minma Inc.'s automated recruitment system. You function as a meticulous data analyst with expertise in Japanese business culture, technical skill assessment, and comprehensive candidate profiling.
 </role>
 
@@ -262,15 +331,227 @@ Minma Inc. is a technology-driven company specializing in digital service platfo
 
 Please analyze the provided CV document and extract information following this structured format. Return ONLY the JSON response without any additional text or explanation."""
 
-        # Generate content
-        response = model.generate_content([system_prompt, pdf_file])
+# Merge rules for partial extractions of one CV
+_CONFIDENCE_ORDER = ["low", "medium", "high"]
+_RECORD_KEYS = {
+    "education": ["school", "degree", "start_year"],
+    "work_experience": ["company", "position", "start_year", "start_month"],
+    "licenses": ["name", "year"]
+}
+
+def _is_empty(value):
+    """True for values a chunk leaves blank (None, empty strings/lists/objects)"""
+    return value is None or value == "" or value == [] or value == {}
+
+def _normalize(value):
+    """Comparison form of a string for de-duplication"""
+    return " ".join(str(value).lower().split())
+
+def _merge_unique(*lists):
+    """Concatenate lists, dropping empty and case/space-insensitive duplicate strings"""
+    merged, seen = [], set()
+    for values in lists:
+        for value in values or []:
+            key = _normalize(value) if not _is_empty(value) else ""
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(value)
+    return merged
+
+def _merge_fields(target, source):
+    """Fill blank fields of target from source (first non-empty value wins)"""
+    for key, value in (source or {}).items():
+        if _is_empty(target.get(key)) and not _is_empty(value):
+            target[key] = value
+    return target
+
+def _merge_records(section, *record_lists):
+    """Concatenate education/work/license records, merging duplicates that span chunk boundaries"""
+    merged, index = [], {}
+    for records in record_lists:
+        for record in records or []:
+            key = tuple(_normalize(record.get(field) or "") for field in _RECORD_KEYS[section])
+            if not any(key):
+                continue
+            if key in index:
+                existing = index[key]
+                _merge_fields(existing, record)
+                if section == "work_experience":
+                    existing["responsibilities"] = _merge_unique(existing.get("responsibilities"), record.get("responsibilities"))
+            else:
+                index[key] = dict(record)
+                merged.append(index[key])
+    return merged
+
+def merge_extractions(extractions):
+    """Merge per-chunk Phase 0 outputs (in page order) into one output of the Phase 0 schema"""
+    infos = [extraction.get("candidate_info") or {} for extraction in extractions]
+    qualities = [extraction.get("extraction_quality") or {} for extraction in extractions]
+
+    candidate_info = {}
+    for info in infos:
+        for key in ["photo_url", "compliance_commitment"]:
+            if _is_empty(candidate_info.get(key)) and not _is_empty(info.get(key)):
+                candidate_info[key] = info[key]
+        for key in ["personal_details", "motivation", "work_preferences"]:
+            _merge_fields(candidate_info.setdefault(key, {}), info.get(key))
+    for section in _RECORD_KEYS:
+        candidate_info[section] = _merge_records(section, *(info.get(section) for info in infos))
+
+    skills_list = [info.get("skills") or {} for info in infos]
+    candidate_info["skills"] = {
+        key: _merge_unique(*(skills.get(key) for skills in skills_list)) for key in ["technical_skills", "soft_skills", "languages"]
+    }
+    candidate_info["skills"]["japanese_proficiency"] = next((skills["japanese_proficiency"] for skills in skills_list if not _is_empty(skills.get("japanese_proficiency"))), "")
+    candidate_info["notes"] = " ".join(_merge_unique(*([info.get("notes")] for info in infos)))
+
+    culture_fit = {}
+    for extraction in extractions:
+        _merge_fields(culture_fit, extraction.get("minma_culture_fit_indicators"))
+
+    # Only information no chunk found is missing; the weakest chunk bounds the confidence
+    missing_sets = [{_normalize(item) for item in quality.get("missing_information") or []} for quality in qualities]
+    still_missing = set.intersection(*missing_sets) if missing_sets else set()
+    scores = [int(quality["completeness_score"]) for quality in qualities if str(quality.get("completeness_score", "")).isdigit()]
+    levels = [quality.get("confidence_level") for quality in qualities if quality.get("confidence_level") in _CONFIDENCE_ORDER]
+    extraction_quality = {
+        "completeness_score": str(max(scores)) if scores else (qualities[0].get("completeness_score", "") if qualities else ""),
+        "confidence_level": min(levels, key=_CONFIDENCE_ORDER.index) if levels else "low",
+        "missing_information": [item for item in _merge_unique(*(quality.get("missing_information") for quality in qualities)) if _normalize(item) in still_missing],
+        "minma_specific_gaps": _merge_unique(*(quality.get("minma_specific_gaps") for quality in qualities))
+    }
+
+    return {"candidate_info": candidate_info, "minma_culture_fit_indicators": culture_fit, "extraction_quality": extraction_quality}
+
+def _build_contents(pdf_data, use_text_layer, first_page=1):
+    """Build request contents for a PDF (text layer where possible, slimmed PDF otherwise)"""
+    contents, pdf_report = pdf_preprocessor.prepare_pdf_contents(pdf_data, use_text_layer, first_page=first_page)
+    print(pdf_preprocessor.describe(pdf_report))
+    optimization_summary = pdf_preprocessor.describe_optimization(pdf_report)
+    if optimization_summary:
+        print(optimization_summary)
+    return contents
+
+def _needs_escalation(extraction):
+    """Escalation reason for an extraction the fast model was unsure about"""
+    if (extraction.get("extraction_quality") or {}).get("confidence_level") == "low":
+        return "extraction_quality.confidence_level is low"
+    return None
+
+def _generate(contents):
+    """Run one Phase 0 request through the model tiers"""
+    response = model_router.generate_content(contents, "phase_0", MODEL_NAME, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG, check=_needs_escalation)
+    return response.text
+
+async def _generate_async(contents):
+    """_generate for coroutines"""
+    response = await model_router.generate_content_async(contents, "phase_0", MODEL_NAME, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG, check=_needs_escalation)
+    return response.text
+
+def _chunk_contents(pdf_data, first, last, total, use_text_layer):
+    """Request contents of one page range of a long CV"""
+    chunk_data = pdf_preprocessor.subset_pdf(pdf_data, range(first, last + 1))
+    return _build_contents(chunk_data, use_text_layer, first) + [CHUNK_NOTE.format(first=first, last=last, total=total)]
+
+def _extract_chunk(pdf_data, first, last, total, use_text_layer):
+    """Extract and parse one page range of a long CV"""
+    contents = _chunk_contents(pdf_data, first, last, total, use_text_layer)
+    return json_output.parse_json_output(_generate(contents), RESPONSE_SCHEMA)
+
+async def _extract_chunk_async(pdf_data, first, last, total, use_text_layer):
+    """_extract_chunk for coroutines (PDF work runs in a worker thread)"""
+    contents = await asyncio.to_thread(_chunk_contents, pdf_data, first, last, total, use_text_layer)
+    return json_output.parse_json_output(await _generate_async(contents), RESPONSE_SCHEMA)
+
+def extract_cv_chunked(pdf_data, page_ranges, use_text_layer=None):
+    """Extract page ranges concurrently and merge them; returns None if any chunk fails"""
+    total = page_ranges[-1][1]
+    print(f"📚 Long CV ({total} pages): extracting {len(page_ranges)} page ranges in parallel")
+    with ThreadPoolExecutor(max_workers=min(MAX_CHUNK_WORKERS, len(page_ranges))) as executor:
+        # Each chunk runs in a copy of the caller's context so call metrics stay attributed to this run
+        futures = [
+            executor.submit(contextvars.copy_context().run, _extract_chunk, pdf_data, first, last, total, use_text_layer)
+            for first, last in page_ranges
+        ]
+        try:
+            extractions = [future.result() for future in futures]
+        except Exception as e:
+            # The merge needs every chunk: chunks not yet started are not sent
+            executor.shutdown(wait=False, cancel_futures=True)
+            print(f"⚠️  Chunked extraction failed ({e}), falling back to a single request")
+            return None
+    return json.dumps(merge_extractions(extractions), ensure_ascii=False)
+
+async def extract_cv_chunked_async(pdf_data, page_ranges, use_text_layer=None):
+    """extract_cv_chunked for coroutines: page ranges are extracted concurrently on the event loop"""
+    total = page_ranges[-1][1]
+    print(f"📚 Long CV ({total} pages): extracting {len(page_ranges)} page ranges concurrently")
+    try:
+        # The first failing chunk cancels the requests of the others still in flight
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_extract_chunk_async(pdf_data, first, last, total, use_text_layer)) for first, last in page_ranges]
+    except Exception as e:
+        error = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+        print(f"⚠️  Chunked extraction failed ({error}), falling back to a single request")
+        return None
+    return json.dumps(merge_extractions([task.result() for task in tasks]), ensure_ascii=False)
+
+def extract_cv_info_phase0(pdf_path, job_title="Software Engineer", department="Dev Team", location="Minma Vietnam - Hanoi", use_text_layer=None, chunk_pages=None):
+    """Extract CV information using Phase 0 system prompt from Minma's HR system
+
+    Pages with a usable text layer are sent as extracted text; scanned pages (or the
+    whole file when no text backend is installed) are uploaded as a slimmed PDF.
+    CVs of CHUNK_MIN_PAGES or more are split into page ranges extracted concurrently.
+    """
+    try:
+        # Read PDF file
+        with open(pdf_path, "rb") as f:
+            pdf_data = f.read()
+        
+        # Long CVs: extract page ranges in parallel and merge the partial results
+        if CHUNKING_ENABLED and pdf_preprocessor.available_backend():
+            page_count = pdf_preprocessor.count_pages(pdf_data)
+            if page_count >= CHUNK_MIN_PAGES:
+                merged = extract_cv_chunked(pdf_data, pdf_preprocessor.split_page_ranges(page_count, chunk_pages or CHUNK_PAGES), use_text_layer)
+                if merged is not None:
+                    return merged
         
-        return response.text
+        # Build the request contents from the text layer where possible (slimming any PDF still uploaded)
+        return _generate(_build_contents(pdf_data, use_text_layer))
         
     except Exception as e:
         print(f"❌ Error: {e}")
         return None
 
+async def extract_cv_info_phase0_async(pdf_path, job_title="Software Engineer", department="Dev Team", location="Minma Vietnam - Hanoi", use_text_layer=None, chunk_pages=None):
+    """extract_cv_info_phase0 for coroutines
+
+    PDF reading and text-layer extraction run in worker threads; the Gemini requests
+    are awaited, so many CVs can be extracted concurrently on one event loop.
+    """
+    try:
+        with open(pdf_path, "rb") as f:
+            pdf_data = f.read()
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        return None
+    return await extract_cv_data_phase0_async(pdf_data, use_text_layer, chunk_pages)
+
+async def extract_cv_data_phase0_async(pdf_data, use_text_layer=None, chunk_pages=None):
+    """extract_cv_info_phase0_async for PDF bytes already in memory (e.g. an uploaded CV)"""
+    try:
+        if CHUNKING_ENABLED and pdf_preprocessor.available_backend():
+            page_count = await asyncio.to_thread(pdf_preprocessor.count_pages, pdf_data)
+            if page_count >= CHUNK_MIN_PAGES:
+                merged = await extract_cv_chunked_async(pdf_data, pdf_preprocessor.split_page_ranges(page_count, chunk_pages or CHUNK_PAGES), use_text_layer)
+                if merged is not None:
+                    return merged
+        
+        return await _generate_async(await asyncio.to_thread(_build_contents, pdf_data, use_text_layer))
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
 
 
 if __name__ == "__main__":
@@ -304,7 +585,6 @@ if __name__ == "__main__":
         with open(workflow_file, 'w', encoding='utf-8') as f:
             f.write(result)
         print(f"💾 Workflow file saved to: {workflow_file}")
-        print("   (Note: This may contain raw text, not valid JSON)")
         
         print("\n✅ Phase 0 CV extraction completed!")
     else:
@@ -5,36 +5,76 @@ Screening evaluation following Minma Inc.'s recruitment requirements
 """
 
 import os
-import json
-import vertexai
-from google.oauth2 import service_account
-from vertexai.generative_models import GenerativeModel
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+# Shared Vertex AI client pool (credentials and models are initialized once per process)
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Deterministic local triage that can stand in for Gemini screening on clear mismatches
+prescreen_rules = module_loader.load_module("[SHARED][CODE]_Prescreen_Rules.py", "prescreen_rules")
 
 # Vertex AI configuration
-KEY_PATH = os.path.join("key", "vertex-minmavn-94ace6513e6e.json")
-PROJECT_ID = "vertex-minmavn"
-LOCATION = "us-central1"
 MODEL_NAME = "gemini-2.5-pro"
 
-def screen_candidate_phase1(candidate_json_path, job_description=None):
-    """Screen candidate using Phase 1 system prompt from Minma's HR system"""
-    try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
-        
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
-        
-        # Read candidate data from Phase 0 (raw text)
-        with open(candidate_json_path, "r", encoding='utf-8') as f:
-            candidate_data_raw = f.read()
-        
-        # Job Description context (if provided)
-        job_context = job_description or "Software Engineer position at Minma Vietnam - Hanoi office"
-        
-        # Phase 1 System Prompt
-        system_prompt = """<role>
+# Phase 1 response schema (mirrors the structured output format in SYSTEM_PROMPT)
+_SCORED_NOTE = {
+    "type": "object",
+    "properties": {"score": {"type": "integer"}, "notes": {"type": "string"}},
+    "required": ["score", "notes"]
+}
+_REVIEW_FLAG = {
+    "type": "object",
+    "properties": {
+        "flag_type": {"type": "string", "enum": ["location", "ideology_beliefs", "long_employment_gap", "career_consistency"]},
+        "message": {"type": "string"},
+        "details": {"type": "string"}
+    },
+    "required": ["flag_type", "message"]
+}
+
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "screening_score": {"type": "integer"},
+        "score_breakdown": {
+            "type": "object",
+            "properties": {name: _SCORED_NOTE for name in ["expertise_experience", "education_level", "certifications", "motivation", "age_factor"]},
+            "required": ["expertise_experience", "education_level", "certifications", "motivation", "age_factor"]
+        },
+        "flags_for_human_review": {"type": "array", "items": _REVIEW_FLAG},
+        "minma_alignment_assessment": {
+            "type": "object",
+            "properties": {name: {"type": "string"} for name in ["technical_fit", "cultural_indicators", "risk_factors"]}
+        }
+    },
+    "required": ["screening_score", "score_breakdown", "flags_for_human_review", "minma_alignment_assessment"]
+}
+
+# Request application/json constrained to the response schema
+GENERATION_CONFIG = json_output.json_generation_config(RESPONSE_SCHEMA)
+
+# Phase 0 fields the screening actually uses (name, contact details and photo are not scored)
+PHASE0_PROJECTION = {
+    "candidate_info": {
+        "personal_details": {"birthdate": True, "age": True, "address": True},
+        "education": True,
+        "work_experience": True,
+        "licenses": True,
+        "skills": True,
+        "motivation": True,
+        "work_preferences": True,
+        "compliance_commitment": True,
+        "notes": True
+    },
+    "minma_culture_fit_indicators": True,
+    "extraction_quality": {"confidence_level": True, "missing_information": True, "minma_specific_gaps": True}
+}
+
+# Phase 1 System Prompt
+SYSTEM_PROMPT = """<role>
 You are a Senior AI Screening Analyst for Minma Inc.'s HR automation system. You function as an experienced HR professional with deep expertise in candidate evaluation, Japanese labor law compliance, and objective assessment methodologies. You provide analytical support to human decision-makers without making final hiring decisions.
 </role>
 
@@ -208,39 +248,111 @@ Minma Inc. operates "Curashi no Market" (Japanese e-commerce marketplace connect
 
 **CRITICAL BOUNDARY:** Provide analytical support for human decision-makers. Never make final hiring recommendations or reject candidates independently."""
 
-        # Prepare input text
-        input_text = f"""Please analyze the following candidate data for screening evaluation:
+def candidate_payload(candidate_data_raw):
+    """Projected, minified Phase 0 data for the screening prompt (raw text if it is not JSON)"""
+    try:
+        candidate_data = json_output.parse_json_output(candidate_data_raw)
+    except json_output.JSONOutputError:
+        return candidate_data_raw
+    return json_output.compact_json(candidate_data, PHASE0_PROJECTION)
+
+def read_candidate_data(candidate_json_path):
+    """Phase 0 output text from a file path, or the JSON string itself (as the endpoints accept)"""
+    if candidate_json_path.lstrip().startswith("{"):
+        return candidate_json_path
+    with open(candidate_json_path, "r", encoding='utf-8') as f:
+        return f.read()
+
+def screening_input(candidate_json_path, job_description=None):
+    """Build the Phase 1 request text from a Phase 0 output file or JSON string"""
+    # Read candidate data from Phase 0
+    candidate_data_raw = read_candidate_data(candidate_json_path)
+    
+    # Job Description context (if provided)
+    job_context = job_description or "Software Engineer position at Minma Vietnam - Hanoi office"
+    
+    return f"""Please analyze the following candidate data for screening evaluation:
 
 **Job Context:** {job_context}
 
 **Candidate Information:**
-{candidate_data_raw}
+{candidate_payload(candidate_data_raw)}
 
 Please provide a comprehensive screening analysis following the structured format specified in your instructions."""
 
+def _report_error(e):
+    """Print a Phase 1 failure with its traceback"""
+    print(f"❌ Error in Phase 1 Screening: {e}")
+    print(f"❌ Error type: {type(e).__name__}")
+    import traceback
+    print(f"❌ Full traceback: {traceback.format_exc()}")
+
+def screen_candidate_phase1(candidate_json_path, job_description=None):
+    """Screen candidate using Phase 1 system prompt from Minma's HR system"""
+    try:
+        input_text = screening_input(candidate_json_path, job_description)
+
         # Generate content
-        response = model.generate_content([system_prompt, input_text])
+        response = vertex_client.generate_content([input_text], model_name=MODEL_NAME, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG, phase="phase_1")
         
-        # Clean response text (remove markdown if present)
-        response_text = response.text.strip()
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+        # Output is schema-constrained JSON; callers parse it once with json_output
+        print(f"🤖 Response length: {len(response.text)}")
         
-        print(f"🤖 Raw response length: {len(response.text)}")
-        print(f"🤖 Cleaned response length: {len(response_text)}")
+        return response.text
         
-        return response_text
+    except Exception as e:
+        _report_error(e)
+        return None
+
+async def screen_candidate_phase1_async(candidate_json_path, job_description=None):
+    """screen_candidate_phase1 for coroutines"""
+    try:
+        input_text = screening_input(candidate_json_path, job_description)
+        response = await vertex_client.generate_content_async([input_text], model_name=MODEL_NAME, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG, phase="phase_1")
+        print(f"🤖 Response length: {len(response.text)}")
+        return response.text
         
     except Exception as e:
-        print(f"❌ Error in Phase 1 Screening: {e}")
-        print(f"❌ Error type: {type(e).__name__}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
+        _report_error(e)
         return None
 
+def prescreen_candidate_phase1(candidate_json_path, job_description=None, reject_below=None):
+    """Triage Phase 0 output locally (no Gemini call); see prescreen_rules.triage"""
+    candidate_data = json_output.parse_json_output(read_candidate_data(candidate_json_path))
+    return prescreen_rules.triage(candidate_data, job_description, reject_below)
+
+def prescreen_screening_result(triage):
+    """Phase 1 result for a candidate rejected by the local pre-screen
+
+    Follows RESPONSE_SCHEMA so downstream consumers keep working. Only the experience
+    component is assessed, so screening_score is the breakdown's sum (a partial score,
+    not comparable with a Gemini screening score); the triage itself is kept under "prescreen".
+    """
+    components = triage["components"]
+    not_assessed = "Not assessed: candidate rejected by the local pre-screen before Gemini screening"
+    reasons = "; ".join(triage["reasons"])
+    score_breakdown = {
+        "expertise_experience": {
+            "score": round(triage["triage_score"] * 30 / 100),
+            "notes": f"Local pre-screen ({triage['profile']}): matched skills {', '.join(components['skills']['matched']) or 'none'}, {components['experience']['years']} years of experience, Japanese {components['japanese']['jlpt_level'] or 'not stated'}"
+        },
+        "education_level": {"score": 0, "notes": not_assessed},
+        "certifications": {"score": 0, "notes": not_assessed},
+        "motivation": {"score": 0, "notes": not_assessed},
+        "age_factor": {"score": 0, "notes": not_assessed}
+    }
+    return {
+        "screening_score": sum(component["score"] for component in score_breakdown.values()),
+        "score_breakdown": score_breakdown,
+        "flags_for_human_review": [],
+        "minma_alignment_assessment": {
+            "technical_fit": f"Skills matched for {triage['profile']}: {', '.join(components['skills']['matched']) or 'none'}",
+            "cultural_indicators": not_assessed,
+            "risk_factors": f"Rejected by deterministic pre-screen rules, human confirmation required: {reasons}"
+        },
+        "prescreen": triage
+    }
+
 if __name__ == "__main__":
     # Phase 0 output file should exist
     candidate_file = "[PHASE_0][OUTPUT]_CV_Analysis.json"
@@ -274,7 +386,6 @@ if __name__ == "__main__":
         with open(workflow_file, 'w', encoding='utf-8') as f:
             f.write(result)
         print(f"💾 Workflow file saved to: {workflow_file}")
-        print("   (Note: This may contain raw text, not valid JSON)")
         
         print("\n✅ Phase 1 screening completed!")
     else:
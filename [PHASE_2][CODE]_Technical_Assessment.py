@@ -6,28 +6,54 @@ Structured interview assessment following Minma Inc.'s evaluation framework
 
 import os
 import json
-import vertexai
-from google.oauth2 import service_account
-from vertexai.generative_models import GenerativeModel
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+# Shared Vertex AI client pool (credentials and models are initialized once per process)
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
 
 # Vertex AI configuration
-KEY_PATH = os.path.join("key", "vertex-minmavn-94ace6513e6e.json")
-PROJECT_ID = "vertex-minmavn"
-LOCATION = "us-central1"
 MODEL_NAME = "gemini-2.5-pro"
 
-def assess_candidate_phase2(candidate_responses):
-    """Assess candidate using Phase 2 chatbot interview system prompt"""
-    try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
-        
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
-        
-        # Phase 2 System Prompt
-        system_prompt = """<role>
+# Phase 2 response schema (mirrors the structured output format in SYSTEM_PROMPT)
+_SCORED_EXCERPT = {
+    "type": "object",
+    "properties": {"score": {"type": "integer"}, "excerpt": {"type": "string"}, "notes": {"type": "string"}},
+    "required": ["score", "notes"]
+}
+
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "assessment_score": {"type": "integer"},
+        "score_breakdown": {
+            "type": "object",
+            "properties": {name: _SCORED_EXCERPT for name in ["accountability", "self_improvement", "work_ethic_result_orientation", "company_knowledge_alignment"]},
+            "required": ["accountability", "self_improvement", "work_ethic_result_orientation", "company_knowledge_alignment"]
+        },
+        "flags_for_human_review": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"flag_type": {"type": "string"}, "message": {"type": "string"}, "details": {"type": "string"}},
+                "required": ["flag_type", "message"]
+            }
+        },
+        "interview_insights": {
+            "type": "object",
+            "properties": {name: {"type": "string"} for name in ["communication_quality", "minma_value_alignment", "red_flags"]}
+        }
+    },
+    "required": ["assessment_score", "score_breakdown", "flags_for_human_review", "interview_insights"]
+}
+
+# Request application/json constrained to the response schema
+GENERATION_CONFIG = json_output.json_generation_config(RESPONSE_SCHEMA)
+
+# Phase 2 System Prompt
+SYSTEM_PROMPT = """<role>
 You are a Senior AI Assessment Specialist conducting structured candidate interviews for Minma Inc. You function as an experienced behavioral interviewer with expertise in competency-based evaluation, cultural fit assessment, and risk pattern detection. Your role is to facilitate objective candidate evaluation through systematic questioning and response analysis.
 </role>
 
@@ -208,16 +234,23 @@ Minma Inc. operates two key platforms requiring candidates who embody specific v
 
 **CRITICAL BOUNDARY:** Provide systematic evaluation support for human decision-makers. All flagged candidates require mandatory human review before any hiring decisions."""
 
-        # Prepare input text with candidate responses
-        input_text = f"""Please analyze the following candidate interview responses:
+def assessment_input(candidate_responses):
+    """Build the Phase 2 request text from the candidate's interview responses"""
+    return f"""Please analyze the following candidate interview responses:
 
 **Candidate Interview Responses:**
-{json.dumps(candidate_responses, indent=2, ensure_ascii=False)}
+{json_output.compact_json(candidate_responses)}
 
 Please provide a comprehensive assessment analysis following the structured format specified in your instructions, scoring each dimension and detecting any risk patterns."""
 
+def assess_candidate_phase2(candidate_responses):
+    """Assess candidate using Phase 2 chatbot interview system prompt"""
+    try:
+        # Prepare input text with candidate responses
+        input_text = assessment_input(candidate_responses)
+
         # Generate content
-        response = model.generate_content([system_prompt, input_text])
+        response = vertex_client.generate_content([input_text], model_name=MODEL_NAME, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG, phase="phase_2")
         
         return response.text
         
@@ -225,6 +258,16 @@ Please provide a comprehensive assessment analysis following the structured form
         print(f"❌ Error: {e}")
         return None
 
+async def assess_candidate_phase2_async(candidate_responses):
+    """assess_candidate_phase2 for coroutines"""
+    try:
+        response = await vertex_client.generate_content_async([assessment_input(candidate_responses)], model_name=MODEL_NAME, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG, phase="phase_2")
+        return response.text
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
 def get_sample_interview_responses():
     """Get sample interview responses for automated assessment"""
     return {
@@ -278,7 +321,6 @@ if __name__ == "__main__":
         with open(workflow_file, 'w', encoding='utf-8') as f:
             f.write(result)
         print(f"💾 Workflow file saved to: {workflow_file}")
-        print("   (Note: This may contain raw text, not valid JSON)")
         
         # Also save the interview responses for potential next phase use
         responses_file = "[SAMPLE]_Interview_Responses.json"
@@ -5,29 +5,98 @@ Interview preparation and evaluation following Minma Inc.'s standards
 """
 
 import os
-import json
-import vertexai
-from google.oauth2 import service_account
-from vertexai.generative_models import GenerativeModel
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+# Shared Vertex AI client pool (credentials and models are initialized once per process)
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
 
 # Vertex AI configuration
-KEY_PATH = os.path.join("key", "vertex-minmavn-94ace6513e6e.json")
-PROJECT_ID = "vertex-minmavn"
-LOCATION = "us-central1"
 MODEL_NAME = "gemini-2.5-pro"
 
-def generate_briefing_sheet_phase3(screening_data, assessment_data, job_description=None):
-    """Generate interviewer briefing sheet using Phase 3 system prompt"""
-    try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
-        
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
-        
-        # Phase 3 System Prompt
-        system_prompt = """<role>
+# Phase 3 response schemas (mirror the two output formats in the system prompts)
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+def _object_list(*fields):
+    """Array of objects whose listed string fields are all required"""
+    return {
+        "type": "array",
+        "items": {"type": "object", "properties": {name: _STRING for name in fields}, "required": list(fields)}
+    }
+
+BRIEFING_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "candidate_summary": {
+            "type": "object",
+            "properties": {
+                "screening_score": {"type": "integer"},
+                "assessment_score": {"type": "integer"},
+                "overall_risk_level": {"type": "string", "enum": ["low", "medium", "high"]},
+                "key_strengths": _STRING_LIST,
+                "areas_of_concern": _STRING_LIST,
+                "all_flags": _object_list("flag_type", "message", "details")
+            },
+            "required": ["overall_risk_level", "key_strengths", "areas_of_concern"]
+        },
+        "deep_dive_questions": _object_list("focus_area", "question", "objective"),
+        "suggested_technical_questions": _object_list("skill_area", "question", "evaluation_criteria"),
+        "candidate_attraction_strategy": _object_list("appeal_point", "talking_points", "connection_to_candidate")
+    },
+    "required": ["candidate_summary", "deep_dive_questions", "suggested_technical_questions", "candidate_attraction_strategy"]
+}
+
+_SCORED_NOTE = {
+    "type": "object",
+    "properties": {"score": {"type": "integer"}, "notes": _STRING},
+    "required": ["score", "notes"]
+}
+
+EVALUATION_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "interview_score": {"type": "integer"},
+        "score_breakdown": {
+            "type": "object",
+            "properties": {name: _SCORED_NOTE for name in ["technical_competency", "communication_effectiveness", "cultural_alignment", "problem_solving_approach", "motivation_and_engagement"]}
+        },
+        "interview_insights": {
+            "type": "object",
+            "properties": {
+                "standout_qualities": _STRING_LIST,
+                "areas_for_development": _STRING_LIST,
+                "red_flags_identified": _STRING_LIST,
+                "overall_recommendation": _STRING
+            }
+        }
+    },
+    "required": ["interview_score", "score_breakdown", "interview_insights"]
+}
+
+# Request application/json constrained to the response schema
+BRIEFING_GENERATION_CONFIG = json_output.json_generation_config(BRIEFING_RESPONSE_SCHEMA)
+EVALUATION_GENERATION_CONFIG = json_output.json_generation_config(EVALUATION_RESPONSE_SCHEMA)
+
+# Fields of the Phase 1 / Phase 2 results the briefing uses (verbatim answer excerpts and
+# pre-screen internals are left out; the notes already summarize them)
+SCREENING_PROJECTION = {
+    "screening_score": True,
+    "score_breakdown": True,
+    "flags_for_human_review": True,
+    "minma_alignment_assessment": True
+}
+ASSESSMENT_PROJECTION = {
+    "assessment_score": True,
+    "score_breakdown": {name: {"score": True, "notes": True} for name in ["accountability", "self_improvement", "work_ethic_result_orientation", "company_knowledge_alignment"]},
+    "flags_for_human_review": True,
+    "interview_insights": True
+}
+
+# Phase 3 System Prompt (interviewer briefing sheet)
+BRIEFING_SYSTEM_PROMPT = """<role>
 You are a Senior AI Interview Support Specialist for Minma Inc.'s recruitment process. You function as an expert interview preparation consultant and evaluation analyst, providing comprehensive briefing materials for human interviewers and systematic scoring of interview outcomes. Your expertise spans technical assessment design, behavioral evaluation, and candidate engagement strategies.
 </role>
 
@@ -293,24 +362,40 @@ Operating "Curashi no Market" (e-commerce marketplace) and "Senkyaku" (SME digit
 
 **CRITICAL BOUNDARY:** Support human interviewers with comprehensive preparation and evaluation tools. Final hiring decisions rest with human judgment incorporating all AI-provided insights."""
 
-        # Job Description context
-        job_context = job_description or "Software Engineer position at Minma Vietnam - Hanoi office"
+def briefing_input(screening_data, assessment_data, job_description=None):
+    """Build the briefing request text from the Phase 1 and Phase 2 results"""
+    # Job Description context
+    job_context = job_description or "Software Engineer position at Minma Vietnam - Hanoi office"
 
-        # Prepare input text
-        input_text = f"""Please generate an interviewer briefing sheet based on the following candidate data:
+    return f"""Please generate an interviewer briefing sheet based on the following candidate data:
 
 **Job Context:** {job_context}
 
 **Phase 1 Screening Results:**
-{json.dumps(screening_data, indent=2, ensure_ascii=False)}
+{json_output.compact_json(screening_data, SCREENING_PROJECTION)}
 
 **Phase 2 Assessment Results:**
-{json.dumps(assessment_data, indent=2, ensure_ascii=False)}
+{json_output.compact_json(assessment_data, ASSESSMENT_PROJECTION)}
 
 Please provide a comprehensive briefing sheet following the structured format specified in your instructions."""
 
+def generate_briefing_sheet_phase3(screening_data, assessment_data, job_description=None, stream=False, progress_file=None, on_section=None):
+    """Generate interviewer briefing sheet using Phase 3 system prompt
+
+    With stream=True, each top-level briefing section is reported through on_section
+    (and saved to progress_file) as soon as it is generated.
+    """
+    try:
+        # Prepare input text
+        input_text = briefing_input(screening_data, assessment_data, job_description)
+
+        if stream:
+            # Stream the briefing and surface sections as they close
+            chunks = vertex_client.generate_content_stream([input_text], model_name=MODEL_NAME, system_prompt=BRIEFING_SYSTEM_PROMPT, generation_config=BRIEFING_GENERATION_CONFIG, phase="phase_3")
+            return json_output.stream_json_sections(chunks, 1, progress_file, on_section or json_output.print_section)
+        
         # Generate content
-        response = model.generate_content([system_prompt, input_text])
+        response = vertex_client.generate_content([input_text], model_name=MODEL_NAME, system_prompt=BRIEFING_SYSTEM_PROMPT, generation_config=BRIEFING_GENERATION_CONFIG, phase="phase_3")
         
         return response.text
         
@@ -318,18 +403,24 @@ Please provide a comprehensive briefing sheet following the structured format sp
         print(f"❌ Error: {e}")
         return None
 
-def evaluate_interview_phase3(interview_data, previous_scores=None):
-    """Evaluate interview results using Phase 3 system prompt"""
+async def generate_briefing_sheet_phase3_async(screening_data, assessment_data, job_description=None, stream=False, progress_file=None, on_section=None):
+    """generate_briefing_sheet_phase3 for coroutines"""
     try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
+        input_text = briefing_input(screening_data, assessment_data, job_description)
+
+        if stream:
+            chunks = vertex_client.generate_content_stream_async([input_text], model_name=MODEL_NAME, system_prompt=BRIEFING_SYSTEM_PROMPT, generation_config=BRIEFING_GENERATION_CONFIG, phase="phase_3")
+            return await json_output.stream_json_sections_async(chunks, 1, progress_file, on_section or json_output.print_section)
         
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
+        response = await vertex_client.generate_content_async([input_text], model_name=MODEL_NAME, system_prompt=BRIEFING_SYSTEM_PROMPT, generation_config=BRIEFING_GENERATION_CONFIG, phase="phase_3")
+        return response.text
         
-        # Same system prompt as above (for evaluation)
-        system_prompt = """<role>
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
+# Phase 3 System Prompt (post-interview evaluation)
+EVALUATION_SYSTEM_PROMPT = """<role>
 You are a Senior AI Interview Support Specialist for Minma Inc.'s recruitment process. You function as an expert interview preparation consultant and evaluation analyst, providing comprehensive briefing materials for human interviewers and systematic scoring of interview outcomes. Your expertise spans technical assessment design, behavioral evaluation, and candidate engagement strategies.
 </role>
 
@@ -439,19 +530,26 @@ Operating "Curashi no Market" (e-commerce marketplace) and "Senkyaku" (SME digit
 
 **CRITICAL BOUNDARY:** Support human interviewers with comprehensive preparation and evaluation tools. Final hiring decisions rest with human judgment incorporating all AI-provided insights."""
 
-        # Prepare input text
-        input_text = f"""Please evaluate the following interview data and provide comprehensive scoring:
+def evaluation_input(interview_data, previous_scores=None):
+    """Build the post-interview evaluation request text"""
+    return f"""Please evaluate the following interview data and provide comprehensive scoring:
 
 **Interview Data:**
-{json.dumps(interview_data, indent=2, ensure_ascii=False)}
+{json_output.compact_json(interview_data)}
 
 **Previous Assessment Scores (for context):**
-{json.dumps(previous_scores, indent=2, ensure_ascii=False) if previous_scores else "No previous scores provided"}
+{json_output.compact_json(previous_scores) if previous_scores else "No previous scores provided"}
 
 Please provide a detailed interview evaluation following the structured format specified in your instructions."""
 
+def evaluate_interview_phase3(interview_data, previous_scores=None):
+    """Evaluate interview results using Phase 3 system prompt"""
+    try:
+        # Prepare input text
+        input_text = evaluation_input(interview_data, previous_scores)
+
         # Generate content
-        response = model.generate_content([system_prompt, input_text])
+        response = vertex_client.generate_content([input_text], model_name=MODEL_NAME, system_prompt=EVALUATION_SYSTEM_PROMPT, generation_config=EVALUATION_GENERATION_CONFIG, phase="phase_3_evaluation")
         
         return response.text
         
@@ -459,6 +557,17 @@ Please provide a detailed interview evaluation following the structured format s
         print(f"❌ Error: {e}")
         return None
 
+async def evaluate_interview_phase3_async(interview_data, previous_scores=None):
+    """evaluate_interview_phase3 for coroutines"""
+    try:
+        response = await vertex_client.generate_content_async([evaluation_input(interview_data, previous_scores)], model_name=MODEL_NAME, system_prompt=EVALUATION_SYSTEM_PROMPT,
+                                                              generation_config=EVALUATION_GENERATION_CONFIG, phase="phase_3_evaluation")
+        return response.text
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
 if __name__ == "__main__":
     print("📋 MINMA INC. INTERVIEW SUPPORT - PHASE 3")
     print("=" * 55)
@@ -478,19 +587,9 @@ if __name__ == "__main__":
         print("Please run Phase 2 (Assessment) first.")
         exit(1)
     
-    # Load data
-    with open(screening_file, 'r', encoding='utf-8') as f:
-        screening_data = json.load(f)
-    
-    with open(assessment_file, 'r', encoding='utf-8') as f:
-        content = f.read().strip()
-        # Clean response text (remove markdown if present)
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-        assessment_data = json.loads(content)
+    # Load data (single validating parse per file)
+    screening_data = json_output.load_json_output(screening_file)
+    assessment_data = json_output.load_json_output(assessment_file)
     
     print("⏳ Generating briefing sheet...")
     result = generate_briefing_sheet_phase3(screening_data, assessment_data)
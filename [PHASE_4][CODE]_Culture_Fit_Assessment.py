@@ -5,29 +5,104 @@ Team interaction evaluation following Minma Inc.'s culture assessment framework
 """
 
 import os
+import sys
 import json
-import vertexai
-from google.oauth2 import service_account
-from vertexai.generative_models import GenerativeModel
+import hashlib
+import argparse
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+# Shared Vertex AI client pool (credentials and models are initialized once per process)
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Tiered routing: the static checklist runs on the fast model unless its output fails validation
+model_router = module_loader.load_module("[SHARED][CODE]_Model_Router.py", "model_router")
+
+# The checklist does not depend on the candidate, so it is built once per job profile and reused
+artifact_cache = module_loader.load_module("[SHARED][CODE]_Artifact_Cache.py", "artifact_cache")
 
 # Vertex AI configuration
-KEY_PATH = os.path.join("key", "vertex-minmavn-94ace6513e6e.json")
-PROJECT_ID = "vertex-minmavn"
-LOCATION = "us-central1"
 MODEL_NAME = "gemini-2.5-pro"
 
-def generate_team_checklist_phase4():
-    """Generate team member observation checklist using Phase 4 system prompt"""
-    try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
-        
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
-        
-        # Phase 4 System Prompt
-        system_prompt = """<role>
+# Phase 4 response schemas (mirror the two output formats in the system prompts)
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+CHECKLIST_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "team_member_checklist": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "observation_category": _STRING,
+                    "key_indicators": _STRING_LIST,
+                    "evaluation_questions": _STRING_LIST
+                },
+                "required": ["observation_category", "key_indicators", "evaluation_questions"]
+            }
+        }
+    },
+    "required": ["team_member_checklist"]
+}
+
+FEEDBACK_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "culture_fit_summary_report": {
+            "type": "object",
+            "properties": {
+                "communication_style_assessment": {
+                    "type": "object",
+                    "properties": {
+                        "overall_rating": {"type": "string", "enum": ["excellent", "good", "average", "concerning"]},
+                        "key_observations": _STRING_LIST,
+                        "cross_cultural_effectiveness": _STRING,
+                        "digital_communication_readiness": _STRING
+                    }
+                },
+                "values_alignment_evaluation": {
+                    "type": "object",
+                    "properties": {
+                        "core_values_demonstration": {
+                            "type": "object",
+                            "properties": {name: _STRING for name in ["honesty_transparency", "customer_centricity", "teamwork_collaboration", "continuous_learning"]}
+                        },
+                        "cultural_respect_indicators": _STRING
+                    }
+                },
+                "team_integration_potential": {
+                    "type": "object",
+                    "properties": {name: _STRING for name in ["rapport_building_ability", "chemistry_with_existing_members", "long_term_fit_projection", "potential_challenges"]}
+                },
+                "standout_observations": _STRING_LIST,
+                "areas_of_concern": _STRING_LIST,
+                "overall_culture_fit_recommendation": {
+                    "type": "object",
+                    "properties": {
+                        "fit_level": {"type": "string", "enum": ["excellent", "good", "moderate", "poor"]},
+                        "key_rationale": _STRING,
+                        "development_opportunities": _STRING,
+                        "team_feedback_consensus": _STRING
+                    },
+                    "required": ["fit_level", "key_rationale"]
+                }
+            },
+            "required": ["communication_style_assessment", "values_alignment_evaluation", "team_integration_potential", "overall_culture_fit_recommendation"]
+        }
+    },
+    "required": ["culture_fit_summary_report"]
+}
+
+# Request application/json constrained to the response schema
+CHECKLIST_GENERATION_CONFIG = json_output.json_generation_config(CHECKLIST_RESPONSE_SCHEMA)
+FEEDBACK_GENERATION_CONFIG = json_output.json_generation_config(FEEDBACK_RESPONSE_SCHEMA)
+
+# Phase 4 System Prompt (team member observation checklist)
+CHECKLIST_SYSTEM_PROMPT = """<role>
 You are a Senior AI Culture Fit Assessment Specialist for Minma Inc.'s recruitment process. You function as an expert organizational psychologist and team dynamics analyst, facilitating comprehensive culture fit evaluation through structured team interactions and systematic observation analysis.
 </role>
 
@@ -282,30 +357,84 @@ Minma's success depends on seamless integration of diverse team members across J
 
 **CRITICAL BOUNDARY:** Provide comprehensive culture fit insights to support final hiring decisions. This assessment synthesizes all previous AI evaluations with real-world team interaction observations for holistic candidate evaluation."""
 
-        # Request team member checklist generation
-        input_text = "Please generate a comprehensive team member observation checklist following the structured format specified in your instructions."
+CHECKLIST_INPUT = "Please generate a comprehensive team member observation checklist following the structured format specified in your instructions."
+
+# Checklists are cached per job profile under this version; any prompt, schema or model
+# change produces a new version, so checklists built by the old prompt are never served
+CHECKLIST_ARTIFACT = "phase4_team_checklist"
+CHECKLIST_PROMPT_VERSION = hashlib.sha256(json.dumps(
+    [MODEL_NAME, CHECKLIST_SYSTEM_PROMPT, CHECKLIST_RESPONSE_SCHEMA, CHECKLIST_INPUT], sort_keys=True
+).encode("utf-8")).hexdigest()[:16]
+DEFAULT_JOB_PROFILE = "general"
+
+def checklist_key(job_profile=None):
+    """Artifact key of a job profile's checklist"""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in (job_profile or DEFAULT_JOB_PROFILE).strip().lower()) or DEFAULT_JOB_PROFILE
+
+def checklist_input(job_profile=None):
+    """Request text of the checklist for a job profile"""
+    input_text = CHECKLIST_INPUT
+    if job_profile:
+        input_text += f"\n\nTarget role profile: {job_profile}"
+    return input_text
+
+def _valid_checklist(response):
+    """Checklist text of a response, or None if the output does not match the schema"""
+    try:
+        json_output.parse_json_output(response.text, CHECKLIST_RESPONSE_SCHEMA)
+    except json_output.JSONOutputError as e:
+        # Never memoize an unusable checklist
+        print(f"❌ Checklist output is not valid: {e}")
+        return None
+    return response.text
 
-        # Generate content
-        response = model.generate_content([system_prompt, input_text])
-        
-        return response.text
+def _build_team_checklist(job_profile=None):
+    """Generate the checklist with Gemini; None if the output does not match the schema"""
+    # Generate content through the model tiers
+    response = model_router.generate_content([checklist_input(job_profile)], "phase_4_checklist", MODEL_NAME, system_prompt=CHECKLIST_SYSTEM_PROMPT, generation_config=CHECKLIST_GENERATION_CONFIG)
+    return _valid_checklist(response)
+
+async def _build_team_checklist_async(job_profile=None):
+    """_build_team_checklist for coroutines"""
+    response = await model_router.generate_content_async([checklist_input(job_profile)], "phase_4_checklist", MODEL_NAME, system_prompt=CHECKLIST_SYSTEM_PROMPT, generation_config=CHECKLIST_GENERATION_CONFIG)
+    return _valid_checklist(response)
+
+def generate_team_checklist_phase4(job_profile=None, refresh=False):
+    """Return the team member observation checklist for a job profile
+
+    The checklist is generated once per job profile and prompt version, then served
+    from the artifact cache to every office-tour session; refresh=True rebuilds it.
+    """
+    try:
+        key = checklist_key(job_profile)
+        if refresh:
+            artifact_cache.shared_cache.invalidate(CHECKLIST_ARTIFACT, key)
+        return artifact_cache.shared_cache.get_or_build(CHECKLIST_ARTIFACT, key, CHECKLIST_PROMPT_VERSION,
+                                                         lambda: _build_team_checklist(job_profile))
         
     except Exception as e:
         print(f"❌ Error: {e}")
         return None
 
-def analyze_team_feedback_phase4(team_feedback_data):
-    """Analyze team feedback and generate culture fit summary using Phase 4 system prompt"""
+async def generate_team_checklist_phase4_async(job_profile=None, refresh=False):
+    """generate_team_checklist_phase4 for coroutines"""
     try:
-        # Initialize credentials and Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
-        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
+        key = checklist_key(job_profile)
+        if refresh:
+            artifact_cache.shared_cache.invalidate(CHECKLIST_ARTIFACT, key)
+        return await artifact_cache.shared_cache.get_or_build_async(CHECKLIST_ARTIFACT, key, CHECKLIST_PROMPT_VERSION,
+                                                                     lambda: _build_team_checklist_async(job_profile))
         
-        # Create model
-        model = GenerativeModel(MODEL_NAME)
-        
-        # Same system prompt as above
-        system_prompt = """<role>
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
+def invalidate_team_checklists(stale_only=True):
+    """Remove cached checklists (only those built by an older prompt version by default)"""
+    return artifact_cache.shared_cache.invalidate(CHECKLIST_ARTIFACT, keep_version=CHECKLIST_PROMPT_VERSION if stale_only else None)
+
+# Phase 4 System Prompt (team feedback analysis)
+FEEDBACK_SYSTEM_PROMPT = """<role>
 You are a Senior AI Culture Fit Assessment Specialist for Minma Inc.'s recruitment process. You function as an expert organizational psychologist and team dynamics analyst, facilitating comprehensive culture fit evaluation through structured team interactions and systematic observation analysis.
 </role>
 
@@ -416,16 +545,37 @@ Minma's success depends on seamless integration of diverse team members across J
 
 **CRITICAL BOUNDARY:** Provide comprehensive culture fit insights to support final hiring decisions. This assessment synthesizes all previous AI evaluations with real-world team interaction observations for holistic candidate evaluation."""
 
-        # Prepare input text with team feedback data
-        input_text = f"""Please analyze the following team member feedback and generate a comprehensive culture fit summary report:
+def feedback_input(team_feedback_data):
+    """Build the feedback analysis request text (structured feedback, or a list of free-text comments)"""
+    if isinstance(team_feedback_data, list):
+        # One comment per team member, numbered as in the endpoint scripts
+        feedback = "\n\n".join(f"Team Member {index} Feedback: {comment}" for index, comment in enumerate(team_feedback_data, 1))
+    else:
+        feedback = json_output.compact_json(team_feedback_data)
+    return f"""Please analyze the following team member feedback and generate a comprehensive culture fit summary report:
 
 **Team Member Feedback Data:**
-{json.dumps(team_feedback_data, indent=2, ensure_ascii=False)}
+{feedback}
 
 Please provide a detailed culture fit assessment following the structured format specified in your instructions."""
 
+def analyze_team_feedback_phase4(team_feedback_data, stream=False, progress_file=None, on_section=None):
+    """Analyze team feedback and generate culture fit summary using Phase 4 system prompt
+
+    With stream=True, each section of culture_fit_summary_report is reported through
+    on_section (and saved to progress_file) as soon as it is generated.
+    """
+    try:
+        # Prepare input text with team feedback data
+        input_text = feedback_input(team_feedback_data)
+
+        if stream:
+            # The report is wrapped in one top-level key, so surface its inner sections
+            chunks = vertex_client.generate_content_stream([input_text], model_name=MODEL_NAME, system_prompt=FEEDBACK_SYSTEM_PROMPT, generation_config=FEEDBACK_GENERATION_CONFIG, phase="phase_4")
+            return json_output.stream_json_sections(chunks, 2, progress_file, on_section or json_output.print_section)
+        
         # Generate content
-        response = model.generate_content([system_prompt, input_text])
+        response = vertex_client.generate_content([input_text], model_name=MODEL_NAME, system_prompt=FEEDBACK_SYSTEM_PROMPT, generation_config=FEEDBACK_GENERATION_CONFIG, phase="phase_4")
         
         return response.text
         
@@ -433,6 +583,22 @@ Please provide a detailed culture fit assessment following the structured format
         print(f"❌ Error: {e}")
         return None
 
+async def analyze_team_feedback_phase4_async(team_feedback_data, stream=False, progress_file=None, on_section=None):
+    """analyze_team_feedback_phase4 for coroutines"""
+    try:
+        input_text = feedback_input(team_feedback_data)
+
+        if stream:
+            chunks = vertex_client.generate_content_stream_async([input_text], model_name=MODEL_NAME, system_prompt=FEEDBACK_SYSTEM_PROMPT, generation_config=FEEDBACK_GENERATION_CONFIG, phase="phase_4")
+            return await json_output.stream_json_sections_async(chunks, 2, progress_file, on_section or json_output.print_section)
+        
+        response = await vertex_client.generate_content_async([input_text], model_name=MODEL_NAME, system_prompt=FEEDBACK_SYSTEM_PROMPT, generation_config=FEEDBACK_GENERATION_CONFIG, phase="phase_4")
+        return response.text
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
 def get_sample_team_feedback():
     """Get sample team feedback for automated assessment"""
     return {
@@ -471,9 +637,33 @@ def get_sample_team_feedback():
         }
     }
 
+def parse_arguments(argv=None):
+    """Parse Phase 4 options"""
+    parser = argparse.ArgumentParser(description="Phase 4 culture fit assessment and team observation checklist")
+    parser.add_argument("--checklist", action="store_true", help="Print the team member observation checklist instead of analyzing feedback")
+    parser.add_argument("--job-profile", help="Job profile the checklist is built for (default: general)")
+    parser.add_argument("--refresh-checklist", action="store_true", help="Rebuild the cached checklist for this job profile")
+    parser.add_argument("--invalidate-checklists", action="store_true", help="Remove every cached checklist and exit")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    args = parse_arguments()
     print("📋 MINMA INC. OFFICE TOUR ASSESSMENT - PHASE 4")
     print("=" * 55)
+    
+    if args.invalidate_checklists:
+        removed = invalidate_team_checklists(stale_only=False)
+        print(f"🗑️  Removed {removed} cached checklists")
+        sys.exit(0)
+    
+    if args.checklist:
+        checklist = generate_team_checklist_phase4(args.job_profile, refresh=args.refresh_checklist)
+        if not checklist:
+            print("❌ Failed to generate team checklist")
+            sys.exit(1)
+        print(checklist)
+        print(f"\n📦 Checklist cache: {artifact_cache.shared_cache.get_stats()} (prompt version {CHECKLIST_PROMPT_VERSION})")
+        sys.exit(0)
     print("🤖 Running automated culture fit assessment with sample team feedback...")
     
     # Use sample team feedback for automated assessment
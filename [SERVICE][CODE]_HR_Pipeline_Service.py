@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+HR Pipeline Service - long-running HTTP/1.1 service with warm models and credentials
+One endpoint per phase (same parameters as the Endpoint/*.js functions) plus a job endpoint for the full pipeline
+"""
+
+import os
+import json
+import time
+import uuid
+import base64
+import hashlib
+import asyncio
+import argparse
+import ipaddress
+import contextlib
+from http import HTTPStatus
+from collections import OrderedDict
+
+# Repository files are loaded by file name through module_loader.py next to this script
+import module_loader
+
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+vertex_client = master.vertex_client
+json_output = master.json_output
+
+# Service configuration (override with environment variables or command line options)
+HOST = os.environ.get("HR_SERVICE_HOST", "127.0.0.1")
+PORT = int(os.environ.get("HR_SERVICE_PORT", "8080"))
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("HR_SERVICE_MAX_CONCURRENCY", "64"))
+MAX_QUEUED_REQUESTS = int(os.environ.get("HR_SERVICE_MAX_QUEUE", "1000"))
+MAX_CONCURRENT_JOBS = int(os.environ.get("HR_SERVICE_MAX_JOBS", "8"))
+MAX_QUEUED_JOBS = int(os.environ.get("HR_SERVICE_MAX_JOB_QUEUE", "500"))
+KEEPALIVE_SECONDS = float(os.environ.get("HR_SERVICE_KEEPALIVE_SECONDS", "75"))
+MAX_BODY_BYTES = int(float(os.environ.get("HR_SERVICE_MAX_BODY_MB", "20")) * 1024 * 1024)
+
+# Server-side files named in requests (pdfPath, candidateJsonPath, cvPath) must resolve inside
+# this directory (override with HR_SERVICE_INPUT_ROOT or --input-root; default: the working directory)
+INPUT_ROOT = os.environ.get("HR_SERVICE_INPUT_ROOT", "")
+
+# Finished jobs kept for status requests (oldest are dropped first)
+MAX_FINISHED_JOBS = 1000
+
+# Name of a CV uploaded to the job endpoint, inside the candidate's run directory
+UPLOADED_CV_FILE = "[INPUT]_CV.pdf"
+
+class RequestError(Exception):
+    """Client error answered with an HTTP status and a JSON error body"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+_settings = {"input_root": os.path.realpath(INPUT_ROOT or os.getcwd()), "allow_paths": True}
+
+def configure_inputs(input_root=None, allow_paths=None):
+    """Set the input root of server-side paths, or refuse paths altogether (uploaded content only)"""
+    if input_root is not None:
+        _settings["input_root"] = os.path.realpath(input_root)
+    if allow_paths is not None:
+        _settings["allow_paths"] = allow_paths
+
+def is_loopback(host):
+    """True if the service only listens on the local machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class WorkQueue:
+    """Bounded admission queue: at most max_active requests run, at most max_waiting wait for a slot"""
+
+    def __init__(self, max_active, max_waiting):
+        self.max_waiting = max_waiting
+        self._slots = asyncio.Semaphore(max_active)
+        self.stats = {"active": 0, "waiting": 0, "max_waiting": 0, "completed": 0, "rejected": 0}
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot; a full queue is answered with 503 instead of growing without bound"""
+        if self.stats["waiting"] >= self.max_waiting:
+            self.stats["rejected"] += 1
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "Queue is full, retry later")
+        self.stats["waiting"] += 1
+        self.stats["max_waiting"] = max(self.stats["max_waiting"], self.stats["waiting"])
+        try:
+            await self._slots.acquire()
+        finally:
+            self.stats["waiting"] -= 1
+        self.stats["active"] += 1
+        try:
+            yield
+        finally:
+            self.stats["active"] -= 1
+            self.stats["completed"] += 1
+            self._slots.release()
+
+def require(body, *names):
+    """Return the first of names present in the request body, or answer 400"""
+    for name in names:
+        if body.get(name) is not None:
+            return body[name]
+    raise RequestError(HTTPStatus.BAD_REQUEST, f"Missing parameter: {names[0]}")
+
+def resolve_input_path(path, name):
+    """Resolve a server-side file named in a request; 403 unless it lies inside the input root"""
+    if not _settings["allow_paths"]:
+        raise RequestError(HTTPStatus.FORBIDDEN, f"{name} is not accepted by this service; send the content instead")
+    if not isinstance(path, str) or not path:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be a file path")
+    root = _settings["input_root"]
+    # Relative paths are taken from the input root; symlinks and ".." are resolved before the check
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise RequestError(HTTPStatus.FORBIDDEN, f"{name} is outside the service's input root")
+    if not os.path.isfile(resolved):
+        raise RequestError(HTTPStatus.NOT_FOUND, f"File not found: {path}")
+    return resolved
+
+def write_upload(file_path, data):
+    """Save an uploaded file (run off the event loop)"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+def phase_response(text, schema, started):
+    """Parse a phase's output; None (the phase failed) or invalid JSON is a 502"""
+    if not text:
+        raise RequestError(HTTPStatus.BAD_GATEWAY, "Gemini request failed")
+    try:
+        result = json_output.parse_json_output(text, schema)
+    except json_output.JSONOutputError as e:
+        raise RequestError(HTTPStatus.BAD_GATEWAY, f"Output is not valid JSON: {e}")
+    return {"result": result, "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+# Phase endpoints: parameter names follow the Endpoint/*.js functions
+
+async def extract_cv_info(body):
+    """POST /phase0/extract - extractCvInfoPhase0(pdfPath, jobTitle, department, location); pdfBase64 uploads the PDF"""
+    phase0 = master.phase0_module
+    if body.get("pdfBase64"):
+        try:
+            pdf_data = base64.b64decode(body["pdfBase64"], validate=True)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "pdfBase64 is not valid base64")
+        return await phase0.extract_cv_data_phase0_async(pdf_data)
+    pdf_path = resolve_input_path(require(body, "pdfPath"), "pdfPath")
+    return await phase0.extract_cv_info_phase0_async(pdf_path, body.get("jobTitle") or "Software Engineer", body.get("department") or "Dev Team",
+                                                     body.get("location") or "Minma Vietnam - Hanoi")
+
+async def screen_candidate(body):
+    """POST /phase1/screen - screenCandidatePhase1(candidateJsonPath, jobDescription); a JSON string or object is used directly"""
+    candidate = require(body, "candidateJsonPath", "candidateData")
+    if not isinstance(candidate, str):
+        candidate = json.dumps(candidate, ensure_ascii=False)
+    elif not candidate.lstrip().startswith("{"):
+        candidate = resolve_input_path(candidate, "candidateJsonPath")
+    return await master.phase1_module.screen_candidate_phase1_async(candidate, body.get("jobDescription"))
+
+async def assess_candidate(body):
+    """POST /phase2/assess - assessCandidatePhase2(candidateResponses)"""
+    return await master.phase2_module.assess_candidate_phase2_async(require(body, "candidateResponses"))
+
+async def generate_briefing(body):
+    """POST /phase3/briefing - generateBriefingSheetPhase3(screeningData, assessmentData, jobDescription)"""
+    return await master.phase3_module.generate_briefing_sheet_phase3_async(require(body, "screeningData"), require(body, "assessmentData"),
+                                                                           body.get("jobDescription"))
+
+async def evaluate_interview(body):
+    """POST /phase3/evaluate - evaluateInterviewPhase3(interviewData, previousScores)"""
+    return await master.phase3_module.evaluate_interview_phase3_async(require(body, "interviewData"), body.get("previousScores"))
+
+async def generate_checklist(body):
+    """POST /phase4/checklist - generateTeamChecklistPhase4(); jobProfile and refresh select and rebuild the cached checklist"""
+    return await master.phase4_module.generate_team_checklist_phase4_async(body.get("jobProfile"), bool(body.get("refresh")))
+
+async def analyze_feedback(body):
+    """POST /phase4/feedback - analyzeTeamFeedbackPhase4(teamFeedbackData); an array of comments or a feedback object"""
+    return await master.phase4_module.analyze_team_feedback_phase4_async(require(body, "teamFeedbackData"))
+
+# Path -> (phase key, handler, name of the output schema in the phase module)
+PHASE_ENDPOINTS = {
+    "/phase0/extract": ("phase_0", extract_cv_info, "RESPONSE_SCHEMA"),
+    "/phase1/screen": ("phase_1", screen_candidate, "RESPONSE_SCHEMA"),
+    "/phase2/assess": ("phase_2", assess_candidate, "RESPONSE_SCHEMA"),
+    "/phase3/briefing": ("phase_3", generate_briefing, "BRIEFING_RESPONSE_SCHEMA"),
+    "/phase3/evaluate": ("phase_3", evaluate_interview, "EVALUATION_RESPONSE_SCHEMA"),
+    "/phase4/checklist": ("phase_4", generate_checklist, "CHECKLIST_RESPONSE_SCHEMA"),
+    "/phase4/feedback": ("phase_4", analyze_feedback, "FEEDBACK_RESPONSE_SCHEMA")
+}
+
+class PipelineService:
+    """Phase endpoints and full-pipeline jobs served from one event loop with warm models"""
+
+    def __init__(self, max_concurrent_requests=MAX_CONCURRENT_REQUESTS, max_queued_requests=MAX_QUEUED_REQUESTS,
+                 max_concurrent_jobs=MAX_CONCURRENT_JOBS, max_queued_jobs=MAX_QUEUED_JOBS, keepalive_seconds=KEEPALIVE_SECONDS):
+        self.requests = WorkQueue(max_concurrent_requests, max_queued_requests)
+        self.job_queue = WorkQueue(max_concurrent_jobs, max_queued_jobs)
+        self.keepalive_seconds = keepalive_seconds
+        self.jobs = OrderedDict()
+        self._job_tasks = set()
+        self.started_at = time.time()
+        self.warm_up_seconds = None
+        self.endpoint_stats = {}
+
+    def warm_up(self):
+        """Load credentials, every phase module and one warm model per (model, system prompt)"""
+        started = time.perf_counter()
+        for module in master.PHASE_MODULES.values():
+            module.load()
+        for module, model_name, prompt_name in [
+            (master.phase0_module, master.phase0_module.MODEL_NAME, "SYSTEM_PROMPT"),
+            (master.phase1_module, master.phase1_module.MODEL_NAME, "SYSTEM_PROMPT"),
+            (master.phase2_module, master.phase2_module.MODEL_NAME, "SYSTEM_PROMPT"),
+            (master.phase3_module, master.phase3_module.MODEL_NAME, "BRIEFING_SYSTEM_PROMPT"),
+            (master.phase3_module, master.phase3_module.MODEL_NAME, "EVALUATION_SYSTEM_PROMPT"),
+            (master.phase4_module, master.phase4_module.MODEL_NAME, "CHECKLIST_SYSTEM_PROMPT"),
+            (master.phase4_module, master.phase4_module.MODEL_NAME, "FEEDBACK_SYSTEM_PROMPT")
+        ]:
+            vertex_client.get_model(model_name, getattr(module, prompt_name))
+        self.warm_up_seconds = round(time.perf_counter() - started, 3)
+        return self.warm_up_seconds
+
+    def record(self, path, status, seconds):
+        """Count a served request and its latency per endpoint"""
+        stats = self.endpoint_stats.setdefault(path, {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["requests"] += 1
+        stats["errors"] += 1 if status >= 400 else 0
+        stats["total_ms"] += seconds * 1000
+        stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+
+    def health(self):
+        """GET /health - queue depth, warm model pool, scheduler and per-endpoint figures"""
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "warm_up_seconds": self.warm_up_seconds,
+            "requests": dict(self.requests.stats),
+            "jobs": dict(self.job_queue.stats, known=len(self.jobs)),
+            "client": vertex_client.get_stats(),
+            "scheduler": vertex_client.request_scheduler.shared_scheduler.get_stats(),
+            "endpoints": {path: dict(stats, mean_ms=round(stats["total_ms"] / stats["requests"], 2), total_ms=round(stats["total_ms"], 1),
+                                     max_ms=round(stats["max_ms"], 1))
+                          for path, stats in self.endpoint_stats.items()}
+        }
+
+    async def run_phase(self, path, body):
+        """Run one phase endpoint inside a request slot"""
+        phase_key, handler, schema_name = PHASE_ENDPOINTS[path]
+        started = time.perf_counter()
+        async with self.requests.slot():
+            with vertex_client.call_metrics.call_context(None, phase_key):
+                text = await handler(body)
+        return phase_response(text, getattr(master.PHASE_MODULES[phase_key], schema_name), started)
+
+    async def submit_job(self, body):
+        """POST /jobs - queue a full pipeline run; returns 202 with the job id"""
+        if self.job_queue.stats["waiting"] >= self.job_queue.max_waiting:
+            self.job_queue.stats["rejected"] += 1
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "Job queue is full, retry later")
+        job_id = uuid.uuid4().hex[:12]
+        job_description = body.get("jobDescription") or master.DEFAULT_JOB_DESCRIPTION
+        # Jobs in flight never share a candidate id, so they never share a run directory
+        active_ids = {job["candidate_id"] for job in self.jobs.values() if job["finished_at"] is None}
+        candidate_id = master.BatchPipelineRunner.candidate_id_for(str(body.get("candidateId") or body.get("cvPath") or job_id), active_ids)
+
+        cv_data = output_dir = None
+        if body.get("cvBase64"):
+            try:
+                cv_data = base64.b64decode(body["cvBase64"], validate=True)
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "cvBase64 is not valid base64")
+            # The pipeline's own default run directory for this CV content and job
+            output_dir = master.run_directory(candidate_id, hashlib.sha256(cv_data).hexdigest(), job_description)
+            cv_path = os.path.join(output_dir, UPLOADED_CV_FILE)
+        else:
+            cv_path = resolve_input_path(require(body, "cvPath"), "cvPath")
+
+        try:
+            pipeline = master.HRAutomationPipeline(
+                cv_path, job_description, output_dir=output_dir, candidate_id=candidate_id,
+                stream=bool(body.get("stream")), prescreen=body.get("prescreen"), generation_profile=body.get("generationProfile"),
+                resume=body.get("resume", True), phases=body.get("phases"), store_results=body.get("storeResults", True)
+            )
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+
+        job = {"job_id": job_id, "status": "queued", "candidate_id": candidate_id, "run_id": pipeline.run_id, "output_dir": pipeline.output_dir,
+               "submitted_at": time.time(), "started_at": None, "finished_at": None, "success": None, "error": None}
+        # Registered before the upload is saved so a concurrent submission sees the candidate id as taken
+        self.jobs[job_id] = job
+        if cv_data is not None:
+            try:
+                await asyncio.to_thread(write_upload, cv_path, cv_data)
+            except OSError as e:
+                del self.jobs[job_id]
+                raise RequestError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Could not save the uploaded CV: {e}")
+        self.prune_jobs()
+        task = asyncio.ensure_future(self.run_job(job, pipeline))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        return {"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+
+    async def run_job(self, job, pipeline):
+        """Run a queued pipeline once a job slot is free"""
+        try:
+            async with self.job_queue.slot():
+                job.update(status="running", started_at=time.time())
+                job["success"] = await pipeline.run()
+                job["status"] = "succeeded" if job["success"] else "completed_with_issues"
+        except Exception as e:
+            job.update(status="failed", success=False, error=f"{type(e).__name__}: {e}")
+        job["finished_at"] = time.time()
+        job["final_report"] = pipeline.results.get("final_report")
+        job["phase_timings"] = pipeline.phase_timings
+
+    def prune_jobs(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS"""
+        finished = [job_id for job_id, job in self.jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def job_status(self, job_id):
+        """GET /jobs/<id> - job status, and the final report once it has finished"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+        return job
+
+    async def dispatch(self, method, path, body):
+        """Route one request; returns (status, response object)"""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, self.health()
+        if path in PHASE_ENDPOINTS and method == "POST":
+            return HTTPStatus.OK, await self.run_phase(path, body)
+        if path == "/jobs" and method == "POST":
+            return HTTPStatus.ACCEPTED, await self.submit_job(body)
+        if path.startswith("/jobs/") and method == "GET":
+            return HTTPStatus.OK, self.job_status(path[len("/jobs/"):])
+        if path in PHASE_ENDPOINTS or path in ("/health", "/jobs"):
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+        raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+
+    async def read_request(self, reader):
+        """Read one HTTP/1.1 request; None when the client closed an idle connection"""
+        request_line = await asyncio.wait_for(reader.readline(), self.keepalive_seconds)
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise RequestError(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Content-Length must be a non-negative integer")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        # HTTP/1.1 connections stay open unless the client asks to close them
+        keep_alive = headers.get("connection", "").lower() != "close" if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive"
+        return method.upper(), target, body, keep_alive
+
+    def write_response(self, writer, status, payload, keep_alive):
+        """Send a JSON response with an explicit length so the connection can be reused"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if keep_alive:
+            headers.append(f"Keep-Alive: timeout={int(self.keepalive_seconds)}")
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one persistent connection until the client closes it or it idles out"""
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except RequestError as e:
+                    self.write_response(writer, e.status, {"error": str(e)}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, raw_body, keep_alive = request
+                started = time.perf_counter()
+                try:
+                    try:
+                        body = json.loads(raw_body) if raw_body else {}
+                    except ValueError as e:
+                        raise RequestError(HTTPStatus.BAD_REQUEST, f"Body is not valid JSON: {e}")
+                    if not isinstance(body, dict):
+                        raise RequestError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+                    status, payload = await self.dispatch(method, target, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"❌ {method} {target} error: {e}")
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+                self.record(target.split("?", 1)[0], status.value, time.perf_counter() - started)
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """Listen until cancelled; ready (an asyncio.Event) is set once the socket is bound"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self.address = server.sockets[0].getsockname()[:2]
+        print(f"🌐 HR pipeline service listening on http://{self.address[0]}:{self.address[1]}")
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+def use_local_backend():
+    """Serve from the offline Gemini stand-in instead of Vertex AI"""
+    local_gemini = module_loader.load_module("[SHARED][CODE]_Local_Gemini.py", "local_gemini")
+    vertex_client.set_model_factory(local_gemini.LocalGeminiBackend(responder=local_gemini.schema_responder))
+
+def parse_arguments(argv=None):
+    """Parse service options"""
+    parser = argparse.ArgumentParser(description="Long-running HR pipeline HTTP service")
+    parser.add_argument("--host", default=HOST, help="Interface to listen on (default: HR_SERVICE_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=PORT, help="Port to listen on (default: HR_SERVICE_PORT or 8080)")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENT_REQUESTS, help="Phase requests processed at once; others wait in the queue")
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUED_REQUESTS, help="Phase requests allowed to wait before the service answers 503")
+    parser.add_argument("--max-jobs", type=int, default=MAX_CONCURRENT_JOBS, help="Full pipeline jobs run at once")
+    parser.add_argument("--input-root", default=INPUT_ROOT or None,
+                        help="Directory that pdfPath/candidateJsonPath/cvPath must resolve inside (default: HR_SERVICE_INPUT_ROOT or the working "
+                             "directory; without it a non-loopback --host only accepts uploaded content)")
+    parser.add_argument("--local", action="store_true", help="Use the offline Gemini stand-in (no Vertex AI credentials needed)")
+    parser.add_argument("--no-warm-up", action="store_true", help="Skip loading credentials and models before accepting requests")
+    return parser.parse_args(argv)
+
+async def main(argv=None):
+    """Warm up and serve until interrupted"""
+    args = parse_arguments(argv)
+
+    print("📋 MINMA INC. HR PIPELINE SERVICE")
+    print("=" * 55)
+
+    if args.local:
+        use_local_backend()
+        print("🧪 Using the local Gemini stand-in")
+
+    # Off the local machine, server-side paths are only accepted inside an explicitly configured input root
+    configure_inputs(args.input_root, allow_paths=bool(args.input_root) or is_loopback(args.host))
+    if _settings["allow_paths"]:
+        print(f"📂 Server-side paths accepted inside {_settings['input_root']}")
+    else:
+        print("📂 Server-side paths refused (non-loopback host without --input-root); send uploaded content")
+
+    service = PipelineService(max_concurrent_requests=args.max_concurrency, max_queued_requests=args.max_queue, max_concurrent_jobs=args.max_jobs)
+    if not args.no_warm_up:
+        print(f"🔥 Warm-up: credentials, phase modules and models ready in {service.warm_up()}s")
+    await service.serve(args.host, args.port)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Versioned Artifact Cache for candidate-independent phase outputs
+Artifacts are built once per (name, key), kept on disk and in memory, and rebuilt when their version changes
+"""
+
+import os
+import json
+import time
+import shutil
+import asyncio
+import weakref
+import threading
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Artifact store location (override with HR_ARTIFACT_DIR)
+ARTIFACT_DIR = os.environ.get("HR_ARTIFACT_DIR", os.path.join(".hr_index", "artifacts"))
+
+class ArtifactCache:
+    """Disk-backed artifacts keyed by (name, key) and tagged with the version that built them"""
+
+    def __init__(self, cache_dir=ARTIFACT_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        # asyncio locks bind to the event loop that first waits on them, so each loop has its own
+        self._async_build_locks = weakref.WeakKeyDictionary()
+        self._memory = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "builds": 0,
+            "invalidations": 0
+        }
+
+    def _entry_path(self, name, key):
+        """Return the file path of an artifact"""
+        return os.path.join(self.cache_dir, name, f"{key}.json")
+
+    def _load(self, name, key):
+        """Read an artifact entry from memory or disk (caller holds the lock)"""
+        entry = self._memory.get((name, key))
+        if entry is None:
+            try:
+                with open(self._entry_path(name, key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return None
+            self._memory[(name, key)] = entry
+        return entry
+
+    def _remove(self, name, key):
+        """Drop an artifact from memory and disk (caller holds the lock)"""
+        self._memory.pop((name, key), None)
+        try:
+            os.remove(self._entry_path(name, key))
+        except OSError:
+            pass
+
+    def get(self, name, key, version):
+        """Return the artifact value, or None if missing or built by another version"""
+        with self._lock:
+            entry = self._load(name, key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if entry["version"] != version:
+                # Built from an older prompt/schema: never serve it again
+                self._remove(name, key)
+                self.stats["stale"] += 1
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return entry["value"]
+
+    def put(self, name, key, value, version):
+        """Store an artifact value for this version"""
+        entry = {"name": name, "key": key, "version": version, "created_at": time.time(), "value": value}
+        path = self._entry_path(name, key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            json_output.write_json_atomic(path, entry)
+            self._memory[(name, key)] = entry
+
+    def get_or_build(self, name, key, version, build):
+        """Return the artifact, calling build() once to create it on a miss
+
+        Concurrent callers for the same artifact wait for a single build. A build
+        returning None is not stored.
+        """
+        value = self.get(name, key, version)
+        if value is not None:
+            return value
+        with self._lock:
+            build_lock = self._build_locks.setdefault((name, key), threading.Lock())
+        with build_lock:
+            # Another caller may have built it while this one waited
+            value = self.get(name, key, version)
+            if value is not None:
+                return value
+            value = build()
+            if value is not None:
+                self.put(name, key, value, version)
+                with self._lock:
+                    self.stats["builds"] += 1
+            return value
+
+    async def get_or_build_async(self, name, key, version, build):
+        """get_or_build for coroutines: build() returns an awaitable and waiting never blocks the event loop"""
+        value = self.get(name, key, version)
+        if value is not None:
+            return value
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            build_lock = self._async_build_locks.setdefault(loop, {}).setdefault((name, key), asyncio.Lock())
+        async with build_lock:
+            value = self.get(name, key, version)
+            if value is not None:
+                return value
+            value = await build()
+            if value is not None:
+                self.put(name, key, value, version)
+                with self._lock:
+                    self.stats["builds"] += 1
+            return value
+
+    def invalidate(self, name, key=None, keep_version=None):
+        """Remove artifacts of name (one key, or every key not built by keep_version); return the count"""
+        directory = os.path.join(self.cache_dir, name)
+        with self._lock:
+            keys = {entry_key for entry_name, entry_key in self._memory if entry_name == name}
+            if os.path.isdir(directory):
+                keys.update(entry.name[:-len(".json")] for entry in os.scandir(directory) if entry.name.endswith(".json"))
+            if key is not None:
+                keys &= {key}
+            removed = 0
+            for entry_key in keys:
+                entry = self._load(name, entry_key)
+                if keep_version is not None and entry is not None and entry["version"] == keep_version:
+                    continue
+                self._remove(name, entry_key)
+                removed += 1
+            self.stats["invalidations"] += removed
+        return removed
+
+    def clear(self):
+        """Delete every artifact"""
+        with self._lock:
+            self._memory.clear()
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_stats(self):
+        """Return a snapshot of hit/miss/build counters"""
+        with self._lock:
+            return dict(self.stats)
+
+# Process-wide artifact cache shared by all phase modules (nothing touches the disk until first use)
+shared_cache = ArtifactCache()
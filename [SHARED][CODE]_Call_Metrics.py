@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Per-Call Metrics for Gemini requests - latency, token usage, retries and estimated cost
+Every generate_content call records one structured metrics record (emitted as JSON lines)
+"""
+
+import os
+import json
+import time
+import threading
+import contextlib
+import contextvars
+from collections import deque
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Optional process-wide JSON lines file receiving every call record as it happens
+METRICS_FILE = os.environ.get("HR_METRICS_FILE", "")
+
+# In-memory records kept for run summaries (oldest are dropped first)
+MAX_RECORDS = 10000
+
+# Estimated Vertex AI prices in USD per 1M tokens (prompts up to 200k tokens).
+# Thinking tokens are billed as output tokens.
+PRICING_PER_MILLION_TOKENS = {
+    "gemini-2.5-pro": {"input": 1.25, "cached_input": 0.31, "output": 10.00},
+    "gemini-2.5-flash": {"input": 0.30, "cached_input": 0.075, "output": 2.50},
+    "gemini-2.5-flash-lite": {"input": 0.10, "cached_input": 0.025, "output": 0.40}
+}
+
+# Pipeline run and phase of the calls made in the current thread/task
+_current_run = contextvars.ContextVar("hr_metrics_run", default=None)
+_current_phase = contextvars.ContextVar("hr_metrics_phase", default=None)
+
+_lock = threading.Lock()
+_records = deque(maxlen=MAX_RECORDS)
+
+@contextlib.contextmanager
+def call_context(run_id=None, phase=None):
+    """Attribute calls made inside the block to a pipeline run and phase"""
+    run_token = _current_run.set(run_id)
+    phase_token = _current_phase.set(phase)
+    try:
+        yield
+    finally:
+        _current_phase.reset(phase_token)
+        _current_run.reset(run_token)
+
+def current_run():
+    """Pipeline run id of the calls made in the current thread/task (None outside a run)"""
+    return _current_run.get()
+
+def estimate_cost(model_name, prompt_tokens, cached_tokens, output_tokens):
+    """Estimate the USD cost of one call (0.0 for models without a price entry)"""
+    pricing = PRICING_PER_MILLION_TOKENS.get(model_name)
+    if pricing is None:
+        return 0.0
+    cost = (prompt_tokens - cached_tokens) * pricing["input"] + cached_tokens * pricing["cached_input"] + output_tokens * pricing["output"]
+    return cost / 1_000_000
+
+def _usage_count(usage, name):
+    """Read a usage_metadata counter that may be missing or None"""
+    return getattr(usage, name, 0) or 0
+
+def record_call(model_name, wall_seconds, phase=None, usage=None, time_to_first_token=None, call_stats=None,
+                cache_hit=False, streamed=False, error=None):
+    """Build, store and emit the metrics record of one generate_content call
+
+    A response without a measured first-token time (non-streaming calls and cache hits)
+    arrives in one piece, so its first token is counted at wall_seconds.
+    """
+    call_stats = call_stats or {}
+    if time_to_first_token is None and error is None:
+        time_to_first_token = wall_seconds
+    prompt_tokens = _usage_count(usage, "prompt_token_count")
+    cached_tokens = _usage_count(usage, "cached_content_token_count")
+    output_tokens = _usage_count(usage, "candidates_token_count")
+    thinking_tokens = _usage_count(usage, "thoughts_token_count")
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "run_id": _current_run.get(),
+        "phase": phase or _current_phase.get() or "unknown",
+        "model": model_name,
+        "wall_seconds": round(wall_seconds, 4),
+        "time_to_first_token_seconds": round(time_to_first_token, 4) if time_to_first_token is not None else None,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "output_tokens": output_tokens,
+        "thinking_tokens": thinking_tokens,
+        "total_tokens": _usage_count(usage, "total_token_count") or prompt_tokens + output_tokens + thinking_tokens,
+        "retries": call_stats.get("retries", 0),
+        "throttle_seconds": round(call_stats.get("throttle_seconds", 0.0), 4),
+        "backoff_seconds": round(call_stats.get("backoff_seconds", 0.0), 4),
+        "cache_hit": cache_hit,
+        "streamed": streamed,
+        "error": f"{type(error).__name__}: {error}" if error is not None else None,
+        "estimated_cost_usd": round(estimate_cost(model_name, prompt_tokens, cached_tokens, output_tokens + thinking_tokens), 6)
+    }
+
+    with _lock:
+        _records.append(record)
+        if METRICS_FILE:
+            write_jsonl(METRICS_FILE, [record], mode="a")
+    return record
+
+def get_records(run_id=None):
+    """Return stored records, optionally only those of one pipeline run"""
+    with _lock:
+        return [record for record in _records if run_id is None or record["run_id"] == run_id]
+
+def write_jsonl(file_path, records, mode="w"):
+    """Write records as JSON lines (mode "w" replaces the file atomically, "a" appends)"""
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    if mode != "w":
+        with open(file_path, mode, encoding='utf-8') as f:
+            f.write(lines)
+        return
+    json_output.write_text_atomic(file_path, lines)
+
+def _empty_totals():
+    """Counters aggregated per phase and per run"""
+    return {
+        "calls": 0,
+        "cache_hits": 0,
+        "errors": 0,
+        "retries": 0,
+        "wall_seconds": 0.0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "output_tokens": 0,
+        "thinking_tokens": 0,
+        "estimated_cost_usd": 0.0
+    }
+
+def _add_record(totals, record):
+    """Accumulate one record into a totals dict"""
+    totals["calls"] += 1
+    totals["cache_hits"] += 1 if record["cache_hit"] else 0
+    totals["errors"] += 1 if record["error"] else 0
+    for name in ("retries", "wall_seconds", "prompt_tokens", "cached_tokens", "output_tokens", "thinking_tokens", "estimated_cost_usd"):
+        totals[name] += record[name]
+
+def _round_totals(totals):
+    """Round float totals for reporting"""
+    totals["wall_seconds"] = round(totals["wall_seconds"], 3)
+    totals["estimated_cost_usd"] = round(totals["estimated_cost_usd"], 6)
+    return totals
+
+def summarize(records):
+    """Aggregate records into run totals plus per-phase totals"""
+    totals = _empty_totals()
+    by_phase = {}
+    for record in records:
+        _add_record(totals, record)
+        _add_record(by_phase.setdefault(record["phase"], _empty_totals()), record)
+
+    for phase, phase_totals in by_phase.items():
+        timed = [record["time_to_first_token_seconds"] for record in records
+                 if record["phase"] == phase and record["time_to_first_token_seconds"] is not None]
+        phase_totals["mean_time_to_first_token_seconds"] = round(sum(timed) / len(timed), 4) if timed else None
+        _round_totals(phase_totals)
+
+    summary = _round_totals(totals)
+    summary["by_phase"] = by_phase
+    return summary
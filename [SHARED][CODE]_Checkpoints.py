@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Phase Checkpoints - manifests of the input hashes behind each saved phase output
+A phase whose inputs (CV bytes, job description, upstream outputs, prompt, model) are unchanged is reused instead of re-run
+"""
+
+import os
+import json
+import time
+import hashlib
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Bumped when the manifest layout changes (older manifests are then ignored)
+MANIFEST_VERSION = 1
+
+def digest(value):
+    """SHA-256 of raw bytes, or of the canonical JSON form of any other value"""
+    if not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+def file_digest(file_path):
+    """SHA-256 of a file's bytes"""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def manifest_path(output_dir, phase_key):
+    """Manifest file kept next to a phase's outputs, e.g. [PHASE_1][MANIFEST]_Checkpoint.json"""
+    return os.path.join(output_dir, f"[{phase_key.upper()}][MANIFEST]_Checkpoint.json")
+
+def write_manifest(output_dir, phase_key, inputs, outputs, state=None, run_id=None):
+    """Record the input hashes and output files of a completed phase
+
+    inputs is {name: digest}, outputs is {name: file path}; state holds pipeline
+    attributes the phase set (restored on reuse).
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "phase": phase_key,
+        "run_id": run_id,
+        "completed_at": time.time(),
+        "input_hash": digest(inputs),
+        "inputs": inputs,
+        "outputs": {name: {"file": os.path.basename(path), "sha256": file_digest(path)} for name, path in outputs.items()},
+        "state": state or {}
+    }
+    json_output.write_json_atomic(manifest_path(output_dir, phase_key), manifest)
+    return manifest
+
+def load_manifest(output_dir, phase_key):
+    """Return a phase's manifest, or None if it is missing or unreadable"""
+    try:
+        with open(manifest_path(output_dir, phase_key), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+def check(output_dir, phase_key, inputs):
+    """Return (manifest, None) if the phase can be reused, else (None, reason it must be recomputed)"""
+    manifest = load_manifest(output_dir, phase_key)
+    if manifest is None:
+        return None, "no checkpoint"
+    if manifest["input_hash"] != digest(inputs):
+        previous = manifest.get("inputs", {})
+        changed = sorted(name for name in set(inputs) | set(previous) if inputs.get(name) != previous.get(name))
+        return None, f"changed: {', '.join(changed)}"
+    for name, output in manifest["outputs"].items():
+        file_path = os.path.join(output_dir, output["file"])
+        if not os.path.exists(file_path) or file_digest(file_path) != output["sha256"]:
+            return None, f"output {output['file']} missing or modified"
+    return manifest, None
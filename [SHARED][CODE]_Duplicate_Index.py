@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Duplicate CV Index - exact and near-duplicate detection before any model call
+Content hashes plus MinHash/LSH signatures of the CV text, stored with each CV's Phase 0 extraction in a compact SQLite file
+An extraction is only reused under the Phase 0 prompt, schema, model and generation profile that produced it
+"""
+
+import os
+import re
+import json
+import time
+import struct
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+pdf_preprocessor = module_loader.load_module("[SHARED][CODE]_PDF_Preprocessor.py", "pdf_preprocessor")
+
+# Index configuration (override with environment variables)
+INDEX_PATH = os.environ.get("HR_DUPLICATE_INDEX", os.path.join(".hr_index", "cv_fingerprints.sqlite3"))
+SIMILARITY_THRESHOLD = float(os.environ.get("HR_DUPLICATE_THRESHOLD", "0.9"))
+
+# MinHash / LSH parameters: 128 permutations in 16 bands of 8 rows puts the LSH
+# candidate threshold near 0.7, below SIMILARITY_THRESHOLD, so true matches are not missed
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+SHINGLE_SIZE = 5
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _permutations(count):
+    """Deterministic (a, b) coefficients for the MinHash permutations"""
+    coefficients = []
+    for index in range(count):
+        digest = hashlib.sha256(f"minhash-permutation-{index}".encode("ascii")).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:16], "big") % _MERSENNE_PRIME
+        coefficients.append((a, b))
+    return coefficients
+
+_PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+def normalize_text(text):
+    """Fold width/case and drop whitespace and punctuation so cosmetic edits do not matter"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return re.sub(r"[\W_]+", "", text)
+
+def shingles(text):
+    """Character shingles of the normalized text (works for Japanese and Latin CVs alike)"""
+    normalized = normalize_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[index:index + SHINGLE_SIZE] for index in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+def minhash_signature(text):
+    """128 x 32-bit MinHash signature of the text, or None if it has no content"""
+    shingle_set = shingles(text)
+    if not shingle_set:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingle_set]
+    return [min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH for a, b in _PERMUTATIONS]
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for left, right in zip(signature, other) if left == right) / len(signature)
+
+def _band_buckets(signature):
+    """LSH bucket id for each band of a signature"""
+    rows = len(signature) // LSH_BANDS
+    buckets = []
+    for band in range(LSH_BANDS):
+        band_bytes = struct.pack(f"<{rows}I", *signature[band * rows:(band + 1) * rows])
+        buckets.append((band, int.from_bytes(hashlib.blake2b(band_bytes, digest_size=8).digest(), "big", signed=True)))
+    return buckets
+
+def fingerprint(pdf_data):
+    """Content hash plus text signature of a CV (signature is None without a usable text layer)"""
+    signature = None
+    pages = pdf_preprocessor.extract_pages(pdf_data) if pdf_preprocessor.available_backend() else None
+    if pages:
+        signature = minhash_signature("\n".join(page.text for page in pages))
+    return {"sha256": hashlib.sha256(pdf_data).hexdigest(), "signature": signature}
+
+class DuplicateIndex:
+    """Persistent index of processed CVs keyed by content hash and LSH band buckets"""
+
+    def __init__(self, db_path=INDEX_PATH, threshold=SIMILARITY_THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._connection = None
+        self.stats = {"lookups": 0, "exact_matches": 0, "near_matches": 0, "added": 0}
+
+    def _connect(self):
+        """Open (and create) the SQLite store on first use"""
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS cvs (
+                    id INTEGER PRIMARY KEY,
+                    sha256 TEXT NOT NULL UNIQUE,
+                    cv_file TEXT,
+                    phase0_output TEXT,
+                    phase0_result TEXT,
+                    phase0_inputs TEXT,
+                    signature BLOB,
+                    created_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    cv_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_lsh_buckets ON lsh_buckets (band, bucket);
+            """)
+            # Indexes written before extractions (or their input digests) were stored: their rows are refilled on the next extraction
+            columns = {column[1] for column in connection.execute("PRAGMA table_info(cvs)")}
+            for column in ("phase0_result", "phase0_inputs"):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE cvs ADD COLUMN {column} TEXT")
+            self._connection = connection
+        return self._connection
+
+    def find(self, cv_fingerprint, inputs_digest):
+        """Return the best earlier match for a fingerprint, or None
+
+        Matches are dicts with cv_file, phase0_output (file the extraction was first saved to),
+        phase0_result (the extraction itself, as JSON text), match ("exact" or "near") and similarity.
+        Rows without a stored extraction, or extracted with other inputs_digest (Phase 0 prompt,
+        schema, model and generation profile), never match.
+        """
+        with self._lock:
+            connection = self._connect()
+            self.stats["lookups"] += 1
+            row = connection.execute("SELECT cv_file, phase0_output, phase0_result FROM cvs WHERE sha256 = ? AND phase0_result IS NOT NULL AND phase0_inputs = ?",
+                                     (cv_fingerprint["sha256"], inputs_digest)).fetchone()
+            if row:
+                self.stats["exact_matches"] += 1
+                return {"cv_file": row[0], "phase0_output": row[1], "phase0_result": row[2], "match": "exact", "similarity": 1.0}
+
+            signature = cv_fingerprint["signature"]
+            if not signature:
+                return None
+
+            candidate_ids = set()
+            for band, bucket in _band_buckets(signature):
+                candidate_ids.update(cv_id for (cv_id,) in connection.execute(
+                    "SELECT cv_id FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+
+            best = None
+            for cv_id in candidate_ids:
+                cv_file, phase0_output, phase0_result, phase0_inputs, stored = connection.execute(
+                    "SELECT cv_file, phase0_output, phase0_result, phase0_inputs, signature FROM cvs WHERE id = ?", (cv_id,)).fetchone()
+                if phase0_result is None or phase0_inputs != inputs_digest:
+                    continue
+                similarity = estimate_similarity(signature, struct.unpack(f"<{NUM_PERMUTATIONS}I", stored))
+                if similarity >= self.threshold and (best is None or similarity > best["similarity"]):
+                    best = {"cv_file": cv_file, "phase0_output": phase0_output, "phase0_result": phase0_result, "match": "near", "similarity": round(similarity, 3)}
+            if best:
+                self.stats["near_matches"] += 1
+            return best
+
+    def add(self, cv_fingerprint, cv_file, phase0_output, phase0_result, inputs_digest):
+        """Record a processed CV with its Phase 0 extraction and the digest of the inputs that produced it
+
+        The extraction is stored in the index itself: the output file at phase0_output
+        belongs to a run directory that a later run may overwrite.
+        """
+        signature = cv_fingerprint["signature"]
+        packed = struct.pack(f"<{NUM_PERMUTATIONS}I", *signature) if signature else None
+        result_text = json.dumps(phase0_result, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                # A concurrent run may have indexed the same file first; keep that entry
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO cvs (sha256, cv_file, phase0_output, phase0_result, phase0_inputs, signature, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (cv_fingerprint["sha256"], cv_file, phase0_output, result_text, inputs_digest, packed, time.time())
+                )
+                if not cursor.rowcount:
+                    # Rows from older indexes, or extracted with other inputs, get this one
+                    connection.execute("UPDATE cvs SET cv_file = ?, phase0_output = ?, phase0_result = ?, phase0_inputs = ? "
+                                       "WHERE sha256 = ? AND (phase0_result IS NULL OR phase0_inputs IS NOT ?)",
+                                       (cv_file, phase0_output, result_text, inputs_digest, cv_fingerprint["sha256"], inputs_digest))
+                    return
+                if signature:
+                    connection.executemany(
+                        "INSERT INTO lsh_buckets (band, bucket, cv_id) VALUES (?, ?, ?)",
+                        [(band, bucket, cursor.lastrowid) for band, bucket in _band_buckets(signature)]
+                    )
+            self.stats["added"] += 1
+
+    def get_stats(self):
+        """Return lookup/match counters"""
+        with self._lock:
+            return dict(self.stats)
+
+# Process-wide index, opened lazily so importing this module never touches the disk
+_shared_index = None
+_shared_lock = threading.Lock()
+
+def get_shared_index():
+    """Return the process-wide DuplicateIndex"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = DuplicateIndex()
+        return _shared_index
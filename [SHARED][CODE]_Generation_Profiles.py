@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Generation Profiles - named per-phase thinking budget, output limit and temperature settings
+The active profile is applied to every generate_content call, so phases never hard-code these knobs
+"""
+
+import os
+import contextlib
+import contextvars
+
+# Profile used outside a pipeline run ("thorough" leaves the model defaults untouched)
+DEFAULT_PROFILE = os.environ.get("HR_GENERATION_PROFILE", "thorough")
+
+# Largest structured output each phase produces, plus headroom (thinking tokens come on top)
+PHASE_OUTPUT_TOKENS = {
+    "phase_0": 8192,
+    "phase_1": 2048,
+    "phase_2": 2048,
+    "phase_3": 4096,
+    "phase_3_evaluation": 2048,
+    "phase_4": 4096,
+    "phase_4_checklist": 4096
+}
+DEFAULT_OUTPUT_TOKENS = 8192
+
+# thinking_budget None keeps dynamic thinking (the model decides, output is not capped);
+# 128 is the smallest budget gemini-2.5-pro accepts. temperature None keeps the model default.
+PROFILES = {
+    "fast": {"thinking_budget": 128, "temperature": 0.1},
+    "balanced": {"thinking_budget": 2048, "temperature": 0.2},
+    "thorough": {"thinking_budget": None, "temperature": None}
+}
+
+# Profile of the calls made in the current thread/task: a name, or {phase: name} per phase
+_current_profile = contextvars.ContextVar("hr_generation_profile", default=None)
+
+def validate(profile):
+    """Raise ValueError for unknown profile names (profile may be a name or {phase: name})"""
+    names = profile.values() if isinstance(profile, dict) else [profile]
+    for name in names:
+        if name not in PROFILES:
+            raise ValueError(f"Unknown generation profile: {name} (expected one of {', '.join(PROFILES)})")
+    return profile
+
+@contextlib.contextmanager
+def profile_context(profile):
+    """Apply a profile (name or {phase: name}) to the generate_content calls made inside the block"""
+    token = _current_profile.set(validate(profile) if profile else None)
+    try:
+        yield
+    finally:
+        _current_profile.reset(token)
+
+def resolve(phase, profile=None):
+    """Profile name for a phase; per-phase maps fall back from "phase_3_evaluation" to "phase_3" """
+    profile = profile or _current_profile.get() or DEFAULT_PROFILE
+    if isinstance(profile, dict):
+        phase = phase or ""
+        base_phase = "_".join(phase.split("_")[:2])
+        return profile.get(phase) or profile.get(base_phase) or DEFAULT_PROFILE
+    return profile
+
+def apply(generation_config, phase, profile=None):
+    """Return generation_config with the profile's settings for phase merged in
+
+    Settings already present in generation_config win, so a phase can still pin a value.
+    """
+    settings = PROFILES[resolve(phase, profile)]
+    config = {}
+    if settings["temperature"] is not None:
+        config["temperature"] = settings["temperature"]
+    if settings["thinking_budget"] is not None:
+        config["thinking_config"] = {"thinking_budget": settings["thinking_budget"]}
+        # max_output_tokens counts thinking tokens too
+        config["max_output_tokens"] = PHASE_OUTPUT_TOKENS.get(phase, DEFAULT_OUTPUT_TOKENS) + settings["thinking_budget"]
+    if not config:
+        return generation_config
+    config.update(generation_config or {})
+    return config
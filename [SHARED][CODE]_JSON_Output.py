@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Structured JSON Output helpers shared by all phase modules
+Schema-constrained generation config plus a single validating parser for phase outputs
+"""
+
+import os
+import re
+import json
+import threading
+
+class JSONOutputError(ValueError):
+    """Raised when a phase output is not valid JSON or does not match its schema"""
+
+# Python types accepted for each response_schema type
+_SCHEMA_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,)
+}
+
+def json_generation_config(schema, **settings):
+    """Build a generation_config requesting application/json that follows schema"""
+    config = {"response_mime_type": "application/json", "response_schema": schema}
+    config.update(settings)
+    return config
+
+# String values that carry no information for a downstream prompt (unfilled template slots, N/A)
+_PLACEHOLDER_PATTERN = re.compile(r"^\s*(<[^<>]*>|n/?a|null|not (mentioned|specified|provided|available))\s*$", re.IGNORECASE)
+
+def _is_blank(value):
+    """True for nulls, empty strings/containers and placeholder strings"""
+    if value is None or value == "" or value == [] or value == {}:
+        return True
+    return isinstance(value, str) and bool(_PLACEHOLDER_PATTERN.match(value))
+
+def project(data, projection):
+    """Select the fields named in projection (nested dicts of keys; True keeps the whole value)
+
+    Lists are projected item by item, so {"work_experience": {"company": True}}
+    keeps only the company of every job.
+    """
+    if projection is True:
+        return data
+    if isinstance(data, list):
+        return [project(item, projection) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {key: project(data[key], sub_projection) for key, sub_projection in projection.items() if key in data}
+
+def prune_blank(data):
+    """Recursively drop blank values (see _is_blank) from dicts and lists"""
+    if isinstance(data, dict):
+        pruned = {key: prune_blank(value) for key, value in data.items()}
+        return {key: value for key, value in pruned.items() if not _is_blank(value)}
+    if isinstance(data, list):
+        pruned = [prune_blank(item) for item in data]
+        return [item for item in pruned if not _is_blank(item)]
+    return data
+
+def compact_json(data, projection=None):
+    """Minified JSON of the projected, pruned data - the form phase outputs take inside later prompts"""
+    if projection is not None:
+        data = project(data, projection)
+    return json.dumps(prune_blank(data), ensure_ascii=False, separators=(",", ":"))
+
+def strip_markdown_fences(text):
+    """Remove a surrounding ```json ... ``` fence if the model added one"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text[text.find("\n") + 1:] if "\n" in text else text[3:]
+        if text.endswith("```"):
+            text = text[:-3]
+        text = text.strip()
+    return text
+
+def validate_schema(data, schema, path="$"):
+    """Check data against the response_schema subset used by the phases (types, required keys, nesting)"""
+    expected = schema.get("type", "").lower()
+    if expected:
+        allowed = _SCHEMA_TYPES[expected]
+        # bool is a subclass of int but never a valid score
+        if not isinstance(data, allowed) or (expected in ("integer", "number") and isinstance(data, bool)):
+            raise JSONOutputError(f"{path}: expected {expected}, got {type(data).__name__}")
+
+    if expected == "object":
+        for key in schema.get("required", []):
+            if key not in data:
+                raise JSONOutputError(f"{path}: missing required key '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if data.get(key) is not None:
+                validate_schema(data[key], subschema, f"{path}.{key}")
+    elif expected == "array" and "items" in schema:
+        for index, item in enumerate(data):
+            validate_schema(item, schema["items"], f"{path}[{index}]")
+    return data
+
+def parse_json_output(text, schema=None):
+    """Parse a phase response into Python data, validating it against schema if given"""
+    if not isinstance(text, str):
+        raise JSONOutputError(f"expected response text, got {type(text).__name__}")
+
+    # Fast path: schema-constrained responses are bare JSON
+    stripped = text.strip()
+    if not stripped.startswith(("{", "[")):
+        stripped = strip_markdown_fences(stripped)
+    try:
+        data = json.loads(stripped)
+    except json.JSONDecodeError as e:
+        raise JSONOutputError(f"invalid JSON: {e}") from e
+
+    if schema is not None:
+        validate_schema(data, schema)
+    return data
+
+def load_json_output(file_path, schema=None):
+    """Read and parse a saved phase output file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return parse_json_output(f.read(), schema)
+
+_MEMBER_KEY_PATTERN = re.compile(r'\s*"((?:[^"\\]|\\.)*)"\s*:')
+
+class IncrementalJSONParser:
+    """Parse a streamed JSON object and report each section as soon as it closes
+
+    section_depth=1 reports top-level members; section_depth=2 reports the members
+    of nested objects (e.g. the sections inside culture_fit_summary_report).
+    """
+
+    def __init__(self, section_depth=1):
+        self.section_depth = section_depth
+        self.buffer = ""
+        self.sections = {}
+        self.finished = False
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the (section_path, value) pairs it completed"""
+        self.buffer += chunk
+        completed = []
+        buffer = self.buffer
+        while self._pos < len(buffer) and not self.finished:
+            char = buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif not self._stack:
+                # Skip anything before the root object (e.g. a ```json fence)
+                if char == "{":
+                    self._stack.append({"type": "{", "start": self._pos + 1, "path": ()})
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                parent = self._stack[-1]
+                path = None
+                if parent["type"] == "{" and parent["path"] is not None:
+                    path = parent["path"] + (self._member_key(parent),)
+                self._stack.append({"type": char, "start": self._pos + 1, "path": path})
+            elif char in "}]":
+                container = self._stack.pop()
+                if container["type"] == "{" and len(self._stack) + 1 == self.section_depth:
+                    self._close_member(container, completed)
+                if not self._stack:
+                    self.finished = True
+            elif char == "," and self._stack[-1]["type"] == "{":
+                container = self._stack[-1]
+                if len(self._stack) == self.section_depth:
+                    self._close_member(container, completed)
+                container["start"] = self._pos + 1
+            self._pos += 1
+        return completed
+
+    def _member_key(self, container):
+        """Return the key of the member currently being parsed in container"""
+        match = _MEMBER_KEY_PATTERN.match(self.buffer, container["start"], self._pos)
+        return json.loads(f'"{match.group(1)}"') if match else ""
+
+    def _close_member(self, container, completed):
+        """Parse the member ending at the current position and record it"""
+        if container["path"] is None:
+            return
+        member = self.buffer[container["start"]:self._pos].strip()
+        if not member:
+            return
+        key, value = next(iter(json.loads("{" + member + "}").items()))
+        section_path = ".".join(container["path"] + (key,))
+        self.sections[section_path] = value
+        completed.append((section_path, value))
+
+    def result(self, schema=None):
+        """Parse the complete streamed text"""
+        return parse_json_output(self.buffer, schema)
+
+def write_text_atomic(file_path, text):
+    """Write text via a temp file + rename so readers never see a partial file"""
+    # Per-thread temp names keep concurrent writers of the same file from sharing one
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def write_json_atomic(file_path, data):
+    """Write indented JSON atomically (see write_text_atomic)"""
+    write_text_atomic(file_path, json.dumps(data, indent=2, ensure_ascii=False))
+
+def _feed_section_chunk(parser, chunk, progress_file, on_section):
+    """Feed one streamed chunk, reporting and saving any sections it completes"""
+    completed = parser.feed(chunk)
+    for section_path, value in completed:
+        if on_section:
+            on_section(section_path, value)
+    if completed and progress_file:
+        write_json_atomic(progress_file, {"status": "in_progress", "sections": parser.sections})
+
+def stream_json_sections(chunks, section_depth=1, progress_file=None, on_section=None):
+    """Feed streamed text chunks through the incremental parser and return the full text
+
+    Completed sections are passed to on_section(path, value) and, if progress_file is
+    given, written to disk after each section so partial results can be read early.
+    """
+    parser = IncrementalJSONParser(section_depth)
+    for chunk in chunks:
+        _feed_section_chunk(parser, chunk, progress_file, on_section)
+
+    if progress_file:
+        write_json_atomic(progress_file, {"status": "complete", "sections": parser.sections})
+    return parser.buffer
+
+async def stream_json_sections_async(chunks, section_depth=1, progress_file=None, on_section=None):
+    """stream_json_sections for an async iterator of text chunks"""
+    parser = IncrementalJSONParser(section_depth)
+    async for chunk in chunks:
+        _feed_section_chunk(parser, chunk, progress_file, on_section)
+
+    if progress_file:
+        write_json_atomic(progress_file, {"status": "complete", "sections": parser.sections})
+    return parser.buffer
+
+def print_section(section_path, value):
+    """Default on_section callback: announce a completed section"""
+    print(f"📄 Section ready: {section_path}")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tiered Model Router - runs suitable phases on a cheaper model first and escalates on doubt
+A phase's output moves up to the next tier when it fails schema validation, reports low confidence or errors
+"""
+
+import os
+import time
+import threading
+from collections import deque
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+call_metrics = vertex_client.call_metrics
+
+# Routing configuration (HR_MODEL_ROUTING=0 sends every phase straight to its own model)
+ROUTING_ENABLED = os.environ.get("HR_MODEL_ROUTING", "1").lower() not in ("0", "false", "no")
+FAST_MODEL = os.environ.get("HR_FAST_MODEL", "gemini-2.5-flash")
+
+# Model tiers per phase, cheapest first. Only mechanical phases are routed; the phase's
+# own model is always the final tier, and unlisted phases use only their own model.
+ROUTES = {
+    "phase_0": [FAST_MODEL],
+    "phase_4_checklist": [FAST_MODEL]
+}
+
+# In-memory routing decisions kept for run summaries (oldest are dropped first)
+MAX_DECISIONS = 10000
+
+_lock = threading.Lock()
+_decisions = deque(maxlen=MAX_DECISIONS)
+_settings = {"enabled": ROUTING_ENABLED}
+
+def configure(enabled=None):
+    """Turn tiered routing on or off for this process"""
+    with _lock:
+        if enabled is not None:
+            _settings["enabled"] = enabled
+
+def route_for(phase, model_name):
+    """Models to try for a phase, ending with the phase's own model"""
+    if not _settings["enabled"]:
+        return [model_name]
+    return [tier for tier in ROUTES.get(phase, []) if tier != model_name] + [model_name]
+
+def _rejection_reason(text, schema, check):
+    """Why an output must be escalated, or None if it is acceptable"""
+    try:
+        data = json_output.parse_json_output(text, schema)
+    except json_output.JSONOutputError as e:
+        return f"invalid output: {e}"
+    return check(data) if check else None
+
+def _attempt(model_name, started, response, reason):
+    """Timing, token usage and cost of one tier's attempt"""
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+    cached_tokens = getattr(usage, "cached_content_token_count", 0) or 0
+    output_tokens = (getattr(usage, "candidates_token_count", 0) or 0) + (getattr(usage, "thoughts_token_count", 0) or 0)
+    return {
+        "model": model_name,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "output_tokens": output_tokens,
+        "estimated_cost_usd": round(call_metrics.estimate_cost(model_name, prompt_tokens, cached_tokens, output_tokens), 6),
+        "escalation_reason": reason
+    }
+
+def _record(phase, default_model, attempts):
+    """Store the routing decision of one routed request"""
+    final = attempts[-1]
+    cost = sum(attempt["estimated_cost_usd"] for attempt in attempts)
+    # What the phase's own model would have charged for the accepted output's tokens
+    default_cost = call_metrics.estimate_cost(default_model, final["prompt_tokens"], final["cached_tokens"], final["output_tokens"])
+    decision = {
+        "run_id": call_metrics.current_run(),
+        "phase": phase,
+        "final_model": final["model"],
+        "escalated": len(attempts) > 1,
+        "attempts": attempts,
+        "wall_seconds": round(sum(attempt["wall_seconds"] for attempt in attempts), 4),
+        "estimated_cost_usd": round(cost, 6),
+        "default_model_cost_usd": round(default_cost, 6),
+        "estimated_savings_usd": round(default_cost - cost, 6)
+    }
+    with _lock:
+        _decisions.append(decision)
+    return decision
+
+def _failed(phase, model_name, tiers, index, attempts, started, error):
+    """Record a tier's error; True to escalate to the next tier, False if it was the final tier"""
+    tier = tiers[index]
+    attempts.append(_attempt(tier, started, None, f"{type(error).__name__}: {error}"))
+    if index < len(tiers) - 1:
+        print(f"⤴️  {phase}: {tier} failed, escalating to {tiers[index + 1]} ({type(error).__name__})")
+        return True
+    if len(tiers) > 1:
+        _record(phase, model_name, attempts)
+    return False
+
+def _cache_if_accepted(tiers, index, schema, check):
+    """Response-cache condition for a tier: a non-final tier's output is only cached if it would be accepted"""
+    if index == len(tiers) - 1:
+        return None
+    return lambda text: _rejection_reason(text, schema, check) is None
+
+def _accepted(phase, model_name, tiers, index, attempts, started, response, schema, check):
+    """Record a tier's response; True if it is accepted, False to escalate to the next tier"""
+    tier = tiers[index]
+    reason = None if index == len(tiers) - 1 else _rejection_reason(response.text, schema, check)
+    attempts.append(_attempt(tier, started, response, reason))
+    if reason is None:
+        if len(tiers) > 1:
+            _record(phase, model_name, attempts)
+        return True
+    print(f"⤴️  {phase}: {tier} output escalated to {tiers[index + 1]} ({reason})")
+    return False
+
+def generate_content(contents, phase, model_name, system_prompt=None, generation_config=None, check=None, use_cache=True):
+    """generate_content through the phase's model tiers
+
+    Each non-final tier's output is parsed against the response schema in
+    generation_config and passed to check(data), which returns an escalation reason
+    or None to accept it. Errors on a non-final tier also escalate. The final tier's
+    response is returned as-is. Rejected outputs are never written to the response cache.
+    """
+    tiers = route_for(phase, model_name)
+    schema = (generation_config or {}).get("response_schema")
+    attempts = []
+    for index, tier in enumerate(tiers):
+        started = time.perf_counter()
+        try:
+            response = vertex_client.generate_content(contents, model_name=tier, system_prompt=system_prompt,
+                                                      generation_config=generation_config, use_cache=use_cache, phase=phase,
+                                                      cache_if=_cache_if_accepted(tiers, index, schema, check))
+        except Exception as e:
+            if _failed(phase, model_name, tiers, index, attempts, started, e):
+                continue
+            raise
+        if _accepted(phase, model_name, tiers, index, attempts, started, response, schema, check):
+            return response
+
+async def generate_content_async(contents, phase, model_name, system_prompt=None, generation_config=None, check=None, use_cache=True):
+    """generate_content for coroutines (same tiers and escalation rules)"""
+    tiers = route_for(phase, model_name)
+    schema = (generation_config or {}).get("response_schema")
+    attempts = []
+    for index, tier in enumerate(tiers):
+        started = time.perf_counter()
+        try:
+            response = await vertex_client.generate_content_async(contents, model_name=tier, system_prompt=system_prompt,
+                                                                  generation_config=generation_config, use_cache=use_cache, phase=phase,
+                                                                  cache_if=_cache_if_accepted(tiers, index, schema, check))
+        except Exception as e:
+            if _failed(phase, model_name, tiers, index, attempts, started, e):
+                continue
+            raise
+        if _accepted(phase, model_name, tiers, index, attempts, started, response, schema, check):
+            return response
+
+def get_decisions(run_id=None):
+    """Return stored routing decisions, optionally only those of one pipeline run"""
+    with _lock:
+        return [decision for decision in _decisions if run_id is None or decision["run_id"] == run_id]
+
+def summarize(decisions):
+    """Aggregate routing decisions into totals plus per-phase escalation and savings figures"""
+    by_phase = {}
+    for decision in decisions:
+        phase = by_phase.setdefault(decision["phase"], {"requests": 0, "escalations": 0, "served_by": {}, "wall_seconds": 0.0, "estimated_savings_usd": 0.0})
+        phase["requests"] += 1
+        phase["escalations"] += 1 if decision["escalated"] else 0
+        phase["served_by"][decision["final_model"]] = phase["served_by"].get(decision["final_model"], 0) + 1
+        phase["wall_seconds"] += decision["wall_seconds"]
+        phase["estimated_savings_usd"] += decision["estimated_savings_usd"]
+
+    for phase in by_phase.values():
+        phase["mean_wall_seconds"] = round(phase.pop("wall_seconds") / phase["requests"], 4)
+        phase["estimated_savings_usd"] = round(phase["estimated_savings_usd"], 6)
+
+    requests = len(decisions)
+    escalations = sum(1 for decision in decisions if decision["escalated"])
+    return {
+        "routed_requests": requests,
+        "escalations": escalations,
+        "escalation_rate": round(escalations / requests, 3) if requests else None,
+        "estimated_cost_usd": round(sum(decision["estimated_cost_usd"] for decision in decisions), 6),
+        "default_model_cost_usd": round(sum(decision["default_model_cost_usd"] for decision in decisions), 6),
+        "estimated_savings_usd": round(sum(decision["estimated_savings_usd"] for decision in decisions), 6),
+        "by_phase": by_phase
+    }
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+PDF Pre-processing for Phase 0 - local text-layer extraction and PDF slimming before upload
+Sends compact page text (with layout hints) instead of the PDF when the text layer is usable,
+and shrinks whatever still has to be uploaded (scanned pages, embedded photos, unused objects)
+"""
+
+import io
+import os
+import re
+import time
+import unicodedata
+import threading
+from collections import namedtuple
+
+# Optional PDF backends: PyMuPDF (block positions) is preferred, pypdf is the fallback.
+# Without either, every CV is uploaded as a PDF exactly as before. Both are slow to
+# import, so they are loaded on first use rather than when this module is imported.
+fitz = None
+pypdf = None
+_backends_loaded = False
+_backends_lock = threading.Lock()
+
+def _load_backends():
+    """Import the installed PDF backends once per process"""
+    global fitz, pypdf, _backends_loaded
+    if _backends_loaded:
+        return
+    with _backends_lock:
+        if _backends_loaded:
+            return
+        try:
+            import fitz as fitz_module
+            fitz = fitz_module
+        except ImportError:
+            pass
+        try:
+            import pypdf as pypdf_module
+            pypdf = pypdf_module
+        except ImportError:
+            pass
+        _backends_loaded = True
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+
+# Text-layer settings (HR_PDF_TEXT_LAYER=0 always uploads the PDF)
+TEXT_LAYER_ENABLED = os.environ.get("HR_PDF_TEXT_LAYER", "1").lower() not in ("0", "false", "no")
+MIN_TEXT_CHARS_PER_PAGE = 80
+MIN_PRINTABLE_RATIO = 0.95
+
+# Tells the model how the extracted text is laid out
+CV_TEXT_HEADER = """The CV below was extracted from the PDF text layer, page by page in reading order.
+Text blocks that sit on the same line of the page (table cells, side-by-side columns) are separated by " | "."""
+SCANNED_PAGES_NOTE = "Pages {pages} have no usable text layer and are attached as a PDF document."
+
+# PDF slimming settings (HR_PDF_OPTIMIZE=0 uploads the original bytes). Gemini reads each
+# page as a ~768px image tile, so scans and photos above SCAN_DPI carry no extra detail.
+OPTIMIZE_ENABLED = os.environ.get("HR_PDF_OPTIMIZE", "1").lower() not in ("0", "false", "no")
+SCAN_DPI = 150
+IMAGE_DPI_THRESHOLD = 200
+JPEG_QUALITY = 75
+MAX_DESKEW_DEGREES = 3.0
+DESKEW_STEP_DEGREES = 0.5
+DESKEW_PREVIEW_DPI = 40
+UPLOAD_MBPS = float(os.environ.get("HR_UPLOAD_MBPS", "10"))
+
+PageText = namedtuple("PageText", ["page_number", "text", "usable"])
+
+def available_backend():
+    """Return the name of the installed PDF text backend, or None"""
+    _load_backends()
+    if fitz is not None:
+        return "pymupdf"
+    if pypdf is not None:
+        return "pypdf"
+    return None
+
+def is_usable_text(text):
+    """True when a page has enough real characters (not a scan or a broken font encoding)"""
+    visible = [char for char in text if not char.isspace()]
+    if len(visible) < MIN_TEXT_CHARS_PER_PAGE:
+        return False
+    # Fonts without a Unicode map extract as replacement, control or private-use characters
+    garbled = sum(1 for char in visible if char == "\ufffd" or unicodedata.category(char) in ("Cc", "Co", "Cs"))
+    return 1 - garbled / len(visible) >= MIN_PRINTABLE_RATIO
+
+def _layout_text(blocks):
+    """Order (x0, y0, x1, y1, text) blocks into lines, joining blocks on the same line with ' | '"""
+    rows = []
+    for x0, y0, x1, y1, text in sorted(blocks, key=lambda block: (block[1], block[0])):
+        text = " ".join(text.split())
+        center = (y0 + y1) / 2
+        if rows and rows[-1]["top"] <= center <= rows[-1]["bottom"]:
+            rows[-1]["cells"].append((x0, text))
+            rows[-1]["bottom"] = max(rows[-1]["bottom"], y1)
+        else:
+            rows.append({"top": y0, "bottom": y1, "cells": [(x0, text)]})
+    return "\n".join(" | ".join(text for _, text in sorted(row["cells"])) for row in rows)
+
+def _extract_pages_pymupdf(pdf_data):
+    """Extract per-page text blocks with PyMuPDF"""
+    pages = []
+    with fitz.open(stream=pdf_data, filetype="pdf") as document:
+        for index, page in enumerate(document):
+            # Block tuples: (x0, y0, x1, y1, text, block_no, block_type); type 0 is text
+            blocks = [block[:5] for block in page.get_text("blocks") if block[6] == 0 and block[4].strip()]
+            text = _layout_text(blocks)
+            pages.append(PageText(index + 1, text, is_usable_text(text)))
+    return pages
+
+def _extract_pages_pypdf(pdf_data):
+    """Extract per-page text with pypdf (layout mode when available)"""
+    pages = []
+    reader = pypdf.PdfReader(io.BytesIO(pdf_data))
+    for index, page in enumerate(reader.pages):
+        try:
+            text = page.extract_text(extraction_mode="layout")
+        except TypeError:
+            # pypdf < 3.17 has no layout mode
+            text = page.extract_text()
+        # Layout mode pads columns with spaces; turn wide gaps into the same ' | ' hint
+        lines = [re.sub(r" {3,}", " | ", line.strip()) for line in (text or "").splitlines() if line.strip()]
+        text = "\n".join(lines)
+        pages.append(PageText(index + 1, text, is_usable_text(text)))
+    return pages
+
+def extract_pages(pdf_data):
+    """Return PageText for every page, or None if no backend can read the PDF"""
+    backend = available_backend()
+    try:
+        if backend == "pymupdf":
+            return _extract_pages_pymupdf(pdf_data)
+        if backend == "pypdf":
+            return _extract_pages_pypdf(pdf_data)
+    except Exception as e:
+        print(f"⚠️  PDF text extraction failed ({backend}): {e}")
+    return None
+
+def count_pages(pdf_data):
+    """Return the number of pages (exact with a PDF backend, estimated from the page objects otherwise)"""
+    _load_backends()
+    try:
+        if fitz is not None:
+            with fitz.open(stream=pdf_data, filetype="pdf") as document:
+                return document.page_count
+        if pypdf is not None:
+            return len(pypdf.PdfReader(io.BytesIO(pdf_data)).pages)
+    except Exception as e:
+        print(f"⚠️  Could not read PDF page count: {e}")
+    return vertex_client.estimate_part_tokens(vertex_client.make_pdf_part(pdf_data)) // vertex_client.PDF_TOKENS_PER_PAGE
+
+def split_page_ranges(page_count, chunk_pages):
+    """Split 1..page_count into consecutive (first, last) ranges of at most chunk_pages"""
+    return [(first, min(first + chunk_pages - 1, page_count)) for first in range(1, page_count + 1, chunk_pages)]
+
+def subset_pdf(pdf_data, page_numbers):
+    """Return a PDF containing only the given 1-based pages"""
+    _load_backends()
+    if fitz is not None:
+        with fitz.open(stream=pdf_data, filetype="pdf") as document, fitz.open() as subset:
+            for page_number in page_numbers:
+                subset.insert_pdf(document, from_page=page_number - 1, to_page=page_number - 1)
+            return subset.tobytes(garbage=3, deflate=True, no_new_id=True)
+
+    reader = pypdf.PdfReader(io.BytesIO(pdf_data))
+    writer = pypdf.PdfWriter()
+    for page_number in page_numbers:
+        writer.add_page(reader.pages[page_number - 1])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+def upload_seconds(byte_count):
+    """Estimated time to upload byte_count at UPLOAD_MBPS"""
+    return byte_count * 8 / (UPLOAD_MBPS * 1_000_000)
+
+def estimate_skew(page):
+    """Find the rotation (degrees) that best aligns a scanned page's text lines
+
+    Renders small grayscale previews at each candidate angle and keeps the one whose
+    row darkness profile has the highest variance (text lines parallel to the rows).
+    Only the central region is scored so the blank corners added by rotation do not count.
+    """
+    def row_profile_variance(angle):
+        matrix = fitz.Matrix(DESKEW_PREVIEW_DPI / 72, DESKEW_PREVIEW_DPI / 72).prerotate(angle)
+        preview = page.get_pixmap(matrix=matrix, colorspace=fitz.csGRAY)
+        samples, stride = preview.samples, preview.stride
+        left, right = preview.width // 10, preview.width - preview.width // 10
+        top, bottom = preview.height // 10, preview.height - preview.height // 10
+        rows = [(right - left) * 255 - sum(samples[row * stride + left:row * stride + right]) for row in range(top, bottom)]
+        mean = sum(rows) / len(rows)
+        return sum((value - mean) ** 2 for value in rows) / len(rows)
+
+    best_angle, best_score = 0.0, row_profile_variance(0.0)
+    steps = int(MAX_DESKEW_DEGREES / DESKEW_STEP_DEGREES)
+    for step in range(1, steps + 1):
+        for angle in (step * DESKEW_STEP_DEGREES, -step * DESKEW_STEP_DEGREES):
+            score = row_profile_variance(angle)
+            # Require a clear improvement so blank or photo pages stay unrotated
+            if score > best_score * 1.02:
+                best_angle, best_score = angle, score
+    return best_angle
+
+def _optimize_pdf_pymupdf(pdf_data):
+    """Re-render scanned pages as deskewed grayscale JPEGs, downsample photos, drop unused objects"""
+    with fitz.open(stream=pdf_data, filetype="pdf") as document, fitz.open() as optimized:
+        scanned_pages = deskewed_pages = 0
+        for index, page in enumerate(document):
+            if is_usable_text(page.get_text()):
+                optimized.insert_pdf(document, from_page=index, to_page=index)
+                continue
+
+            # Scanned page: one grayscale image at the resolution the model actually reads
+            angle = estimate_skew(page)
+            matrix = fitz.Matrix(SCAN_DPI / 72, SCAN_DPI / 72).prerotate(angle)
+            image = page.get_pixmap(matrix=matrix, colorspace=fitz.csGRAY)
+            new_page = optimized.new_page(width=page.rect.width, height=page.rect.height)
+            new_page.insert_image(new_page.rect, stream=image.tobytes("jpeg", jpg_quality=JPEG_QUALITY))
+            scanned_pages += 1
+            deskewed_pages += 1 if angle else 0
+
+        # Embedded photos on text pages (e.g. ID photos in a rirekisho)
+        optimized.rewrite_images(dpi_threshold=IMAGE_DPI_THRESHOLD, dpi_target=SCAN_DPI, quality=JPEG_QUALITY)
+        # no_new_id keeps the output byte-identical across runs (stable response cache keys)
+        data = optimized.tobytes(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=True, no_new_id=True)
+    return data, {"scanned_pages_rerendered": scanned_pages, "pages_deskewed": deskewed_pages}
+
+def _optimize_pdf_pypdf(pdf_data):
+    """Lossless slimming with pypdf: compress content streams and drop duplicate/orphan objects"""
+    writer = pypdf.PdfWriter(clone_from=io.BytesIO(pdf_data))
+    for page in writer.pages:
+        page.compress_content_streams()
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue(), {"scanned_pages_rerendered": 0, "pages_deskewed": 0}
+
+def optimize_pdf(pdf_data):
+    """Return (slimmed PDF bytes, report); the original bytes are kept if nothing is saved"""
+    backend = available_backend()
+    report = {
+        "backend": backend,
+        "original_bytes": len(pdf_data),
+        "optimized_bytes": len(pdf_data),
+        "bytes_saved": 0,
+        "upload_seconds_saved": 0.0,
+        "scanned_pages_rerendered": 0,
+        "pages_deskewed": 0,
+        "optimize_seconds": 0.0
+    }
+    if not backend:
+        return pdf_data, report
+
+    started = time.perf_counter()
+    try:
+        if backend == "pymupdf":
+            optimized_data, details = _optimize_pdf_pymupdf(pdf_data)
+        else:
+            optimized_data, details = _optimize_pdf_pypdf(pdf_data)
+    except Exception as e:
+        print(f"⚠️  PDF optimization failed ({backend}), uploading original: {e}")
+        return pdf_data, report
+    report["optimize_seconds"] = round(time.perf_counter() - started, 4)
+
+    if len(optimized_data) >= len(pdf_data):
+        return pdf_data, report
+
+    saved = len(pdf_data) - len(optimized_data)
+    report.update(details)
+    report.update({
+        "optimized_bytes": len(optimized_data),
+        "bytes_saved": saved,
+        "upload_seconds_saved": round(upload_seconds(saved), 3)
+    })
+    return optimized_data, report
+
+def format_pages(pages, first_page=1):
+    """Render usable pages as the compact text sent to the model"""
+    sections = [f"=== Page {page.page_number + first_page - 1} ===\n{page.text}" for page in pages]
+    return CV_TEXT_HEADER + "\n\n" + "\n\n".join(sections)
+
+def prepare_pdf_contents(pdf_data, use_text_layer=None, optimize=None, first_page=1):
+    """Build Phase 0 request contents for a PDF and report how it will be sent
+
+    mode is "text" (every page has a text layer), "mixed" (text plus a PDF of the
+    scanned pages only) or "pdf" (whole document uploaded as before). Any PDF that is
+    still uploaded is slimmed first unless optimize is False. first_page numbers the
+    pages when pdf_data is a page range cut from a longer CV.
+    """
+    use_text_layer = TEXT_LAYER_ENABLED if use_text_layer is None else use_text_layer
+    optimize = OPTIMIZE_ENABLED if optimize is None else optimize
+    pdf_part = vertex_client.make_pdf_part(pdf_data)
+    report = {
+        "mode": "pdf",
+        "backend": available_backend(),
+        "pdf_bytes": len(pdf_data),
+        "pages": None,
+        "text_pages": 0,
+        "scanned_pages": [],
+        "pdf_tokens": vertex_client.estimate_part_tokens(pdf_part),
+        "extraction_seconds": 0.0
+    }
+
+    pages = None
+    if use_text_layer and report["backend"]:
+        started = time.perf_counter()
+        pages = extract_pages(pdf_data)
+        report["extraction_seconds"] = round(time.perf_counter() - started, 4)
+
+    contents = [pdf_part]
+    if pages:
+        text_pages = [page for page in pages if page.usable]
+        scanned = [page.page_number for page in pages if not page.usable]
+        report.update({"pages": len(pages), "text_pages": len(text_pages), "scanned_pages": scanned})
+        # An uploaded PDF costs its page images plus the native text layer the service also extracts
+        report["pdf_tokens"] = len(pages) * vertex_client.PDF_TOKENS_PER_PAGE + sum(vertex_client.estimate_tokens(page.text) for page in text_pages)
+
+        if text_pages and not scanned:
+            report["mode"] = "text"
+            contents = [format_pages(text_pages, first_page)]
+        elif text_pages:
+            try:
+                scanned_part = vertex_client.make_pdf_part(subset_pdf(pdf_data, scanned))
+                report["mode"] = "mixed"
+                scanned_labels = ", ".join(str(page_number + first_page - 1) for page_number in scanned)
+                contents = [format_pages(text_pages, first_page) + "\n\n" + SCANNED_PAGES_NOTE.format(pages=scanned_labels), scanned_part]
+            except Exception as e:
+                print(f"⚠️  Could not split scanned pages, uploading the whole PDF: {e}")
+
+    # Slim the PDF part that is still uploaded
+    if optimize and not isinstance(contents[-1], str):
+        optimized_data, report["optimization"] = optimize_pdf(contents[-1].data)
+        contents[-1] = vertex_client.make_pdf_part(optimized_data)
+
+    report["input_tokens"] = sum(vertex_client.estimate_part_tokens(part) for part in contents)
+    return contents, report
+
+def describe(report):
+    """One-line summary of how a PDF is being sent"""
+    if report["mode"] == "text":
+        return f"📝 Using PDF text layer ({report['text_pages']} pages, ~{report['input_tokens']} tokens instead of ~{report['pdf_tokens']} as PDF)"
+    if report["mode"] == "mixed":
+        return f"📝 Using PDF text layer for {report['text_pages']}/{report['pages']} pages; scanned pages {report['scanned_pages']} uploaded as PDF"
+    reason = "no PDF text backend installed" if not report["backend"] else "no usable text layer" if report["pages"] else "text layer disabled or unreadable"
+    return f"📄 Uploading PDF ({reason})"
+
+def describe_optimization(report):
+    """One-line summary of the bytes and upload time saved by slimming"""
+    optimization = report.get("optimization")
+    if not optimization or not optimization["bytes_saved"]:
+        return None
+    return (f"🗜️  PDF slimmed: {round(optimization['original_bytes'] / 1024, 1)} KB → {round(optimization['optimized_bytes'] / 1024, 1)} KB "
+            f"(~{optimization['upload_seconds_saved']}s upload saved, {optimization['scanned_pages_rerendered']} scanned pages re-rendered, "
+            f"{optimization['pages_deskewed']} deskewed)")
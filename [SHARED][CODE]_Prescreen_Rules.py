@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local Pre-Screen Rules - deterministic triage of the Phase 0 extraction
+Scores skills, Japanese level and work experience per job profile so clear mismatches can skip Gemini screening
+"""
+
+import os
+import re
+import time
+import unicodedata
+
+# Pre-screen configuration (override with environment variables)
+# HR_PRESCREEN: "off" screens everyone, "skip" replaces Phase 1 with the local triage for
+# clear rejects, "defer" postpones their Phase 1/3 until someone re-runs them
+PRESCREEN_MODES = ("off", "skip", "defer")
+PRESCREEN_MODE = os.environ.get("HR_PRESCREEN", "off").lower()
+REJECT_BELOW = int(os.environ.get("HR_PRESCREEN_REJECT_BELOW", "25"))
+
+# Share of the 100-point triage score per component
+COMPONENT_WEIGHTS = {"skills": 50, "japanese": 20, "experience": 30}
+
+# Job profiles: matched against the job description by keyword, first match wins.
+# Skill weights are summed over matched skills and scored against skill_target;
+# aliases are matched as whole words in the normalized skills and work history.
+JOB_PROFILES = {
+    "it_communicator": {
+        "keywords": ["communicator", "comtor", "bridge", "interpreter", "コミュニケーター", "通訳"],
+        "skills": {
+            "japanese": (10, ["japanese", "日本語"]),
+            "translation": (10, ["translation", "translate", "interpret", "interpreting", "interpretation", "翻訳", "通訳"]),
+            "project management": (8, ["project management", "jira", "backlog", "redmine", "プロジェクト管理"]),
+            "agile": (6, ["agile", "scrum", "kanban"]),
+            "software development": (6, ["software", "developer", "engineer", "開発"]),
+            "english": (4, ["english", "英語"])
+        },
+        "skill_target": 24,
+        "target_jlpt_level": 2,
+        "required_jlpt_level": 3,
+        "target_experience_years": 2
+    },
+    "software_engineer": {
+        "keywords": ["engineer", "developer", "programmer", "software", "エンジニア", "開発"],
+        "skills": {
+            "node.js": (15, ["node.js", "nodejs", "node", "express", "nestjs"]),
+            "typescript": (12, ["typescript", "ts"]),
+            "python": (12, ["python", "django", "flask", "fastapi"]),
+            "aws": (10, ["aws", "amazon web services", "lambda", "ec2", "s3"]),
+            "microservices": (8, ["microservices", "microservice", "マイクロサービス"]),
+            "javascript": (6, ["javascript", "js"]),
+            "containers": (4, ["docker", "kubernetes", "k8s", "ecs"]),
+            "frontend": (4, ["react", "vue", "vue.js", "next.js", "angular"]),
+            "databases": (4, ["sql", "mysql", "postgresql", "postgres", "mongodb", "redis"])
+        },
+        "skill_target": 35,
+        "target_jlpt_level": 3,
+        "required_jlpt_level": None,
+        "target_experience_years": 3
+    }
+}
+DEFAULT_PROFILE = "software_engineer"
+
+# Japanese level parsing: JLPT N1-N5, the pre-2010 1-4 kyu scale, or native speakers (level 0)
+_JLPT_PATTERN = re.compile(r"(?<![a-z0-9])n\s*([1-5])(?![0-9])")
+_KYU_PATTERN = re.compile(r"([1-4])\s*級")
+_OLD_KYU_TO_JLPT = {1: 1, 2: 2, 3: 4, 4: 5}
+_NATIVE_WORDS = ("native", "ネイティブ", "母語", "母国語")
+_NO_JAPANESE_WORDS = ("none", "no japanese", "なし", "無し")
+_ONGOING_WORDS = ("present", "current", "now", "現在", "在職中", "至今")
+
+def _normalize(text):
+    """Fold width/case so ＮＯＤＥ.ＪＳ, Node.js and node.js compare equal"""
+    return unicodedata.normalize("NFKC", str(text or "")).lower()
+
+def _alias_pattern(alias):
+    """Whole-word regex for one skill alias ("js" must not match inside "node.js")"""
+    return re.compile(r"(?<![a-z0-9.])" + re.escape(alias) + r"(?![a-z0-9])")
+
+# Aliases are compiled once per profile
+_PROFILE_PATTERNS = {
+    name: {skill: (weight, [_alias_pattern(_normalize(alias)) for alias in aliases]) for skill, (weight, aliases) in profile["skills"].items()}
+    for name, profile in JOB_PROFILES.items()
+}
+
+def select_profile(job_description):
+    """Return the name of the job profile whose keywords appear in the job description"""
+    text = _normalize(job_description)
+    for name, profile in JOB_PROFILES.items():
+        if any(_normalize(keyword) in text for keyword in profile["keywords"]):
+            return name
+    return DEFAULT_PROFILE
+
+def parse_jlpt_level(japanese_proficiency, other_texts=()):
+    """Best (lowest) JLPT level stated: 0 for native, 6 for explicitly none, None if unknown
+
+    japanese_proficiency is about Japanese by definition; other texts (languages,
+    licenses) only count where they mention Japanese or an N-level.
+    """
+    best = None
+    for index, text in enumerate([japanese_proficiency] + list(other_texts)):
+        text = _normalize(text)
+        about_japanese = index == 0 or "japanese" in text or "日本語" in text or "jlpt" in text
+        levels = [int(level) for level in _JLPT_PATTERN.findall(text)]
+        if about_japanese:
+            levels += [_OLD_KYU_TO_JLPT[int(kyu)] for kyu in _KYU_PATTERN.findall(text)]
+            if any(word in text for word in _NATIVE_WORDS):
+                levels.append(0)
+        if levels:
+            best = min(levels) if best is None else min(best, *levels)
+    if best is None and _normalize(japanese_proficiency).strip() in _NO_JAPANESE_WORDS:
+        return 6
+    return best
+
+def _month_index(year, month, ongoing_default):
+    """Months since year 0 for a (year, month) pair of extracted strings, or None"""
+    year_text = _normalize(year)
+    if not year_text or any(word in year_text for word in _ONGOING_WORDS):
+        if not ongoing_default:
+            return None
+        now = time.localtime()
+        return now.tm_year * 12 + now.tm_mon - 1
+    year_match = re.search(r"(19|20)\d{2}", year_text)
+    if not year_match:
+        return None
+    month_match = re.search(r"\d{1,2}", _normalize(month))
+    month_number = int(month_match.group()) if month_match and 1 <= int(month_match.group()) <= 12 else 1
+    return int(year_match.group()) * 12 + month_number - 1
+
+def experience_years(work_experience):
+    """Total years covered by the work history (overlapping jobs are counted once)"""
+    periods = []
+    for job in work_experience or []:
+        if not isinstance(job, dict):
+            continue
+        start = _month_index(job.get("start_year"), job.get("start_month"), ongoing_default=False)
+        end = _month_index(job.get("end_year"), job.get("end_month"), ongoing_default=True)
+        if start is not None and end is not None and end >= start:
+            periods.append((start, end + 1))
+
+    months = 0
+    covered_until = None
+    for start, end in sorted(periods):
+        if covered_until is not None:
+            start = max(start, covered_until)
+        if end > start:
+            months += end - start
+        covered_until = end if covered_until is None else max(covered_until, end)
+    return round(months / 12, 1)
+
+def _skill_text(candidate_info):
+    """Normalized text the skill aliases are matched against"""
+    skills = candidate_info.get("skills") or {}
+    parts = list(skills.get("technical_skills") or []) + list(skills.get("languages") or [])
+    for job in candidate_info.get("work_experience") or []:
+        if isinstance(job, dict):
+            parts.append(job.get("position") or "")
+            parts.extend(job.get("responsibilities") or [])
+    return _normalize("\n".join(str(part) for part in parts))
+
+def _jlpt_label(level):
+    """Human-readable label of a parsed Japanese level"""
+    if level is None:
+        return None
+    if level == 0:
+        return "native"
+    if level == 6:
+        return "none"
+    return f"N{level}"
+
+def triage(phase0_result, job_description=None, reject_below=None):
+    """Score a Phase 0 extraction against the job profile and decide "reject" or "screen"
+
+    Only clear mismatches are rejected: thin or low-confidence extractions are always
+    sent on to Gemini screening, whatever their score.
+    """
+    reject_below = REJECT_BELOW if reject_below is None else reject_below
+    profile_name = select_profile(job_description)
+    profile = JOB_PROFILES[profile_name]
+    candidate_info = phase0_result.get("candidate_info") or {}
+    skills = candidate_info.get("skills") or {}
+
+    # Skills: weighted matches against the profile's technology stack
+    skill_text = _skill_text(candidate_info)
+    matched = [skill for skill, (weight, patterns) in _PROFILE_PATTERNS[profile_name].items() if any(pattern.search(skill_text) for pattern in patterns)]
+    matched_weight = sum(profile["skills"][skill][0] for skill in matched)
+    skill_share = min(1.0, matched_weight / profile["skill_target"])
+
+    # Japanese: N-level against the profile's target (N5 earns a little, native earns everything)
+    licenses = [f"{item.get('name', '')} {item.get('score', '')}" for item in candidate_info.get("licenses") or [] if isinstance(item, dict)]
+    jlpt_level = parse_jlpt_level(skills.get("japanese_proficiency"), list(skills.get("languages") or []) + licenses)
+    if jlpt_level is None or jlpt_level == 6:
+        japanese_share = 0.0
+    else:
+        japanese_share = min(1.0, (6 - jlpt_level) / (6 - profile["target_jlpt_level"]))
+
+    # Experience: years of work history against the profile's target
+    years = experience_years(candidate_info.get("work_experience"))
+    experience_share = min(1.0, years / profile["target_experience_years"])
+
+    score = round(skill_share * COMPONENT_WEIGHTS["skills"] + japanese_share * COMPONENT_WEIGHTS["japanese"] + experience_share * COMPONENT_WEIGHTS["experience"])
+
+    reasons = []
+    required_level = profile["required_jlpt_level"]
+    if required_level is not None and jlpt_level is not None and jlpt_level > required_level:
+        reasons.append(f"Japanese level {_jlpt_label(jlpt_level)} is below the required N{required_level}")
+    if score < reject_below:
+        reasons.append(f"Triage score {score} is below the reject threshold {reject_below}")
+
+    confidence = (phase0_result.get("extraction_quality") or {}).get("confidence_level")
+    has_data = bool(skills.get("technical_skills") or candidate_info.get("work_experience"))
+    if reasons and (confidence == "low" or not has_data):
+        decision = "screen"
+        reasons.append("Extraction is too thin or low-confidence for a local decision")
+    else:
+        decision = "reject" if reasons else "screen"
+
+    return {
+        "profile": profile_name,
+        "triage_score": score,
+        "reject_below": reject_below,
+        "decision": decision,
+        "reasons": reasons,
+        "components": {
+            "skills": {"score": round(skill_share * COMPONENT_WEIGHTS["skills"], 1), "matched": matched},
+            "japanese": {"score": round(japanese_share * COMPONENT_WEIGHTS["japanese"], 1), "jlpt_level": _jlpt_label(jlpt_level)},
+            "experience": {"score": round(experience_share * COMPONENT_WEIGHTS["experience"], 1), "years": years}
+        }
+    }
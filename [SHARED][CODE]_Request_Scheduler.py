@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Rate-Limit Aware Request Scheduler for Vertex AI calls
+Enforces requests/tokens-per-minute budgets and retries transient errors with jittered backoff
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+
+# Scheduler configuration (override with environment variables)
+REQUESTS_PER_MINUTE = int(os.environ.get("HR_VERTEX_RPM", "60"))
+TOKENS_PER_MINUTE = int(os.environ.get("HR_VERTEX_TPM", "1000000"))
+MAX_RETRIES = int(os.environ.get("HR_VERTEX_MAX_RETRIES", "5"))
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# Errors worth retrying: quota exhaustion and transient server-side failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "Aborted"
+}
+
+def is_retryable(error):
+    """Return True for rate-limit (429) and transient 5xx/timeout errors"""
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+class TokenBucket:
+    """Per-minute budget that refills continuously; callers reserve capacity up front"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def reserve(self, amount):
+        """Reserve amount and return how long the caller must wait before using it"""
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.available -= min(amount, self.capacity)
+        if self.available >= 0:
+            return 0.0
+        return -self.available / self.rate
+
+class RequestScheduler:
+    """Central gate for every Vertex AI request made by the phase modules"""
+
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE, max_retries=MAX_RETRIES,
+                 base_backoff=BASE_BACKOFF_SECONDS, max_backoff=MAX_BACKOFF_SECONDS):
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._request_bucket = TokenBucket(requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute)
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "throttled_requests": 0,
+            "throttle_seconds": 0.0,
+            "backoff_seconds": 0.0,
+            "queue_depth": 0,
+            "max_queue_depth": 0
+        }
+
+    def set_limits(self, requests_per_minute=None, tokens_per_minute=None):
+        """Replace the per-minute budgets"""
+        with self._lock:
+            if requests_per_minute:
+                self._request_bucket = TokenBucket(requests_per_minute)
+            if tokens_per_minute:
+                self._token_bucket = TokenBucket(tokens_per_minute)
+
+    def _reserve(self, estimated_tokens):
+        """Queue a call and return how long it must wait for both budgets"""
+        with self._lock:
+            self.stats["queue_depth"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.stats["queue_depth"])
+            return max(self._request_bucket.reserve(1), self._token_bucket.reserve(estimated_tokens))
+
+    def _admit(self, wait):
+        """Record a call leaving the queue after waiting wait seconds"""
+        with self._lock:
+            self.stats["queue_depth"] -= 1
+            self.stats["requests"] += 1
+            if wait > 0:
+                self.stats["throttled_requests"] += 1
+                self.stats["throttle_seconds"] += wait
+        return wait
+
+    def _acquire(self, estimated_tokens):
+        """Wait until both the request and token budgets allow another call"""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return self._admit(wait)
+
+    async def _acquire_async(self, estimated_tokens):
+        """_acquire for coroutines: waits without blocking the event loop"""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self._admit(wait)
+
+    def _backoff(self, error, attempt, call_stats):
+        """Return the delay before retrying a failed attempt, or re-raise if it must not be retried"""
+        if attempt >= self.max_retries or not is_retryable(error):
+            with self._lock:
+                self.stats["failures"] += 1
+            raise error
+
+        # Exponential backoff with jitter so concurrent callers do not retry in lockstep
+        delay = min(self.max_backoff, self.base_backoff * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        with self._lock:
+            self.stats["retries"] += 1
+            self.stats["backoff_seconds"] += delay
+        if call_stats is not None:
+            call_stats["retries"] = attempt + 1
+            call_stats["backoff_seconds"] += delay
+        print(f"⚠️  Retryable Vertex AI error ({type(error).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def execute(self, request_fn, estimated_tokens=0, call_stats=None):
+        """Run request_fn under the rate limits, retrying retryable errors
+
+        If call_stats (a dict) is given, it receives this call's retry count and
+        throttle/backoff time.
+        """
+        attempt = 0
+        if call_stats is not None:
+            call_stats.update({"retries": 0, "throttle_seconds": 0.0, "backoff_seconds": 0.0})
+
+        while True:
+            waited = self._acquire(estimated_tokens)
+            if call_stats is not None:
+                call_stats["throttle_seconds"] += waited
+            try:
+                return request_fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt, call_stats)
+                attempt += 1
+                time.sleep(delay)
+
+    async def execute_async(self, request_fn, estimated_tokens=0, call_stats=None):
+        """execute for coroutines: request_fn() returns an awaitable, and waits never block the event loop"""
+        attempt = 0
+        if call_stats is not None:
+            call_stats.update({"retries": 0, "throttle_seconds": 0.0, "backoff_seconds": 0.0})
+
+        while True:
+            waited = await self._acquire_async(estimated_tokens)
+            if call_stats is not None:
+                call_stats["throttle_seconds"] += waited
+            try:
+                return await request_fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt, call_stats)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def get_stats(self):
+        """Return a snapshot of scheduler metrics"""
+        with self._lock:
+            return dict(self.stats)
+
+# Process-wide scheduler shared by all phase modules
+shared_scheduler = RequestScheduler()
+
+def configure(requests_per_minute=None, tokens_per_minute=None, max_retries=None):
+    """Update the shared scheduler's budgets and retry limit"""
+    shared_scheduler.set_limits(requests_per_minute, tokens_per_minute)
+    if max_retries is not None:
+        shared_scheduler.max_retries = max_retries
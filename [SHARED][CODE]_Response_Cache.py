@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Response Cache for Gemini phase calls
+Stores generated text on disk keyed by a hash of every input that affects the output
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+# Cache configuration (override with environment variables)
+CACHE_DIR = os.environ.get("HR_CACHE_DIR", ".gemini_cache")
+CACHE_MAX_BYTES = int(float(os.environ.get("HR_CACHE_MAX_MB", "200")) * 1024 * 1024)
+CACHE_TTL_SECONDS = int(float(os.environ.get("HR_CACHE_TTL_HOURS", "168")) * 3600)
+CACHE_BYPASS = os.environ.get("HR_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+def make_cache_key(model_name, system_prompt, contents, generation_config=None):
+    """Hash (model, system prompt, input parts, generation config) into a cache key"""
+    digest = hashlib.sha256()
+    digest.update(b"model\0" + model_name.encode("utf-8") + b"\0")
+    digest.update(b"system\0" + (system_prompt or "").encode("utf-8") + b"\0")
+    for part in contents:
+        if isinstance(part, str):
+            digest.update(b"text\0" + part.encode("utf-8") + b"\0")
+        else:
+            # Binary parts (e.g. PDF bytes) expose mime_type and data
+            digest.update(b"data\0" + part.mime_type.encode("utf-8") + b"\0" + part.data + b"\0")
+    config_json = json.dumps(generation_config or {}, sort_keys=True, default=str)
+    digest.update(b"config\0" + config_json.encode("utf-8"))
+    return digest.hexdigest()
+
+class ResponseCache:
+    """Size-bounded LRU cache of generated responses with a time-to-live"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, ttl_seconds=CACHE_TTL_SECONDS, enabled=not CACHE_BYPASS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bypassed": 0
+        }
+
+    def _entry_path(self, key):
+        """Return the file path of a cache entry"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _scan_total_bytes(self):
+        """Compute the current on-disk size of the cache (once per process)"""
+        if self._total_bytes is None:
+            total = 0
+            if os.path.isdir(self.cache_dir):
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(".json"):
+                        total += entry.stat().st_size
+            self._total_bytes = total
+        return self._total_bytes
+
+    def _remove(self, path):
+        """Delete a cache entry and update the size accounting"""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        if self._total_bytes is not None:
+            self._total_bytes -= size
+
+    def get(self, key):
+        """Return cached text for key, or None on miss/expiry/bypass"""
+        with self._lock:
+            if not self.enabled:
+                self.stats["bypassed"] += 1
+                return None
+
+            path = self._entry_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.stats["misses"] += 1
+                return None
+
+            if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+                self._scan_total_bytes()
+                self._remove(path)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path, None)
+            self.stats["hits"] += 1
+            return entry["text"]
+
+    def put(self, key, text, model_name=None):
+        """Store generated text under key and evict least recently used entries"""
+        with self._lock:
+            if not self.enabled or not text:
+                return
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._scan_total_bytes()
+
+            path = self._entry_path(key)
+            if os.path.exists(path):
+                self._remove(path)
+
+            entry = {"created_at": time.time(), "model": model_name, "text": text}
+            json_output.write_text_atomic(path, json.dumps(entry, ensure_ascii=False))
+
+            self._total_bytes += os.path.getsize(path)
+            self.stats["writes"] += 1
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(entry.path)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Delete every cache entry"""
+        with self._lock:
+            if os.path.isdir(self.cache_dir):
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(".json"):
+                        os.remove(entry.path)
+            self._total_bytes = 0
+
+    def get_stats(self):
+        """Return a snapshot of hit/miss counters"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size_bytes"] = self._total_bytes or 0
+        return stats
+
+# Process-wide cache shared by all phase modules
+shared_cache = ResponseCache()
+
+def configure(**settings):
+    """Update cache settings (cache_dir, max_bytes, ttl_seconds, enabled)"""
+    with shared_cache._lock:
+        for name, value in settings.items():
+            if not hasattr(shared_cache, name):
+                raise ValueError(f"Unknown cache setting: {name}")
+            setattr(shared_cache, name, value)
+        if "cache_dir" in settings:
+            shared_cache._total_bytes = None
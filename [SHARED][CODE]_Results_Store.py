@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Candidate Results Store - embedded SQLite store of phase results keyed by CV content and job
+Scores, Japanese level, experience and review flags are indexed so candidate sets can be queried without opening JSON files
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+# JLPT / experience parsing shared with the local pre-screen
+prescreen_rules = module_loader.load_module("[SHARED][CODE]_Prescreen_Rules.py", "prescreen_rules")
+
+# Store location (override with HR_RESULTS_STORE)
+STORE_PATH = os.environ.get("HR_RESULTS_STORE", os.path.join(".hr_index", "results.sqlite3"))
+
+# Candidate columns returned by queries (in table order). Rows are keyed by the CV's
+# sha256 and the job, so two different CVs with the same file name never share a row;
+# candidate_id is the label the run was given.
+CANDIDATE_COLUMNS = [
+    "candidate_id", "cv_sha256", "job_key", "job_description", "cv_file", "run_id", "updated_at",
+    "screening_score", "assessment_score", "average_score", "recommendation",
+    "jlpt_level", "japanese_proficiency", "experience_years", "flag_count",
+    "prescreen_action", "estimated_cost_usd"
+]
+ORDER_COLUMNS = {"screening_score", "assessment_score", "average_score", "experience_years", "updated_at", "candidate_id"}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS candidates (
+        candidate_id TEXT NOT NULL,
+        cv_sha256 TEXT NOT NULL,
+        job_key TEXT NOT NULL,
+        job_description TEXT,
+        cv_file TEXT,
+        run_id TEXT,
+        updated_at REAL,
+        screening_score INTEGER,
+        assessment_score INTEGER,
+        average_score REAL,
+        recommendation TEXT,
+        jlpt_level INTEGER,
+        japanese_proficiency TEXT,
+        experience_years REAL,
+        flag_count INTEGER,
+        prescreen_action TEXT,
+        estimated_cost_usd REAL,
+        PRIMARY KEY (cv_sha256, job_key)
+    );
+    CREATE TABLE IF NOT EXISTS phase_results (
+        cv_sha256 TEXT NOT NULL,
+        job_key TEXT NOT NULL,
+        phase TEXT NOT NULL,
+        result TEXT NOT NULL,
+        PRIMARY KEY (cv_sha256, job_key, phase)
+    );
+    CREATE TABLE IF NOT EXISTS flags (
+        cv_sha256 TEXT NOT NULL,
+        job_key TEXT NOT NULL,
+        phase TEXT NOT NULL,
+        flag_type TEXT,
+        message TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_candidates_screening ON candidates (job_key, screening_score);
+    CREATE INDEX IF NOT EXISTS idx_candidates_assessment ON candidates (job_key, assessment_score);
+    CREATE INDEX IF NOT EXISTS idx_candidates_jlpt ON candidates (jlpt_level);
+    CREATE INDEX IF NOT EXISTS idx_candidates_recommendation ON candidates (recommendation);
+    CREATE INDEX IF NOT EXISTS idx_candidates_id ON candidates (candidate_id);
+    CREATE INDEX IF NOT EXISTS idx_flags_type ON flags (flag_type, cv_sha256, job_key);
+    CREATE INDEX IF NOT EXISTS idx_flags_candidate ON flags (cv_sha256, job_key);
+"""
+
+# Stores written before rows were keyed by CV content (candidate_id was the key)
+_LEGACY_TABLES = ["candidates", "phase_results", "flags"]
+
+# Phase results whose flags_for_human_review are indexed
+FLAGGED_PHASES = ["phase_1", "phase_2"]
+
+def job_key(job_description):
+    """Stable short key of a job description"""
+    return hashlib.sha256((job_description or "").strip().encode("utf-8")).hexdigest()[:16]
+
+def parse_jlpt(level):
+    """Accept 2, "2" or "N2" for a JLPT level filter"""
+    if isinstance(level, int):
+        return level
+    return int(str(level).strip().upper().lstrip("N"))
+
+def candidate_fields(results):
+    """Indexed candidate columns derived from phase results"""
+    screening = results.get("phase_1") or {}
+    assessment = results.get("phase_2") or {}
+    candidate_info = (results.get("phase_0") or {}).get("candidate_info") or {}
+    skills = candidate_info.get("skills") or {}
+    licenses = [f"{item.get('name', '')} {item.get('score', '')}" for item in candidate_info.get("licenses") or [] if isinstance(item, dict)]
+    flag_count = sum(len((results.get(phase) or {}).get("flags_for_human_review") or []) for phase in FLAGGED_PHASES)
+    return {
+        # A pre-screen reject's partial rule-based score is not a screening score (see prescreen_action)
+        "screening_score": screening.get("screening_score") if "prescreen" not in screening else None,
+        "assessment_score": assessment.get("assessment_score"),
+        "jlpt_level": prescreen_rules.parse_jlpt_level(skills.get("japanese_proficiency"), list(skills.get("languages") or []) + licenses),
+        "japanese_proficiency": skills.get("japanese_proficiency"),
+        "experience_years": prescreen_rules.experience_years(candidate_info.get("work_experience")) if candidate_info else None,
+        "flag_count": flag_count
+    }
+
+class ResultsStore:
+    """SQLite store of candidate summaries, phase results and review flags"""
+
+    def __init__(self, db_path=STORE_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """Open (and create) the SQLite store on first use"""
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._migrate(connection)
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _migrate(self, connection):
+        """Re-key a store written before cv_sha256 existed; its rows get "legacy:<candidate_id>" as their key"""
+        columns = [row["name"] for row in connection.execute("PRAGMA table_info(candidates)")]
+        if not columns or "cv_sha256" in columns:
+            return
+        with connection:
+            for table in _LEGACY_TABLES:
+                connection.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        # The legacy indexes keep their names until their tables are dropped; _connect recreates them
+        connection.executescript(_SCHEMA)
+        legacy_columns = [column for column in CANDIDATE_COLUMNS if column != "cv_sha256"]
+        with connection:
+            connection.execute(f"INSERT INTO candidates ({', '.join(legacy_columns)}, cv_sha256) "
+                               f"SELECT {', '.join(legacy_columns)}, 'legacy:' || candidate_id FROM candidates_legacy")
+            connection.execute("INSERT INTO phase_results (cv_sha256, job_key, phase, result) "
+                               "SELECT 'legacy:' || candidate_id, job_key, phase, result FROM phase_results_legacy")
+            connection.execute("INSERT INTO flags (cv_sha256, job_key, phase, flag_type, message) "
+                               "SELECT 'legacy:' || candidate_id, job_key, phase, flag_type, message FROM flags_legacy")
+            for table in _LEGACY_TABLES:
+                connection.execute(f"DROP TABLE {table}_legacy")
+
+    def save_candidates(self, records):
+        """Bulk insert or replace candidates in one transaction
+
+        Each record is {"candidate_id", "cv_sha256", "job_description", "results": {phase: result}, ...}
+        plus any other CANDIDATE_COLUMNS (cv_file, run_id, average_score, ...). A record
+        replaces the earlier row of the same CV and job, whatever its candidate_id.
+        """
+        candidate_rows, phase_rows, flag_rows, keys = [], [], [], []
+        now = time.time()
+        for record in records:
+            key = job_key(record.get("job_description"))
+            results = record.get("results") or {}
+            row = dict(record, job_key=key, updated_at=now)
+            row.update({name: value for name, value in candidate_fields(results).items() if row.get(name) is None})
+            candidate_rows.append(tuple(row.get(column) for column in CANDIDATE_COLUMNS))
+            keys.append((record["cv_sha256"], key))
+            for phase, result in results.items():
+                phase_rows.append((record["cv_sha256"], key, phase, json.dumps(result, ensure_ascii=False, separators=(",", ":"))))
+            for phase in FLAGGED_PHASES:
+                for flag in (results.get(phase) or {}).get("flags_for_human_review") or []:
+                    flag_rows.append((record["cv_sha256"], key, phase, flag.get("flag_type"), flag.get("message")))
+
+        placeholders = ", ".join("?" for _ in CANDIDATE_COLUMNS)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(f"INSERT OR REPLACE INTO candidates ({', '.join(CANDIDATE_COLUMNS)}) VALUES ({placeholders})", candidate_rows)
+                # A re-run replaces the CV's earlier phase results and flags
+                connection.executemany("DELETE FROM phase_results WHERE cv_sha256 = ? AND job_key = ?", keys)
+                connection.executemany("DELETE FROM flags WHERE cv_sha256 = ? AND job_key = ?", keys)
+                connection.executemany("INSERT INTO phase_results (cv_sha256, job_key, phase, result) VALUES (?, ?, ?, ?)", phase_rows)
+                connection.executemany("INSERT INTO flags (cv_sha256, job_key, phase, flag_type, message) VALUES (?, ?, ?, ?, ?)", flag_rows)
+        return len(candidate_rows)
+
+    def save_candidate(self, candidate_id, cv_sha256, job_description, results, **fields):
+        """Insert or replace one candidate (see save_candidates)"""
+        return self.save_candidates([dict(fields, candidate_id=candidate_id, cv_sha256=cv_sha256, job_description=job_description, results=results)])
+
+    def update_candidate(self, cv_sha256, job_description, **fields):
+        """Set CANDIDATE_COLUMNS of a stored row (e.g. the final report's average_score); False if there is no row"""
+        unknown = set(fields) - set(CANDIDATE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown candidate columns: {', '.join(sorted(unknown))}")
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                cursor = connection.execute(f"UPDATE candidates SET {assignments} WHERE cv_sha256 = ? AND job_key = ?",
+                                            list(fields.values()) + [cv_sha256, job_key(job_description)])
+        return cursor.rowcount > 0
+
+    def get_results(self, cv_sha256, job_description):
+        """Return {phase: result} stored for a CV and job"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT phase, result FROM phase_results WHERE cv_sha256 = ? AND job_key = ?",
+                (cv_sha256, job_key(job_description))
+            ).fetchall()
+        return {row["phase"]: json.loads(row["result"]) for row in rows}
+
+    def get_candidate(self, cv_sha256, job_description):
+        """Return the candidate row of a CV for a job, or None"""
+        rows = self.query(job_description=job_description, cv_sha256s=[cv_sha256])
+        return rows[0] if rows else None
+
+    def query(self, job_description=None, min_screening_score=None, min_assessment_score=None, max_jlpt_level=None,
+              flag_type=None, without_flags=False, recommendation=None, candidate_ids=None, cv_sha256s=None, order_by="screening_score", limit=None):
+        """Return candidate rows matching every given filter, best first
+
+        max_jlpt_level="N2" matches N1, N2 and native speakers; flag_type matches
+        candidates with at least one review flag of that type.
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by} (expected one of {', '.join(sorted(ORDER_COLUMNS))})")
+        if (candidate_ids is not None and not candidate_ids) or (cv_sha256s is not None and not cv_sha256s):
+            return []
+        conditions, parameters = [], []
+        if job_description is not None:
+            conditions.append("job_key = ?")
+            parameters.append(job_key(job_description))
+        if min_screening_score is not None:
+            conditions.append("screening_score >= ?")
+            parameters.append(min_screening_score)
+        if min_assessment_score is not None:
+            conditions.append("assessment_score >= ?")
+            parameters.append(min_assessment_score)
+        if max_jlpt_level is not None:
+            conditions.append("jlpt_level <= ?")
+            parameters.append(parse_jlpt(max_jlpt_level))
+        if recommendation is not None:
+            conditions.append("recommendation = ?")
+            parameters.append(recommendation)
+        if flag_type is not None:
+            conditions.append("EXISTS (SELECT 1 FROM flags WHERE flags.flag_type = ? AND flags.cv_sha256 = candidates.cv_sha256 AND flags.job_key = candidates.job_key)")
+            parameters.append(flag_type)
+        if without_flags:
+            conditions.append("flag_count = 0")
+        if candidate_ids is not None:
+            conditions.append(f"candidate_id IN ({', '.join('?' for _ in candidate_ids)})")
+            parameters.extend(candidate_ids)
+        if cv_sha256s is not None:
+            conditions.append(f"cv_sha256 IN ({', '.join('?' for _ in cv_sha256s)})")
+            parameters.extend(cv_sha256s)
+
+        sql = f"SELECT {', '.join(CANDIDATE_COLUMNS)} FROM candidates"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        direction = "ASC" if order_by == "candidate_id" else "DESC"
+        sql += f" ORDER BY {order_by} IS NULL, {order_by} {direction}, candidate_id, cv_sha256"
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        with self._lock:
+            rows = self._connect().execute(sql, parameters).fetchall()
+        return [dict(row) for row in rows]
+
+# Process-wide store, opened lazily so importing this module never touches the disk
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_shared_store():
+    """Return the process-wide ResultsStore"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ResultsStore()
+        return _shared_store
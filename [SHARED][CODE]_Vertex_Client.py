@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Shared Vertex AI Client Pool - used by every phase module
+Initializes credentials once per process and keeps warm GenerativeModel handles
+"""
+
+import os
+import re
+import time
+import asyncio
+import hashlib
+import datetime
+import threading
+import itertools
+from collections import namedtuple
+
+# Repository files are loaded by file name through module_loader.py
+import module_loader
+
+# On-disk response cache wrapped around every generate_content call
+response_cache = module_loader.load_module("[SHARED][CODE]_Response_Cache.py", "response_cache")
+
+# Rate-limit aware scheduler (RPM/TPM budgets, retries with backoff) for every request
+request_scheduler = module_loader.load_module("[SHARED][CODE]_Request_Scheduler.py", "request_scheduler")
+
+# Per-call latency, token usage, retry and cost records
+call_metrics = module_loader.load_module("[SHARED][CODE]_Call_Metrics.py", "call_metrics")
+
+# Named thinking budget / output limit / temperature profiles merged into every generation_config
+generation_profiles = module_loader.load_module("[SHARED][CODE]_Generation_Profiles.py", "generation_profiles")
+
+# Vertex AI configuration
+KEY_PATH = os.path.join("key", "vertex-minmavn-94ace6513e6e.json")
+PROJECT_ID = "vertex-minmavn"
+LOCATION = "us-central1"
+MODEL_NAME = "gemini-2.5-pro"
+
+# Context caching for large static system prompts. Prompts below the service
+# minimum are sent as a plain system_instruction on the warm model instead.
+CONTEXT_CACHE_ENABLED = os.environ.get("HR_CONTEXT_CACHE", "1").lower() not in ("0", "false", "no")
+CONTEXT_CACHE_MIN_TOKENS = 2048
+CONTEXT_CACHE_TTL_SECONDS = 3600
+
+# Process-wide client state (guarded by _lock)
+_lock = threading.RLock()
+_initialized = False
+_models = {}
+_model_factory = None
+_stats = {
+    "vertex_init_calls": 0,
+    "model_creations": 0,
+    "model_reuses": 0,
+    "context_caches_created": 0
+}
+
+# Binary input part; converted to a vertexai Part only when a request is sent
+BinaryPart = namedtuple("BinaryPart", ["mime_type", "data"])
+
+# Response served from the response cache (same .text interface as SDK responses)
+CachedResponse = namedtuple("CachedResponse", ["text"])
+
+# Gemini bills each PDF page as an image of roughly this many tokens
+PDF_TOKENS_PER_PAGE = 258
+_PDF_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?!s)")
+
+def estimate_tokens(text):
+    """Rough token estimate (about 4 ASCII characters per token, one per CJK/other character)"""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return max(1, ascii_chars // 4 + len(text) - ascii_chars)
+
+def estimate_part_tokens(part):
+    """Estimate the input tokens of a text or binary content part"""
+    if isinstance(part, str):
+        return estimate_tokens(part)
+    if part.mime_type == "application/pdf":
+        pages = max(1, len(_PDF_PAGE_PATTERN.findall(part.data)))
+        return pages * PDF_TOKENS_PER_PAGE
+    return max(1, len(part.data) // 4)
+
+def estimate_request_tokens(contents, system_prompt=None):
+    """Estimate the input tokens of a request (used for the tokens-per-minute budget)"""
+    total = sum(estimate_part_tokens(part) for part in contents)
+    return total + (estimate_tokens(system_prompt) if system_prompt else 0)
+
+def initialize():
+    """Load service-account credentials and call vertexai.init once per process"""
+    global _initialized
+    if _initialized:
+        return
+    with _lock:
+        if _initialized:
+            return
+        import vertexai
+        from google.oauth2 import service_account
+
+        credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
+        vertexai.init(project=PROJECT_ID, location=LOCATION, credentials=credentials)
+        _stats["vertex_init_calls"] += 1
+        _initialized = True
+
+class VertexModelHandle:
+    """Warm Vertex AI model with its system prompt registered once"""
+
+    def __init__(self, model, expires_at=None):
+        self.model = model
+        self.expires_at = expires_at
+
+    def generate_content(self, contents, generation_config=None, stream=False):
+        """Send only the per-call contents; the system prompt lives on the model"""
+        return self.model.generate_content(_to_sdk_contents(contents), generation_config=generation_config, stream=stream)
+
+    async def generate_content_async(self, contents, generation_config=None, stream=False):
+        """Async SDK generation (the async client is bound to the first event loop that uses it)"""
+        return await self.model.generate_content_async(_to_sdk_contents(contents), generation_config=generation_config, stream=stream)
+
+def _create_vertex_model(model_name, system_prompt):
+    """Build a model whose system prompt is a cached context or system_instruction"""
+    initialize()
+    if system_prompt and CONTEXT_CACHE_ENABLED and estimate_tokens(system_prompt) >= CONTEXT_CACHE_MIN_TOKENS:
+        try:
+            from vertexai.preview import caching
+            from vertexai.preview.generative_models import GenerativeModel as PreviewGenerativeModel
+
+            cached_content = caching.CachedContent.create(
+                model_name=model_name,
+                system_instruction=system_prompt,
+                ttl=datetime.timedelta(seconds=CONTEXT_CACHE_TTL_SECONDS)
+            )
+            _stats["context_caches_created"] += 1
+            # Refresh the handle a little before the cached context expires
+            expires_at = time.time() + CONTEXT_CACHE_TTL_SECONDS - 60
+            return VertexModelHandle(PreviewGenerativeModel.from_cached_content(cached_content=cached_content), expires_at)
+        except Exception as e:
+            print(f"⚠️  Context cache unavailable for {model_name}, using system_instruction: {e}")
+
+    from vertexai.generative_models import GenerativeModel
+
+    return VertexModelHandle(GenerativeModel(model_name, system_instruction=system_prompt))
+
+def set_model_factory(factory):
+    """Swap the model backend (factory(model_name, system_prompt) -> model); None restores Vertex AI"""
+    global _model_factory
+    with _lock:
+        _model_factory = factory
+        _models.clear()
+
+def _model_key(model_name, system_prompt):
+    """Build the pool key for a (model, system prompt) pair"""
+    prompt_hash = hashlib.sha256((system_prompt or "").encode("utf-8")).hexdigest()
+    return (model_name, prompt_hash)
+
+def get_model(model_name=MODEL_NAME, system_prompt=None):
+    """Return a warm model handle for (model, system prompt)"""
+    key = _model_key(model_name, system_prompt)
+    with _lock:
+        model = _models.get(key)
+        expires_at = getattr(model, "expires_at", None)
+        if model is not None and (expires_at is None or expires_at > time.time()):
+            _stats["model_reuses"] += 1
+            return model
+
+        factory = _model_factory or _create_vertex_model
+        model = factory(model_name, system_prompt)
+        _models[key] = model
+        _stats["model_creations"] += 1
+        return model
+
+def make_pdf_part(pdf_data):
+    """Wrap raw PDF bytes as a content part"""
+    return BinaryPart("application/pdf", pdf_data)
+
+def _to_sdk_contents(contents):
+    """Convert text and BinaryPart inputs into vertexai content parts"""
+    from vertexai.generative_models import Part
+
+    return [part if isinstance(part, str) else Part.from_data(data=part.data, mime_type=part.mime_type) for part in contents]
+
+def generate_content(contents, model_name=MODEL_NAME, system_prompt=None, generation_config=None, use_cache=True, phase=None, cache_if=None):
+    """Generate content through the warm model pool and the response cache
+
+    A request whose model, system prompt, contents and generation_config are unchanged
+    is served from the response cache instead of calling Vertex AI (use_cache=False skips it).
+    A fresh response is only written to the cache when cache_if(text) is true (when given).
+    Every call (including cache hits and failures) is recorded in call_metrics under phase.
+    The active generation profile's settings for phase are merged into generation_config.
+    """
+    started = time.perf_counter()
+    generation_config = generation_profiles.apply(generation_config, phase)
+    cache_key = None
+    if use_cache:
+        cache_key = response_cache.make_cache_key(model_name, system_prompt, contents, generation_config)
+        cached_text = response_cache.shared_cache.get(cache_key)
+        if cached_text is not None:
+            call_metrics.record_call(model_name, time.perf_counter() - started, phase, cache_hit=True)
+            return CachedResponse(cached_text)
+
+    model = get_model(model_name, system_prompt)
+    call_stats = {}
+    try:
+        response = request_scheduler.shared_scheduler.execute(
+            lambda: model.generate_content(contents, generation_config=generation_config),
+            estimate_request_tokens(contents, system_prompt),
+            call_stats
+        )
+    except Exception as e:
+        call_metrics.record_call(model_name, time.perf_counter() - started, phase, call_stats=call_stats, error=e)
+        raise
+
+    # Non-streaming SDK responses carry no first-token time (wall time is recorded); the local stand-in reports one
+    call_metrics.record_call(model_name, time.perf_counter() - started, phase, getattr(response, "usage_metadata", None),
+                             getattr(response, "time_to_first_token", None), call_stats)
+
+    if cache_key is not None and (cache_if is None or cache_if(response.text)):
+        response_cache.shared_cache.put(cache_key, response.text, model_name)
+    return response
+
+def generate_content_stream(contents, model_name=MODEL_NAME, system_prompt=None, generation_config=None, use_cache=True, phase=None):
+    """Yield response text chunks as they are generated (cache hits yield one chunk)"""
+    started = time.perf_counter()
+    generation_config = generation_profiles.apply(generation_config, phase)
+    cache_key = None
+    if use_cache:
+        cache_key = response_cache.make_cache_key(model_name, system_prompt, contents, generation_config)
+        cached_text = response_cache.shared_cache.get(cache_key)
+        if cached_text is not None:
+            call_metrics.record_call(model_name, time.perf_counter() - started, phase, cache_hit=True, streamed=True)
+            yield cached_text
+            return
+
+    model = get_model(model_name, system_prompt)
+
+    def start_stream():
+        """Open the stream and wait for the first chunk (errors surface here and are retried)"""
+        iterator = iter(model.generate_content(contents, generation_config=generation_config, stream=True))
+        return next(iterator, None), iterator
+
+    call_stats = {}
+    try:
+        first_response, iterator = request_scheduler.shared_scheduler.execute(start_stream, estimate_request_tokens(contents, system_prompt), call_stats)
+    except Exception as e:
+        call_metrics.record_call(model_name, time.perf_counter() - started, phase, call_stats=call_stats, error=e, streamed=True)
+        raise
+    time_to_first_token = time.perf_counter() - started
+
+    chunks = []
+    usage = None
+    for response in itertools.chain([first_response] if first_response is not None else [], iterator):
+        # The final chunk carries the complete usage_metadata
+        usage = getattr(response, "usage_metadata", None) or usage
+        chunks.append(response.text)
+        yield response.text
+
+    call_metrics.record_call(model_name, time.perf_counter() - started, phase, usage, time_to_first_token, call_stats, streamed=True)
+
+    if cache_key is not None:
+        response_cache.shared_cache.put(cache_key, "".join(chunks), model_name)
+
+async def _generate_with(model, contents, generation_config, stream=False):
+    """Await a model's async generation; models without one run their blocking call in a worker thread"""
+    if hasattr(model, "generate_content_async"):
+        return await model.generate_content_async(contents, generation_config=generation_config, stream=stream)
+    return await asyncio.to_thread(model.generate_content, contents, generation_config=generation_config, stream=stream)
+
+async def _next_chunk(stream):
+    """Next chunk of an async stream, or of a blocking iterator (pulled in a worker thread); None at the end"""
+    if hasattr(stream, "__anext__"):
+        return await anext(stream, None)
+    return await asyncio.to_thread(next, stream, None)
+
+async def generate_content_async(contents, model_name=MODEL_NAME, system_prompt=None, generation_config=None, use_cache=True, phase=None, cache_if=None):
+    """generate_content for coroutines: throttling, retries and the request itself never block the event loop"""
+    started = time.perf_counter()
+    generation_config = generation_profiles.apply(generation_config, phase)
+    cache_key = None
+    if use_cache:
+        cache_key = response_cache.make_cache_key(model_name, system_prompt, contents, generation_config)
+        cached_text = response_cache.shared_cache.get(cache_key)
+        if cached_text is not None:
+            call_metrics.record_call(model_name, time.perf_counter() - started, phase, cache_hit=True)
+            return CachedResponse(cached_text)
+
+    model = get_model(model_name, system_prompt)
+    call_stats = {}
+    try:
+        response = await request_scheduler.shared_scheduler.execute_async(
+            lambda: _generate_with(model, contents, generation_config),
+            estimate_request_tokens(contents, system_prompt),
+            call_stats
+        )
+    except Exception as e:
+        call_metrics.record_call(model_name, time.perf_counter() - started, phase, call_stats=call_stats, error=e)
+        raise
+
+    call_metrics.record_call(model_name, time.perf_counter() - started, phase, getattr(response, "usage_metadata", None),
+                             getattr(response, "time_to_first_token", None), call_stats)
+
+    if cache_key is not None and (cache_if is None or cache_if(response.text)):
+        response_cache.shared_cache.put(cache_key, response.text, model_name)
+    return response
+
+async def generate_content_stream_async(contents, model_name=MODEL_NAME, system_prompt=None, generation_config=None, use_cache=True, phase=None):
+    """Async generator of response text chunks (see generate_content_stream)"""
+    started = time.perf_counter()
+    generation_config = generation_profiles.apply(generation_config, phase)
+    cache_key = None
+    if use_cache:
+        cache_key = response_cache.make_cache_key(model_name, system_prompt, contents, generation_config)
+        cached_text = response_cache.shared_cache.get(cache_key)
+        if cached_text is not None:
+            call_metrics.record_call(model_name, time.perf_counter() - started, phase, cache_hit=True, streamed=True)
+            yield cached_text
+            return
+
+    model = get_model(model_name, system_prompt)
+
+    async def start_stream():
+        """Open the stream and wait for the first chunk (errors surface here and are retried)"""
+        stream = await _generate_with(model, contents, generation_config, stream=True)
+        stream = stream if hasattr(stream, "__anext__") else iter(stream)
+        return await _next_chunk(stream), stream
+
+    call_stats = {}
+    try:
+        first_response, stream = await request_scheduler.shared_scheduler.execute_async(start_stream, estimate_request_tokens(contents, system_prompt), call_stats)
+    except Exception as e:
+        call_metrics.record_call(model_name, time.perf_counter() - started, phase, call_stats=call_stats, error=e, streamed=True)
+        raise
+    time_to_first_token = time.perf_counter() - started
+
+    chunks = []
+    usage = None
+    response = first_response
+    while response is not None:
+        # The final chunk carries the complete usage_metadata
+        usage = getattr(response, "usage_metadata", None) or usage
+        chunks.append(response.text)
+        yield response.text
+        response = await _next_chunk(stream)
+
+    call_metrics.record_call(model_name, time.perf_counter() - started, phase, usage, time_to_first_token, call_stats, streamed=True)
+
+    if cache_key is not None:
+        response_cache.shared_cache.put(cache_key, "".join(chunks), model_name)
+
+def get_stats():
+    """Return a snapshot of client pool counters"""
+    with _lock:
+        stats = dict(_stats)
+        stats["warm_models"] = len(_models)
+    return stats
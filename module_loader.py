@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Module Loader - imports repository files whose names cannot appear in an import statement
+Entry points sit next to this file, so `import module_loader` works from any of them without a bootstrap
+"""
+
+import os
+import sys
+import importlib.util
+
+# Repository root: relative file names are resolved here, not against the working directory
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_module(file_name, module_name):
+    """Import a repository file once per process and register it in sys.modules as module_name"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    file_path = os.path.join(REPO_DIR, file_name)
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load module from {file_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        # A half-initialized module must not be served to the next caller
+        sys.modules.pop(module_name, None)
+        raise
+    return module
@@ -0,0 +1,42 @@
+"""
+Shared pytest setup - isolates on-disk state and registers the repository module loader
+Repository files have bracketed names, so tests load them with module_loader.load_module
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Caches, indexes and run directories go to a throwaway directory, never the working tree
+_STATE_DIR = tempfile.mkdtemp(prefix="hr_tests_")
+os.environ.setdefault("HR_CACHE_DIR", os.path.join(_STATE_DIR, "gemini_cache"))
+os.environ.setdefault("HR_ARTIFACT_DIR", os.path.join(_STATE_DIR, "artifacts"))
+os.environ.setdefault("HR_DUPLICATE_INDEX", os.path.join(_STATE_DIR, "cv_fingerprints.sqlite3"))
+os.environ.setdefault("HR_RESULTS_STORE", os.path.join(_STATE_DIR, "results.sqlite3"))
+os.environ.setdefault("HR_RUNS_ROOT", os.path.join(_STATE_DIR, "Output"))
+os.environ.setdefault("HR_CONTEXT_CACHE", "0")
+# The offline backend has no quota; the shared rate limiter would only add sleeps across tests
+os.environ.setdefault("HR_VERTEX_RPM", "100000")
+
+# module_loader.py lives at the repository root, next to the entry points
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+import module_loader
+
+
+@pytest.fixture
+def local_backend():
+    """Serve every model call from the offline Gemini stand-in (no latency, response cache off)"""
+    vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+    local_gemini = module_loader.load_module("[SHARED][CODE]_Local_Gemini.py", "local_gemini")
+    backend = local_gemini.LocalGeminiBackend(simulate_latency=False, responder=local_gemini.schema_responder)
+    vertex_client.response_cache.configure(enabled=False)
+    vertex_client.set_model_factory(backend)
+    yield backend
+    vertex_client.set_model_factory(None)
+    vertex_client.response_cache.configure(enabled=True)
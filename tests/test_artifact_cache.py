@@ -0,0 +1,84 @@
+"""Versioned artifact cache: version tagging, invalidation and single builds across threads and event loops"""
+
+import asyncio
+import threading
+
+import module_loader
+
+artifact_cache = module_loader.load_module("[SHARED][CODE]_Artifact_Cache.py", "artifact_cache")
+
+
+def test_artifact_built_by_another_version_is_never_served(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path))
+    cache.put("checklist", "engineer", ["v1 item"], "v1")
+
+    reopened = artifact_cache.ArtifactCache(str(tmp_path))
+    assert reopened.get("checklist", "engineer", "v1") == ["v1 item"]
+    assert reopened.get("checklist", "engineer", "v2") is None
+    # The stale entry was removed, so even its own version no longer finds it
+    assert reopened.get("checklist", "engineer", "v1") is None
+    assert reopened.get_stats()["stale"] == 1
+
+
+def test_get_or_build_rebuilds_on_a_version_change_and_skips_none(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path))
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        return value
+
+    assert cache.get_or_build("checklist", "engineer", "v1", lambda: build("one")) == "one"
+    assert cache.get_or_build("checklist", "engineer", "v1", lambda: build("again")) == "one"
+    assert cache.get_or_build("checklist", "engineer", "v2", lambda: build("two")) == "two"
+    assert cache.get_or_build("checklist", "empty", "v1", lambda: build(None)) is None
+    assert cache.get("checklist", "empty", "v1") is None
+    assert builds == ["one", "two", None]
+
+
+def test_invalidate_keeps_only_the_current_version(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path))
+    cache.put("checklist", "old", 1, "v1")
+    cache.put("checklist", "current", 2, "v2")
+    cache.put("other", "old", 3, "v1")
+
+    assert artifact_cache.ArtifactCache(str(tmp_path)).invalidate("checklist", keep_version="v2") == 1
+    assert cache.invalidate("checklist", keep_version="v2") == 1
+    assert artifact_cache.ArtifactCache(str(tmp_path)).get("checklist", "current", "v2") == 2
+    assert artifact_cache.ArtifactCache(str(tmp_path)).get("other", "old", "v1") == 3
+
+
+def test_concurrent_threads_build_once(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path))
+    started = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.wait(1)
+        return "value"
+
+    threads = [threading.Thread(target=cache.get_or_build, args=("checklist", "engineer", "v1", build)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+
+
+def test_async_builds_are_single_per_loop_and_work_on_every_loop(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path))
+    builds = []
+
+    async def contended(version):
+        async def build():
+            builds.append(version)
+            await asyncio.sleep(0.01)
+            return version
+        return await asyncio.gather(*(cache.get_or_build_async("checklist", "engineer", version, build) for _ in range(3)))
+
+    # Each asyncio.run is a new event loop; the same artifact key is contended on both
+    assert asyncio.run(contended("v1")) == ["v1"] * 3
+    assert asyncio.run(contended("v2")) == ["v2"] * 3
+    assert builds == ["v1", "v2"]
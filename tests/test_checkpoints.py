@@ -0,0 +1,80 @@
+"""Phase checkpoints: input digests, reuse/recompute decisions and pipeline resume"""
+
+import os
+
+import module_loader
+
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+checkpoints = master.checkpoints
+
+
+def test_digest_is_canonical_for_json_values_and_raw_for_bytes():
+    assert checkpoints.digest({"a": 1, "b": [2, 3]}) == checkpoints.digest({"b": [2, 3], "a": 1})
+    assert checkpoints.digest({"a": 1}) != checkpoints.digest({"a": "1"})
+    assert checkpoints.digest(b"pdf") == checkpoints.digest(b"pdf")
+
+
+def write_phase(output_dir, inputs):
+    """A completed phase with one output file and its manifest"""
+    output = os.path.join(output_dir, "out.json")
+    with open(output, "w", encoding="utf-8") as f:
+        f.write('{"score": 80}')
+    checkpoints.write_manifest(output_dir, "phase_1", inputs, {"phase_1": output}, {"prescreen": None}, "run1")
+    return output
+
+
+def test_check_reuses_only_unchanged_inputs_with_intact_outputs(tmp_path):
+    output_dir = str(tmp_path)
+    inputs = {"phase_0": "aaa", "job_description": "bbb"}
+    assert checkpoints.check(output_dir, "phase_1", inputs) == (None, "no checkpoint")
+
+    output = write_phase(output_dir, inputs)
+    manifest, reason = checkpoints.check(output_dir, "phase_1", dict(inputs))
+    assert reason is None and manifest["run_id"] == "run1" and manifest["state"] == {"prescreen": None}
+
+    assert checkpoints.check(output_dir, "phase_1", dict(inputs, job_description="ccc")) == (None, "changed: job_description")
+    assert checkpoints.check(output_dir, "phase_1", dict(inputs, model="x"))[1] == "changed: model"
+
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(" ")
+    assert checkpoints.check(output_dir, "phase_1", inputs) == (None, "output out.json missing or modified")
+    os.remove(output)
+    assert checkpoints.check(output_dir, "phase_1", inputs) == (None, "output out.json missing or modified")
+
+
+def test_unreadable_or_older_manifests_are_ignored(tmp_path, monkeypatch):
+    output_dir = str(tmp_path)
+    write_phase(output_dir, {"a": "1"})
+    monkeypatch.setattr(checkpoints, "MANIFEST_VERSION", checkpoints.MANIFEST_VERSION + 1)
+    assert checkpoints.check(output_dir, "phase_1", {"a": "1"}) == (None, "no checkpoint")
+    monkeypatch.undo()
+
+    with open(checkpoints.manifest_path(output_dir, "phase_1"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert checkpoints.load_manifest(output_dir, "phase_1") is None
+
+
+def test_pipeline_resumes_unchanged_phases_and_recomputes_dependents(tmp_path, local_backend):
+    cv_file = tmp_path / "cv.pdf"
+    cv_file.write_bytes(b"%PDF-1.4 candidate")
+
+    def run(job_description, **options):
+        pipeline = master.HRAutomationPipeline(str(cv_file), job_description, output_dir=str(tmp_path / "run"), deduplicate=False,
+                                               store_results=False, **options)
+        assert pipeline.run_complete_pipeline()
+        return pipeline, local_backend.stats["calls"]
+
+    _, calls = run("SE")
+    pipeline, after_rerun = run("SE")
+    assert after_rerun == calls
+    assert {status["status"] for status in pipeline.checkpoint_status.values()} == {"reused"}
+
+    # A new job description changes Phase 1 and therefore Phase 3; Phases 0 and 2 are reused
+    pipeline, _ = run("QA")
+    status = {key: value["status"] for key, value in pipeline.checkpoint_status.items()}
+    assert status["phase_0"] == status["phase_2"] == "reused"
+    assert status["phase_1"] == status["phase_3"] == "recomputed"
+    assert "job_description" in pipeline.checkpoint_status["phase_1"]["reason"]
+
+    pipeline, _ = run("QA", resume=False)
+    assert {status["status"] for status in pipeline.checkpoint_status.values()} == {"recomputed"}
@@ -0,0 +1,154 @@
+"""Duplicate CV index: MinHash similarity, exact/near matches and reuse of stored extractions under unchanged Phase 0 inputs"""
+
+import os
+import json
+import hashlib
+
+import pytest
+
+import module_loader
+
+duplicate_index = module_loader.load_module("[SHARED][CODE]_Duplicate_Index.py", "duplicate_index")
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+
+CV_TEXT = """Nguyen Van A - Software Engineer. 5 years of Python and Django at an e-commerce company in Hanoi.
+Built payment APIs, led code reviews, mentored two junior developers. JLPT N2. Bachelor of Computer Science, HUST 2018."""
+INPUTS = "phase0-inputs-v1"
+
+
+def text_fingerprint(text):
+    """Fingerprint of a CV given as text (no PDF backend needed)"""
+    return {"sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(), "signature": duplicate_index.minhash_signature(text)}
+
+
+def test_normalization_ignores_case_width_and_punctuation():
+    assert duplicate_index.normalize_text("Ｐｙｔｈｏｎ, Django!") == duplicate_index.normalize_text("python django")
+
+
+def test_signature_similarity_tracks_text_overlap():
+    same = duplicate_index.minhash_signature(CV_TEXT.upper().replace(".", " ."))
+    edited = duplicate_index.minhash_signature(CV_TEXT.replace("two junior", "three junior"))
+    other = duplicate_index.minhash_signature("Tran Thi B - Accountant with 10 years of tax and audit experience in Osaka.")
+    signature = duplicate_index.minhash_signature(CV_TEXT)
+    assert duplicate_index.estimate_similarity(signature, same) == 1.0
+    assert duplicate_index.estimate_similarity(signature, edited) >= 0.9
+    assert duplicate_index.estimate_similarity(signature, other) < 0.2
+    assert duplicate_index.minhash_signature("  ...  ") is None
+
+
+def test_exact_and_near_matches_return_the_stored_extraction(tmp_path):
+    index = duplicate_index.DuplicateIndex(str(tmp_path / "index.sqlite3"))
+    original = text_fingerprint(CV_TEXT)
+    index.add(original, "a/resume.pdf", "Output/resume/out.json", {"name": "A"}, INPUTS)
+
+    exact = index.find(original, INPUTS)
+    assert exact["match"] == "exact" and json.loads(exact["phase0_result"]) == {"name": "A"}
+
+    near = index.find(text_fingerprint(CV_TEXT.replace("two junior", "three junior")), INPUTS)
+    assert near["match"] == "near" and near["similarity"] >= index.threshold
+    assert json.loads(near["phase0_result"]) == {"name": "A"}
+
+    assert index.find(text_fingerprint("Completely different candidate text about marine biology research."), INPUTS) is None
+    assert index.get_stats() == {"lookups": 3, "exact_matches": 1, "near_matches": 1, "added": 1}
+
+
+def test_extractions_match_only_under_the_inputs_that_produced_them(tmp_path):
+    index = duplicate_index.DuplicateIndex(str(tmp_path / "index.sqlite3"))
+    fingerprint = text_fingerprint(CV_TEXT)
+    index.add(fingerprint, "a.pdf", "a.json", {"name": "old prompt"}, INPUTS)
+    assert index.find(fingerprint, "phase0-inputs-v2") is None
+    assert index.find(text_fingerprint(CV_TEXT.replace("two junior", "three junior")), "phase0-inputs-v2") is None
+
+    # The extraction under the new inputs replaces the stale one
+    index.add(fingerprint, "a.pdf", "a.json", {"name": "new prompt"}, "phase0-inputs-v2")
+    assert json.loads(index.find(fingerprint, "phase0-inputs-v2")["phase0_result"]) == {"name": "new prompt"}
+    assert index.find(fingerprint, INPUTS) is None
+
+
+def test_first_indexed_extraction_is_kept(tmp_path):
+    index = duplicate_index.DuplicateIndex(str(tmp_path / "index.sqlite3"))
+    fingerprint = text_fingerprint(CV_TEXT)
+    index.add(fingerprint, "a.pdf", "a.json", {"name": "first"}, INPUTS)
+    index.add(fingerprint, "b.pdf", "b.json", {"name": "second"}, INPUTS)
+    assert json.loads(index.find(fingerprint, INPUTS)["phase0_result"]) == {"name": "first"}
+
+
+def test_rows_from_older_indexes_are_refilled(tmp_path):
+    path = str(tmp_path / "index.sqlite3")
+    index = duplicate_index.DuplicateIndex(path)
+    fingerprint = text_fingerprint(CV_TEXT)
+    index.add(fingerprint, "a.pdf", "a.json", {"name": "A"}, INPUTS)
+    index._connect().execute("UPDATE cvs SET phase0_result = NULL, phase0_inputs = NULL")
+    index._connect().commit()
+
+    assert index.find(fingerprint, INPUTS) is None
+    index.add(fingerprint, "a.pdf", "a.json", {"name": "A again"}, INPUTS)
+    assert json.loads(index.find(fingerprint, INPUTS)["phase0_result"]) == {"name": "A again"}
+
+
+@pytest.fixture
+def extraction_backend(tmp_path, monkeypatch, local_backend):
+    """Local backend that names each candidate after the CV's bytes, with a fresh duplicate index; counts Phase 0 calls"""
+    local_gemini = module_loader.load_module("[SHARED][CODE]_Local_Gemini.py", "local_gemini")
+    phase0_calls = []
+
+    def responder(model_name, system_prompt, contents, generation_config):
+        result = local_gemini.sample_from_schema(generation_config["response_schema"])
+        if "candidate_info" in result:
+            phase0_calls.append(model_name)
+            pdf_part = next(part for part in contents if not isinstance(part, str))
+            result["candidate_info"]["personal_details"]["name"] = hashlib.sha256(pdf_part.data).hexdigest()[:8]
+        return json.dumps(result)
+
+    local_backend.responder = responder
+    monkeypatch.setattr(duplicate_index, "_shared_index", duplicate_index.DuplicateIndex(str(tmp_path / "index.sqlite3")))
+    monkeypatch.setattr(master.phase0_module.pdf_preprocessor, "TEXT_LAYER_ENABLED", False)
+    monkeypatch.setattr(master.phase0_module, "CHUNKING_ENABLED", False)
+    return phase0_calls
+
+
+def write_cv(tmp_path, directory, content):
+    os.makedirs(tmp_path / directory, exist_ok=True)
+    path = str(tmp_path / directory / "resume.pdf")
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4 " + content)
+    return path
+
+
+def extract(cv_file, output_dir, **options):
+    pipeline = master.HRAutomationPipeline(cv_file, "SE", output_dir=str(output_dir), store_results=False, **options)
+    pipeline.run_complete_pipeline()
+    return pipeline
+
+
+def test_duplicate_reuses_its_own_extraction_after_the_run_directory_is_overwritten(tmp_path, extraction_backend):
+    # Every CV is named resume.pdf and runs in the same directory
+    first = extract(write_cv(tmp_path, "a", b"candidate one"), tmp_path / "runs" / "resume")
+    extract(write_cv(tmp_path, "b", b"candidate two"), tmp_path / "runs" / "resume")
+    duplicate = extract(write_cv(tmp_path, "c", b"candidate one"), tmp_path / "runs" / "resume")
+
+    assert len(extraction_backend) == 2
+    assert duplicate.duplicate_of["cv_file"].endswith(os.path.join("a", "resume.pdf"))
+    assert "phase0_result" not in duplicate.duplicate_of
+    assert duplicate.results["phase_0"] == first.results["phase_0"]
+
+
+def test_duplicates_are_extracted_again_after_a_prompt_change_or_without_resume(tmp_path, monkeypatch, extraction_backend):
+    cv_file = write_cv(tmp_path, "a", b"candidate one")
+    extract(cv_file, tmp_path / "runs" / "a")
+    assert extract(write_cv(tmp_path, "b", b"candidate one"), tmp_path / "runs" / "b").duplicate_of
+    assert len(extraction_backend) == 1
+
+    # A new Phase 0 prompt makes every stored extraction stale
+    monkeypatch.setattr(master.phase0_module.load(), "SYSTEM_PROMPT", master.phase0_module.SYSTEM_PROMPT + "\nList certifications separately.")
+    changed = extract(write_cv(tmp_path, "c", b"candidate one"), tmp_path / "runs" / "c")
+    assert changed.duplicate_of is None and len(extraction_backend) == 2
+
+    # The index now holds an extraction under the new prompt, but an invalidated checkpoint or --no-resume re-extracts
+    invalidated = extract(cv_file, tmp_path / "runs" / "a")
+    assert invalidated.checkpoint_status["phase_0"]["reason"] == "changed: prompt"
+    assert invalidated.duplicate_of is None and len(extraction_backend) == 3
+    assert extract(write_cv(tmp_path, "d", b"candidate one"), tmp_path / "runs" / "d", resume=False).duplicate_of is None
+    assert len(extraction_backend) == 4
+    assert extract(write_cv(tmp_path, "e", b"candidate one"), tmp_path / "runs" / "e").duplicate_of
+    assert len(extraction_backend) == 4
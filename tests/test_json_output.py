@@ -0,0 +1,81 @@
+"""Structured output helpers: the incremental streamed-JSON parser and section streaming"""
+
+import json
+import asyncio
+
+import pytest
+
+import module_loader
+
+json_output = module_loader.load_module("[SHARED][CODE]_JSON_Output.py", "json_output")
+
+REPORT = {
+    "candidate": "Nguyen {A}",
+    "quote": "said \"ok, fine\" \\ then left",
+    "culture_fit_summary_report": {"strengths": ["a", "b, c"], "concerns": {"level": "low"}, "score": 7},
+    "scores": [1, {"x": 2}],
+    "final": None
+}
+
+
+def feed_in_chunks(parser, text, size):
+    """Feed text in fixed-size chunks and collect every completed section in order"""
+    completed = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start:start + size]))
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, 10000])
+def test_top_level_sections_are_reported_once_whatever_the_chunking(size):
+    text = "```json\n" + json.dumps(REPORT, indent=2) + "\n```"
+    parser = json_output.IncrementalJSONParser()
+    completed = feed_in_chunks(parser, text, size)
+
+    assert [path for path, _ in completed] == list(REPORT)
+    assert dict(completed) == REPORT
+    assert parser.finished
+    assert parser.result() == REPORT
+
+
+def test_section_is_reported_as_soon_as_it_closes():
+    parser = json_output.IncrementalJSONParser()
+    assert parser.feed('{"first": {"a": [1, 2]}') == []
+    assert parser.feed(', "sec') == [("first", {"a": [1, 2]})]
+    assert parser.feed('ond": "x"}') == [("second", "x")]
+    # Text after the root object is ignored
+    assert parser.feed(' {"third": 3}') == []
+
+
+def test_depth_two_reports_members_of_nested_objects():
+    parser = json_output.IncrementalJSONParser(section_depth=2)
+    completed = feed_in_chunks(parser, json.dumps(REPORT), 5)
+    assert completed == [
+        ("culture_fit_summary_report.strengths", ["a", "b, c"]),
+        ("culture_fit_summary_report.concerns", {"level": "low"}),
+        ("culture_fit_summary_report.score", 7)
+    ]
+
+
+def test_stream_json_sections_writes_progress_and_returns_the_full_text(tmp_path):
+    text = json.dumps(REPORT)
+    progress_file = tmp_path / "progress.json"
+    seen = []
+    chunks = [text[start:start + 8] for start in range(0, len(text), 8)]
+
+    assert json_output.stream_json_sections(chunks, progress_file=str(progress_file), on_section=lambda path, value: seen.append(path)) == text
+    assert seen == list(REPORT)
+    progress = json.loads(progress_file.read_text(encoding="utf-8"))
+    assert progress == {"status": "complete", "sections": REPORT}
+
+
+def test_stream_json_sections_async_matches_the_sync_version():
+    text = json.dumps(REPORT)
+
+    async def chunks():
+        for start in range(0, len(text), 4):
+            yield text[start:start + 4]
+
+    seen = []
+    assert asyncio.run(json_output.stream_json_sections_async(chunks(), on_section=lambda path, value: seen.append(path))) == text
+    assert seen == list(REPORT)
@@ -0,0 +1,77 @@
+"""Tiered model routing: escalation on doubt and what reaches the response cache"""
+
+import json
+import asyncio
+
+import pytest
+
+import module_loader
+
+model_router = module_loader.load_module("[SHARED][CODE]_Model_Router.py", "model_router")
+vertex_client = model_router.vertex_client
+response_cache = vertex_client.response_cache
+
+SCHEMA = {"type": "object", "properties": {"confidence": {"type": "string"}}, "required": ["confidence"]}
+CONFIG = {"response_mime_type": "application/json", "response_schema": SCHEMA}
+
+
+def low_confidence(data):
+    return "low confidence" if data["confidence"] == "low" else None
+
+
+@pytest.fixture
+def routed(local_backend, tmp_path):
+    """Fast tier answers with low confidence, the phase's own model with high confidence; cache in tmp_path"""
+    calls = []
+
+    def responder(model_name, system_prompt, contents, generation_config):
+        calls.append(model_name)
+        return json.dumps({"confidence": "low" if model_name == model_router.FAST_MODEL else "high"})
+
+    local_backend.responder = responder
+    response_cache.configure(enabled=True, cache_dir=str(tmp_path / "cache"))
+    model_router.configure(enabled=True)
+    yield calls
+    response_cache.configure(cache_dir=response_cache.CACHE_DIR)
+
+
+def test_route_ends_with_the_phases_own_model():
+    assert model_router.route_for("phase_0", "gemini-2.5-pro") == [model_router.FAST_MODEL, "gemini-2.5-pro"]
+    assert model_router.route_for("phase_1", "gemini-2.5-pro") == ["gemini-2.5-pro"]
+
+
+def test_rejected_fast_output_escalates_and_is_not_cached(routed):
+    response = model_router.generate_content(["cv text"], "phase_0", "gemini-2.5-pro", generation_config=CONFIG, check=low_confidence)
+    assert json.loads(response.text) == {"confidence": "high"}
+    assert routed == [model_router.FAST_MODEL, "gemini-2.5-pro"]
+    # Only the accepted output was written
+    assert response_cache.shared_cache.get_stats()["writes"] == 1
+
+    fast_key = response_cache.make_cache_key(model_router.FAST_MODEL, None, ["cv text"], vertex_client.generation_profiles.apply(CONFIG, "phase_0"))
+    assert response_cache.shared_cache.get(fast_key) is None
+
+
+def test_accepted_fast_output_is_cached_and_reused(routed, local_backend):
+    def responder(model_name, system_prompt, contents, generation_config):
+        routed.append(model_name)
+        return json.dumps({"confidence": "high"})
+
+    local_backend.responder = responder
+    for _ in range(2):
+        response = asyncio.run(model_router.generate_content_async(["cv text"], "phase_0", "gemini-2.5-pro", generation_config=CONFIG, check=low_confidence))
+        assert json.loads(response.text) == {"confidence": "high"}
+    assert routed == [model_router.FAST_MODEL]
+
+
+def test_fast_tier_error_escalates(routed, local_backend):
+    def responder(model_name, system_prompt, contents, generation_config):
+        if model_name == model_router.FAST_MODEL:
+            raise ValueError("fast tier unavailable")
+        return json.dumps({"confidence": "high"})
+
+    local_backend.responder = responder
+    response = model_router.generate_content(["other cv"], "phase_0", "gemini-2.5-pro", generation_config=CONFIG, check=low_confidence)
+    assert json.loads(response.text) == {"confidence": "high"}
+    decision = model_router.get_decisions()[-1]
+    assert decision["escalated"] and decision["final_model"] == "gemini-2.5-pro"
+    assert decision["attempts"][0]["escalation_reason"].startswith("ValueError")
@@ -0,0 +1,22 @@
+"""Module loader: one import per process, and no half-initialized modules left behind on failure"""
+
+import sys
+
+import pytest
+
+import module_loader
+
+
+def test_modules_load_once_and_failed_imports_are_not_cached(tmp_path):
+    broken = tmp_path / "broken.py"
+    broken.write_text("VALUE = 1\nraise RuntimeError('import failed')\n", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        module_loader.load_module(str(broken), "loader_test_module")
+    assert "loader_test_module" not in sys.modules
+
+    # Absolute paths are used as given; a fixed file loads on the next attempt and is then reused
+    broken.write_text("VALUE = 2\n", encoding="utf-8")
+    module = module_loader.load_module(str(broken), "loader_test_module")
+    assert module.VALUE == 2
+    assert module_loader.load_module(str(broken), "loader_test_module") is module
+    sys.modules.pop("loader_test_module")
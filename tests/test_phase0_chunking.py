@@ -0,0 +1,126 @@
+"""Phase 0 long-CV chunking: page ranges, merging partial extractions and failure handling"""
+
+import json
+import asyncio
+
+import module_loader
+
+phase0 = module_loader.load_module("[PHASE_0][CODE]_CV_Analysis.py", "phase0")
+pdf_preprocessor = phase0.pdf_preprocessor
+
+
+def extraction(candidate_info=None, culture_fit=None, quality=None):
+    """Partial Phase 0 output of one chunk"""
+    return {
+        "candidate_info": candidate_info or {},
+        "minma_culture_fit_indicators": culture_fit or {},
+        "extraction_quality": quality or {"completeness_score": "50", "confidence_level": "high"}
+    }
+
+
+def test_split_page_ranges_covers_every_page_once():
+    assert pdf_preprocessor.split_page_ranges(7, 3) == [(1, 3), (4, 6), (7, 7)]
+    assert pdf_preprocessor.split_page_ranges(6, 3) == [(1, 3), (4, 6)]
+    assert pdf_preprocessor.split_page_ranges(2, 3) == [(1, 2)]
+
+
+def test_scalar_conflicts_keep_the_first_non_empty_value():
+    merged = phase0.merge_extractions([
+        extraction({"personal_details": {"name": "Nguyen Van A", "email": ""}, "photo_url": ""}),
+        extraction({"personal_details": {"name": "Someone Else", "email": "a@example.com"}, "photo_url": "photo.png"})
+    ])
+    assert merged["candidate_info"]["personal_details"] == {"name": "Nguyen Van A", "email": "a@example.com"}
+    assert merged["candidate_info"]["photo_url"] == "photo.png"
+
+
+def test_skill_lists_are_deduplicated_case_and_space_insensitively_in_page_order():
+    merged = phase0.merge_extractions([
+        extraction({"skills": {"technical_skills": ["Python", "Go"], "japanese_proficiency": ""}}),
+        extraction({"skills": {"technical_skills": ["python ", "React", "go"], "japanese_proficiency": "N2"}})
+    ])
+    skills = merged["candidate_info"]["skills"]
+    assert skills["technical_skills"] == ["Python", "Go", "React"]
+    assert skills["soft_skills"] == []
+    assert skills["japanese_proficiency"] == "N2"
+
+
+def test_work_record_split_across_chunks_is_merged_once():
+    job = {"company": "Minma", "position": "Engineer", "start_year": "2020", "start_month": "4"}
+    merged = phase0.merge_extractions([
+        extraction({"work_experience": [dict(job, responsibilities=["API design"]), {"company": "Earlier Co", "position": "Intern"}]}),
+        extraction({"work_experience": [dict(job, end_year="2023", responsibilities=["api design", "Code review"])]})
+    ])
+    work = merged["candidate_info"]["work_experience"]
+    assert [record["company"] for record in work] == ["Minma", "Earlier Co"]
+    assert work[0]["end_year"] == "2023"
+    assert work[0]["responsibilities"] == ["API design", "Code review"]
+
+
+def test_records_without_identifying_fields_are_dropped():
+    merged = phase0.merge_extractions([extraction({"education": [{"school": "", "degree": ""}, {"school": "HUST"}]})])
+    assert merged["candidate_info"]["education"] == [{"school": "HUST"}]
+
+
+def test_quality_reflects_the_whole_cv():
+    merged = phase0.merge_extractions([
+        extraction(quality={"completeness_score": "40", "confidence_level": "high", "missing_information": ["Email", "Photo"]}),
+        extraction(quality={"completeness_score": "70", "confidence_level": "medium", "missing_information": ["photo"]})
+    ])
+    quality = merged["extraction_quality"]
+    # Only information no chunk found is still missing; the weakest chunk bounds confidence
+    assert quality["missing_information"] == ["Photo"]
+    assert quality["confidence_level"] == "medium"
+    assert quality["completeness_score"] == "70"
+
+
+def test_merged_output_follows_the_phase0_schema():
+    merged = phase0.merge_extractions([
+        extraction({"personal_details": {"name": "A"}, "notes": "first"}, {"honesty_values": "high"}),
+        extraction({"notes": "second"}, {"teamwork_style": "collaborative"})
+    ])
+    phase0.json_output.validate_schema(merged, phase0.RESPONSE_SCHEMA)
+    assert merged["candidate_info"]["notes"] == "first second"
+    assert merged["minma_culture_fit_indicators"] == {"honesty_values": "high", "teamwork_style": "collaborative"}
+
+
+def test_async_chunk_failure_cancels_chunks_still_running(monkeypatch):
+    cancelled = []
+
+    async def fake_chunk(pdf_data, first, last, total, use_text_layer):
+        if first == 1:
+            raise RuntimeError("quota exceeded")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(first)
+            raise
+        return extraction()
+
+    monkeypatch.setattr(phase0, "_extract_chunk_async", fake_chunk)
+    result = asyncio.run(asyncio.wait_for(phase0.extract_cv_chunked_async(b"%PDF", [(1, 3), (4, 6), (7, 7)]), 5))
+    assert result is None
+    assert sorted(cancelled) == [4, 7]
+
+
+def test_async_chunks_are_merged_in_page_order(monkeypatch):
+    async def fake_chunk(pdf_data, first, last, total, use_text_layer):
+        # Later pages finish first
+        await asyncio.sleep(0.01 * (10 - first))
+        return extraction({"skills": {"technical_skills": [f"skill-{first}"]}})
+
+    monkeypatch.setattr(phase0, "_extract_chunk_async", fake_chunk)
+    result = json.loads(asyncio.run(phase0.extract_cv_chunked_async(b"%PDF", [(1, 3), (4, 6), (7, 7)])))
+    assert result["candidate_info"]["skills"]["technical_skills"] == ["skill-1", "skill-4", "skill-7"]
+
+
+def test_sync_chunk_failure_skips_chunks_not_yet_started(monkeypatch):
+    started = []
+
+    def fake_chunk(pdf_data, first, last, total, use_text_layer):
+        started.append(first)
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(phase0, "_extract_chunk", fake_chunk)
+    monkeypatch.setattr(phase0, "MAX_CHUNK_WORKERS", 1)
+    assert phase0.extract_cv_chunked(b"%PDF", [(1, 3), (4, 6), (7, 9), (10, 10)]) is None
+    assert started == [1]
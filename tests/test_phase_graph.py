@@ -0,0 +1,143 @@
+"""Phase DAG scheduler: dependency order, concurrency bound, failure propagation and the critical path"""
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+import module_loader
+
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+
+
+class PhaseRecorder:
+    """Stands in for run_single_phase: records start/end order and the number of phases running at once"""
+
+    def __init__(self, failing=(), seconds=0.02):
+        self.failing = set(failing)
+        self.seconds = seconds
+        self.events = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def start(self, phase):
+        with self._lock:
+            self.events.append(("start", phase["key"]))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def end(self, phase):
+        with self._lock:
+            self.events.append(("end", phase["key"]))
+            self.running -= 1
+        return phase["key"] not in self.failing
+
+    def run(self, phase):
+        self.start(phase)
+        time.sleep(self.seconds)
+        return self.end(phase)
+
+    async def run_async(self, phase):
+        self.start(phase)
+        await asyncio.sleep(self.seconds)
+        return self.end(phase)
+
+    def index(self, event, key):
+        return self.events.index((event, key))
+
+
+def pipeline_with(recorder, tmp_path, **options):
+    pipeline = master.HRAutomationPipeline(str(tmp_path / "cv.pdf"), "SE", output_dir=str(tmp_path / "run"), **options)
+    pipeline.run_single_phase = recorder.run
+    pipeline.run_single_phase_async = recorder.run_async
+    return pipeline
+
+
+def run_graph(pipeline, mode):
+    return pipeline.run_phase_graph() if mode == "threads" else asyncio.run(pipeline.run_phase_graph_async())
+
+
+@pytest.mark.parametrize("mode", ["threads", "async"])
+def test_phases_start_once_their_requirements_succeed_and_independent_ones_overlap(tmp_path, mode):
+    recorder = PhaseRecorder()
+    pipeline = pipeline_with(recorder, tmp_path, max_parallel_phases=3)
+    assert run_graph(pipeline, mode) == 5
+
+    for phase in master.HRAutomationPipeline.PHASE_GRAPH:
+        for dependency in phase["requires"]:
+            assert recorder.index("end", dependency) < recorder.index("start", phase["key"])
+    # Phases 0, 2 and 4 need nothing and start together
+    assert {key for event, key in recorder.events[:3]} == {"phase_0", "phase_2", "phase_4"}
+    assert recorder.peak == 3
+
+
+@pytest.mark.parametrize("mode", ["threads", "async"])
+def test_max_parallel_phases_bounds_concurrency(tmp_path, mode):
+    recorder = PhaseRecorder()
+    pipeline = pipeline_with(recorder, tmp_path, max_parallel_phases=1)
+    assert run_graph(pipeline, mode) == 5
+    assert recorder.peak == 1
+
+
+@pytest.mark.parametrize("mode", ["threads", "async"])
+def test_a_failed_phase_skips_its_dependents_only(tmp_path, mode):
+    recorder = PhaseRecorder(failing={"phase_0"})
+    pipeline = pipeline_with(recorder, tmp_path)
+    assert run_graph(pipeline, mode) == 2
+    started = {key for event, key in recorder.events if event == "start"}
+    assert started == {"phase_0", "phase_2", "phase_4"}
+
+
+def test_phases_skipped_on_purpose_skip_their_dependents_without_failing(tmp_path):
+    recorder = PhaseRecorder()
+    pipeline = pipeline_with(recorder, tmp_path)
+    original_run = recorder.run
+
+    def run(phase):
+        if phase["key"] == "phase_1":
+            pipeline.skipped_phases["phase_1"] = "candidate rejected by the local pre-screen"
+        return original_run(phase)
+
+    pipeline.run_single_phase = run
+    assert pipeline.run_phase_graph() == 3
+    assert "phase_3" in pipeline.skipped_phases
+    assert ("start", "phase_3") not in recorder.events
+
+
+def test_critical_path_follows_the_slowest_dependency_chain(tmp_path):
+    pipeline = master.HRAutomationPipeline(str(tmp_path / "cv.pdf"), "SE", output_dir=str(tmp_path / "run"))
+    names = {phase["key"]: phase["name"] for phase in master.HRAutomationPipeline.PHASE_GRAPH}
+    pipeline.phase_timings = {names["phase_0"]: 3.0, names["phase_1"]: 2.0, names["phase_2"]: 4.0, names["phase_3"]: 1.0, names["phase_4"]: 5.5}
+    path, seconds = pipeline.compute_critical_path()
+    assert path == [names["phase_0"], names["phase_1"], names["phase_3"]]
+    assert seconds == pytest.approx(6.0)
+
+
+def test_async_run_keeps_file_and_store_io_off_the_event_loop(tmp_path, local_backend):
+    cv_file = tmp_path / "cv.pdf"
+    cv_file.write_bytes(b"%PDF-1.4 candidate")
+    pipeline = master.HRAutomationPipeline(str(cv_file), "SE", output_dir=str(tmp_path / "run"), store_results=False)
+    loop_threads = []
+    blocking_threads = {}
+
+    def on_thread(name):
+        method = getattr(pipeline, name)
+
+        def recorded(*args):
+            blocking_threads.setdefault(name, set()).add(threading.get_ident())
+            return method(*args)
+        setattr(pipeline, name, recorded)
+
+    for name in ("start_run", "finish_run", "start_phase_graph", "begin_phase", "save_checkpoint", "prepare_phase_0", "finish_phase_0",
+                 "finish_phase_1", "finish_phase_2", "finish_phase_3", "finish_phase_4"):
+        on_thread(name)
+
+    async def run():
+        loop_threads.append(threading.get_ident())
+        return await pipeline.run()
+
+    assert asyncio.run(run())
+    assert len(blocking_threads) == 11
+    assert not any(loop_threads[0] in threads for threads in blocking_threads.values())
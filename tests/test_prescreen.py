@@ -0,0 +1,57 @@
+"""Local pre-screen: the Phase 1 stand-in result of a reject and how the final report treats it"""
+
+import json
+
+import module_loader
+
+phase1 = module_loader.load_module("[PHASE_1][CODE]_Initial_Screening.py", "phase1")
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+results_store = master.results_store
+
+WEAK_CANDIDATE = {
+    "candidate_info": {
+        "personal_details": {"name": "Test Candidate"},
+        "education": [],
+        "work_experience": [{"company": "Bakery", "position": "Baker", "start_year": "2023", "end_year": "2024"}],
+        "skills": {"technical_skills": ["Baking"], "soft_skills": [], "languages": ["Vietnamese"], "japanese_proficiency": ""}
+    },
+    "minma_culture_fit_indicators": {},
+    "extraction_quality": {"completeness_score": "90", "confidence_level": "high"}
+}
+
+
+def test_reject_result_score_is_the_sum_of_its_breakdown():
+    triage = phase1.prescreen_rules.triage(WEAK_CANDIDATE, "Software Engineer", reject_below=101)
+    result = phase1.prescreen_screening_result(triage)
+    phase1.json_output.validate_schema(result, phase1.RESPONSE_SCHEMA)
+    assert result["screening_score"] == sum(component["score"] for component in result["score_breakdown"].values())
+    assert result["prescreen"] is triage
+
+
+def test_prescreen_reads_phase0_output_from_a_file_or_a_json_string(tmp_path):
+    path = tmp_path / "phase0.json"
+    path.write_text(json.dumps(WEAK_CANDIDATE), encoding="utf-8")
+    from_file = phase1.prescreen_candidate_phase1(str(path), "Software Engineer")
+    from_text = phase1.prescreen_candidate_phase1(json.dumps(WEAK_CANDIDATE), "Software Engineer")
+    assert from_file == from_text
+
+
+def test_store_keeps_no_screening_score_for_a_prescreen_reject():
+    triage = phase1.prescreen_rules.triage(WEAK_CANDIDATE, "Software Engineer", reject_below=101)
+    fields = results_store.candidate_fields({"phase_0": WEAK_CANDIDATE, "phase_1": phase1.prescreen_screening_result(triage)})
+    assert fields["screening_score"] is None
+
+
+def test_skip_reject_is_never_averaged_or_recommended_from_model_scores(tmp_path, local_backend, monkeypatch):
+    monkeypatch.setattr(master, "extract_cv_info_phase0", lambda *args, **kwargs: json.dumps(WEAK_CANDIDATE))
+    cv_file = tmp_path / "baker.pdf"
+    cv_file.write_bytes(b"%PDF-1.4 baker")
+    pipeline = master.HRAutomationPipeline(str(cv_file), "Software Engineer", output_dir=str(tmp_path / "run"), deduplicate=False,
+                                           prescreen="skip", prescreen_reject_below=101, store_results=False, resume=False)
+    assert pipeline.run_complete_pipeline()
+
+    report = pipeline.results["final_report"]
+    assert report["overall_assessment"]["recommendation"] == "REJECTED BY PRE-SCREEN"
+    assert "average_score" not in report["overall_assessment"]
+    assert report["phase_scores"]["screening_score"] == pipeline.results["phase_1"]["screening_score"]
+    assert pipeline.skipped_phases == {"phase_3": "candidate rejected by the local pre-screen"}
@@ -0,0 +1,156 @@
+"""Request scheduler: token-bucket budgets, retryable errors and jittered exponential backoff"""
+
+import asyncio
+
+import pytest
+
+import module_loader
+
+request_scheduler = module_loader.load_module("[SHARED][CODE]_Request_Scheduler.py", "request_scheduler")
+
+
+class FakeClock:
+    """Stands in for the time module: monotonic() only advances through sleep()"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeRandom:
+    """Stands in for the random module with a fixed jitter factor"""
+
+    def __init__(self, factor):
+        self.factor = factor
+        self.calls = []
+
+    def uniform(self, low, high):
+        self.calls.append((low, high))
+        return self.factor
+
+
+class Quota(Exception):
+    """Looks like a Vertex AI 429"""
+    code = 429
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(request_scheduler, "time", fake)
+    return fake
+
+
+def test_bucket_waits_for_refill_once_the_budget_is_spent(clock):
+    bucket = request_scheduler.TokenBucket(60)
+    assert [bucket.reserve(1) for _ in range(60)] == [0.0] * 60
+    # One request per second refills; reservations queue up behind each other
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    clock.now += 2.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_bucket_never_refills_past_capacity_and_caps_oversized_requests(clock):
+    bucket = request_scheduler.TokenBucket(600)
+    clock.now += 3600
+    assert bucket.reserve(600) == 0.0
+    assert bucket.reserve(1) == pytest.approx(0.1)
+    # A single request larger than the whole budget waits for one full minute at most
+    bucket = request_scheduler.TokenBucket(600)
+    assert bucket.reserve(10 ** 6) == 0.0
+    assert bucket.reserve(600) == pytest.approx(60.0)
+
+
+def test_scheduler_throttles_on_the_tighter_of_the_two_budgets(clock):
+    scheduler = request_scheduler.RequestScheduler(requests_per_minute=600, tokens_per_minute=6000)
+    call_stats = {}
+    for _ in range(2):
+        scheduler.execute(lambda: "ok", estimated_tokens=4000, call_stats=call_stats)
+    assert clock.sleeps == [pytest.approx(20.0)]
+    assert call_stats["throttle_seconds"] == pytest.approx(20.0)
+    assert scheduler.get_stats()["throttled_requests"] == 1
+
+
+def test_backoff_is_exponential_capped_and_jittered(clock, monkeypatch):
+    jitter = FakeRandom(0.5)
+    monkeypatch.setattr(request_scheduler, "random", jitter)
+    scheduler = request_scheduler.RequestScheduler(max_retries=10, base_backoff=1.0, max_backoff=8.0)
+    delays = [scheduler._backoff(Quota(), attempt, None) for attempt in range(6)]
+    assert delays == [0.5, 1.0, 2.0, 4.0, 4.0, 4.0]
+    assert set(jitter.calls) == {(0.5, 1.0)}
+
+
+def test_retryable_errors_are_retried_until_success_and_recorded(clock, monkeypatch):
+    monkeypatch.setattr(request_scheduler, "random", FakeRandom(1.0))
+    scheduler = request_scheduler.RequestScheduler(max_retries=3, base_backoff=1.0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Quota("quota")
+        return "ok"
+
+    call_stats = {}
+    assert scheduler.execute(flaky, call_stats=call_stats) == "ok"
+    assert clock.sleeps == [1.0, 2.0]
+    assert call_stats == {"retries": 2, "throttle_seconds": 0.0, "backoff_seconds": 3.0}
+    assert scheduler.get_stats()["retries"] == 2
+
+
+def test_non_retryable_errors_and_exhausted_retries_are_raised(clock, monkeypatch):
+    monkeypatch.setattr(request_scheduler, "random", FakeRandom(1.0))
+    scheduler = request_scheduler.RequestScheduler(max_retries=2)
+
+    def invalid():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.execute(invalid)
+    assert clock.sleeps == []
+
+    def always_quota():
+        raise Quota("quota")
+
+    with pytest.raises(Quota):
+        scheduler.execute(always_quota)
+    assert len(clock.sleeps) == 2
+    assert scheduler.get_stats()["failures"] == 2
+
+
+def test_async_retries_wait_without_blocking_the_loop(clock, monkeypatch):
+    monkeypatch.setattr(request_scheduler, "random", FakeRandom(1.0))
+    scheduler = request_scheduler.RequestScheduler(max_retries=2, base_backoff=0.001)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise Quota("quota")
+        return "ok"
+
+    async def run_with_ticker():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        ticking = asyncio.ensure_future(ticker())
+        result = await scheduler.execute_async(flaky)
+        ticking.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run_with_ticker())
+    assert result == "ok" and len(attempts) == 2
+    # The loop kept running other tasks during the backoff; the blocking sleep was never used
+    assert ticks and clock.sleeps == []
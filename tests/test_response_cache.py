@@ -0,0 +1,104 @@
+"""Response cache: content-addressed keys, LRU eviction by size, TTL expiry and bypass"""
+
+import os
+import time
+
+import pytest
+
+import module_loader
+
+vertex_client = module_loader.load_module("[SHARED][CODE]_Vertex_Client.py", "vertex_client")
+response_cache = vertex_client.response_cache
+
+
+class Part:
+    """Binary content part (the shape of a Vertex AI Part.from_data)"""
+
+    def __init__(self, data, mime_type="application/pdf"):
+        self.data = data
+        self.mime_type = mime_type
+
+
+def set_age(cache, key, seconds_ago):
+    """Backdate an entry's last use (the LRU order)"""
+    timestamp = time.time() - seconds_ago
+    os.utime(cache._entry_path(key), (timestamp, timestamp))
+
+
+def test_key_changes_with_every_input_that_affects_the_output():
+    base = response_cache.make_cache_key("gemini-2.5-pro", "system", ["text", Part(b"pdf")], {"temperature": 0.1})
+    assert base == response_cache.make_cache_key("gemini-2.5-pro", "system", ["text", Part(b"pdf")], {"temperature": 0.1})
+    assert len({
+        base,
+        response_cache.make_cache_key("gemini-2.5-flash", "system", ["text", Part(b"pdf")], {"temperature": 0.1}),
+        response_cache.make_cache_key("gemini-2.5-pro", "other", ["text", Part(b"pdf")], {"temperature": 0.1}),
+        response_cache.make_cache_key("gemini-2.5-pro", "system", ["text", Part(b"other pdf")], {"temperature": 0.1}),
+        response_cache.make_cache_key("gemini-2.5-pro", "system", ["text", Part(b"pdf")], {"temperature": 0.2}),
+        response_cache.make_cache_key("gemini-2.5-pro", "system", ["text", Part(b"pdf", "image/png")], {"temperature": 0.1})
+    }) == 6
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = response_cache.ResponseCache(str(tmp_path), max_bytes=10 ** 6)
+    for key in ("old", "used", "new"):
+        cache.put(key, "x" * 200)
+    set_age(cache, "old", 30)
+    set_age(cache, "used", 20)
+    set_age(cache, "new", 10)
+    assert cache.get("used") == "x" * 200
+
+    # Room for two entries: the next write evicts the least recently used one only
+    cache.max_bytes = 2 * os.path.getsize(cache._entry_path("new")) + 10
+    cache.put("newest", "x" * 200)
+    assert cache.get("old") is None
+    assert cache.get("used") == "x" * 200
+    assert cache.get("new") is None
+    assert cache.get("newest") == "x" * 200
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_expired_entries_are_removed_on_read(tmp_path):
+    cache = response_cache.ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put("key", "text")
+    assert cache.get("key") == "text"
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert not os.path.exists(cache._entry_path("key"))
+    assert cache.get_stats()["expired"] == 1
+    assert cache.get_stats()["size_bytes"] == 0
+
+
+def test_bypass_neither_reads_nor_writes(tmp_path):
+    cache = response_cache.ResponseCache(str(tmp_path), enabled=False)
+    cache.put("key", "text")
+    assert cache.get("key") is None
+    assert not os.path.exists(cache._entry_path("key"))
+    assert cache.get_stats()["bypassed"] == 1
+
+
+@pytest.fixture
+def cached_backend(local_backend, tmp_path):
+    """The local backend behind an enabled response cache in a fresh directory"""
+    shared = response_cache.shared_cache
+    previous = shared.cache_dir
+    response_cache.configure(cache_dir=str(tmp_path / "cache"), enabled=True)
+    yield local_backend
+    response_cache.configure(cache_dir=previous, enabled=False)
+
+
+def test_client_serves_repeated_calls_from_the_cache_unless_asked_not_to(cached_backend):
+    arguments = (["Summarize"],)
+    settings = {"model_name": "gemini-2.5-pro", "system_prompt": "system", "phase": "phase_2"}
+    first = vertex_client.generate_content(*arguments, **settings).text
+    assert vertex_client.generate_content(*arguments, **settings).text == first
+    assert cached_backend.stats["calls"] == 1
+
+    vertex_client.generate_content(*arguments, use_cache=False, **settings)
+    assert cached_backend.stats["calls"] == 2
+
+    # A rejected response (cache_if false) is returned but never stored
+    vertex_client.generate_content(["Other"], cache_if=lambda text: False, **settings)
+    vertex_client.generate_content(["Other"], **settings)
+    assert cached_backend.stats["calls"] == 4
@@ -0,0 +1,102 @@
+"""Results store: rows keyed by CV content, queries, legacy migration and the pipeline reading back from it"""
+
+import sqlite3
+
+import module_loader
+
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+results_store = master.results_store
+
+SCREENING = {"screening_score": 82, "flags_for_human_review": [{"flag_type": "gap", "message": "2019 gap"}]}
+CANDIDATE = {"candidate_info": {"skills": {"japanese_proficiency": "JLPT N2"}, "work_experience": []}}
+
+
+def test_same_candidate_id_with_different_cvs_keeps_both_rows(tmp_path):
+    store = results_store.ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.save_candidate("cv", "a" * 64, "SE", {"phase_1": SCREENING})
+    store.save_candidate("cv", "b" * 64, "SE", {"phase_1": dict(SCREENING, screening_score=60)})
+
+    rows = store.query(job_description="SE", candidate_ids=["cv"])
+    assert [(row["cv_sha256"][0], row["screening_score"]) for row in rows] == [("a", 82), ("b", 60)]
+    assert store.get_results("a" * 64, "SE")["phase_1"]["screening_score"] == 82
+
+
+def test_rerun_of_the_same_cv_replaces_its_row_results_and_flags(tmp_path):
+    store = results_store.ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.save_candidate("first_name", "a" * 64, "SE", {"phase_0": CANDIDATE, "phase_1": SCREENING})
+    store.save_candidate("renamed", "a" * 64, "SE", {"phase_1": dict(SCREENING, flags_for_human_review=[])})
+
+    rows = store.query(job_description="SE")
+    assert [row["candidate_id"] for row in rows] == ["renamed"]
+    assert rows[0]["flag_count"] == 0
+    assert set(store.get_results("a" * 64, "SE")) == {"phase_1"}
+    assert store.query(flag_type="gap") == []
+
+
+def test_query_filters_and_update_candidate(tmp_path):
+    store = results_store.ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.save_candidates([
+        {"candidate_id": "n2", "cv_sha256": "a" * 64, "job_description": "SE", "results": {"phase_0": CANDIDATE, "phase_1": SCREENING}},
+        {"candidate_id": "low", "cv_sha256": "b" * 64, "job_description": "SE", "results": {"phase_1": {"screening_score": 40}}},
+        {"candidate_id": "other_job", "cv_sha256": "a" * 64, "job_description": "QA", "results": {"phase_1": SCREENING}}
+    ])
+
+    assert [row["candidate_id"] for row in store.query(job_description="SE", min_screening_score=80, max_jlpt_level="N2")] == ["n2"]
+    assert [row["candidate_id"] for row in store.query(job_description="SE", flag_type="gap")] == ["n2"]
+    assert [row["candidate_id"] for row in store.query(job_description="SE", without_flags=True)] == ["low"]
+
+    assert store.update_candidate("b" * 64, "SE", average_score=41.5, recommendation="NOT RECOMMENDED")
+    assert not store.update_candidate("c" * 64, "SE", average_score=1)
+    assert store.get_candidate("b" * 64, "SE")["recommendation"] == "NOT RECOMMENDED"
+    assert store.get_candidate("a" * 64, "QA")["average_score"] is None
+
+
+def test_store_keyed_on_candidate_id_is_migrated(tmp_path):
+    db_path = str(tmp_path / "legacy.sqlite3")
+    connection = sqlite3.connect(db_path)
+    connection.executescript("""
+        CREATE TABLE candidates (candidate_id TEXT NOT NULL, job_key TEXT NOT NULL, job_description TEXT, cv_file TEXT, run_id TEXT,
+            updated_at REAL, screening_score INTEGER, assessment_score INTEGER, average_score REAL, recommendation TEXT,
+            jlpt_level INTEGER, japanese_proficiency TEXT, experience_years REAL, flag_count INTEGER, prescreen_action TEXT,
+            estimated_cost_usd REAL, PRIMARY KEY (candidate_id, job_key));
+        CREATE TABLE phase_results (candidate_id TEXT NOT NULL, job_key TEXT NOT NULL, phase TEXT NOT NULL, result TEXT NOT NULL,
+            PRIMARY KEY (candidate_id, job_key, phase));
+        CREATE TABLE flags (candidate_id TEXT NOT NULL, job_key TEXT NOT NULL, phase TEXT NOT NULL, flag_type TEXT, message TEXT);
+        CREATE INDEX idx_candidates_screening ON candidates (job_key, screening_score);
+    """)
+    key = results_store.job_key("SE")
+    connection.execute("INSERT INTO candidates (candidate_id, job_key, screening_score, flag_count) VALUES ('old', ?, 70, 1)", (key,))
+    connection.execute("INSERT INTO phase_results VALUES ('old', ?, 'phase_1', '{\"screening_score\": 70}')", (key,))
+    connection.execute("INSERT INTO flags VALUES ('old', ?, 'phase_1', 'gap', 'x')", (key,))
+    connection.commit()
+    connection.close()
+
+    store = results_store.ResultsStore(db_path)
+    assert store.get_results("legacy:old", "SE") == {"phase_1": {"screening_score": 70}}
+    assert [row["candidate_id"] for row in store.query(job_description="SE", flag_type="gap")] == ["old"]
+    store.save_candidate("old", "a" * 64, "SE", {"phase_1": SCREENING})
+    assert len(store.query(job_description="SE", candidate_ids=["old"])) == 2
+    indexes = {row["name"] for row in store._connect().execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_candidates_screening", "idx_flags_type"} <= indexes
+
+
+def test_final_report_scores_come_from_the_store_and_unselected_phases_load_from_it(tmp_path, local_backend, monkeypatch):
+    store = results_store.ResultsStore(str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(results_store, "_shared_store", store)
+    cv_file = tmp_path / "cv.pdf"
+    cv_file.write_bytes(b"%PDF-1.4 candidate")
+    pipeline = master.HRAutomationPipeline(str(cv_file), "SE", output_dir=str(tmp_path / "first"), deduplicate=False, resume=False)
+    assert pipeline.run_complete_pipeline()
+
+    report = pipeline.results["final_report"]
+    row = store.get_candidate(pipeline.cv_sha256, "SE")
+    assert report["phase_scores"]["screening_score"] == row["screening_score"]
+    assert report["phase_scores"]["assessment_score"] == row["assessment_score"]
+    assert report["overall_assessment"]["average_score"] == row["average_score"]
+    assert report["results_store"]["cv_sha256"] == pipeline.cv_sha256
+
+    # Phase 3 alone in a fresh directory reads Phase 1 and Phase 2 back from the store
+    rerun = master.HRAutomationPipeline(str(cv_file), "SE", output_dir=str(tmp_path / "second"), deduplicate=False, resume=False, phases="3")
+    assert rerun.run_complete_pipeline()
+    assert rerun.checkpoint_status["phase_1"]["reason"] == "not selected; read from the results store"
+    assert rerun.results["phase_1"] == pipeline.results["phase_1"]
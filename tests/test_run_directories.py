@@ -0,0 +1,49 @@
+"""Per-candidate run directories and the atomic writers shared by the caches and call metrics"""
+
+import os
+import json
+
+import module_loader
+
+master = module_loader.load_module("[MASTER][CODE]_HR_Automation_System.py", "hr_master")
+call_metrics = master.vertex_client.call_metrics
+response_cache = master.vertex_client.response_cache
+artifact_cache = module_loader.load_module("[SHARED][CODE]_Artifact_Cache.py", "artifact_cache")
+
+
+def test_same_file_name_with_different_content_or_job_gets_its_own_run_directory(tmp_path):
+    first, second = tmp_path / "a" / "cv.pdf", tmp_path / "b" / "cv.pdf"
+    for path, content in ((first, b"%PDF-1.4 first"), (second, b"%PDF-1.4 second")):
+        path.parent.mkdir()
+        path.write_bytes(content)
+
+    directories = {
+        master.HRAutomationPipeline(str(first), "SE").output_dir,
+        master.HRAutomationPipeline(str(second), "SE").output_dir,
+        master.HRAutomationPipeline(str(first), "QA").output_dir
+    }
+    assert len(directories) == 3
+    assert all(os.path.basename(directory).startswith("cv-") for directory in directories)
+    # A rerun of the same CV and job finds its checkpoints in the same directory
+    assert master.HRAutomationPipeline(str(first), "SE ").output_dir in directories
+
+
+def test_writers_replace_whole_files_and_leave_no_temp_files(tmp_path):
+    metrics_file = str(tmp_path / "calls.jsonl")
+    call_metrics.write_jsonl(metrics_file, [{"call": 1}, {"call": 2}])
+    call_metrics.write_jsonl(metrics_file, [{"call": 3}])
+    call_metrics.write_jsonl(metrics_file, [{"call": 4}], mode="a")
+    with open(metrics_file, encoding="utf-8") as f:
+        assert [json.loads(line)["call"] for line in f] == [3, 4]
+
+    cache = response_cache.ResponseCache(str(tmp_path / "responses"))
+    cache.put("key", "text", "gemini-2.5-pro")
+    cache.put("key", "newer", "gemini-2.5-pro")
+    assert cache.get("key") == "newer"
+
+    artifacts = artifact_cache.ArtifactCache(str(tmp_path / "artifacts"))
+    artifacts.put("checklist", "profile", {"items": []}, "v1")
+    assert artifact_cache.ArtifactCache(str(tmp_path / "artifacts")).get("checklist", "profile", "v1") == {"items": []}
+
+    leftovers = [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith(".tmp")]
+    assert leftovers == []
@@ -0,0 +1,111 @@
+"""Pipeline service: request parsing, server-side paths confined to the input root and concurrent job submissions"""
+
+import os
+import json
+import base64
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+import module_loader
+
+service_module = module_loader.load_module("[SERVICE][CODE]_HR_Pipeline_Service.py", "hr_service")
+
+PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+@pytest.fixture
+def input_root(tmp_path, monkeypatch):
+    """Confine server-side paths to tmp_path/inputs for one test"""
+    root = tmp_path / "inputs"
+    root.mkdir()
+    monkeypatch.setitem(service_module._settings, "input_root", os.path.realpath(root))
+    monkeypatch.setitem(service_module._settings, "allow_paths", True)
+    return root
+
+
+def status_of(coroutine):
+    """HTTP status a dispatch raises"""
+    with pytest.raises(service_module.RequestError) as error:
+        asyncio.run(coroutine)
+    return error.value.status
+
+
+def test_paths_outside_the_input_root_are_refused(input_root, tmp_path, local_backend):
+    (input_root / "cv.pdf").write_bytes(PDF)
+    (tmp_path / "secret.txt").write_text("secret", encoding="utf-8")
+    (input_root / "link.pdf").symlink_to(tmp_path / "secret.txt")
+    service = service_module.PipelineService()
+
+    for path in ("/etc/passwd", "../secret.txt", str(tmp_path / "secret.txt"), "link.pdf"):
+        assert status_of(service.dispatch("POST", "/phase0/extract", {"pdfPath": path})) == HTTPStatus.FORBIDDEN
+    assert status_of(service.dispatch("POST", "/phase1/screen", {"candidateJsonPath": "/etc/passwd"})) == HTTPStatus.FORBIDDEN
+    assert status_of(service.dispatch("POST", "/jobs", {"cvPath": "/etc/passwd"})) == HTTPStatus.FORBIDDEN
+    assert status_of(service.dispatch("POST", "/phase0/extract", {"pdfPath": "missing.pdf"})) == HTTPStatus.NOT_FOUND
+    assert local_backend.stats["calls"] == 0
+
+    assert service_module.resolve_input_path("cv.pdf", "pdfPath") == os.path.realpath(input_root / "cv.pdf")
+    status, _ = asyncio.run(service.dispatch("POST", "/phase0/extract", {"pdfPath": "cv.pdf"}))
+    assert status == HTTPStatus.OK
+
+
+def test_upload_only_mode_refuses_every_path(input_root, local_backend, monkeypatch):
+    (input_root / "cv.pdf").write_bytes(PDF)
+    monkeypatch.setitem(service_module._settings, "allow_paths", False)
+    service = service_module.PipelineService()
+    assert status_of(service.dispatch("POST", "/phase0/extract", {"pdfPath": "cv.pdf"})) == HTTPStatus.FORBIDDEN
+    status, _ = asyncio.run(service.dispatch("POST", "/phase0/extract", {"pdfBase64": base64.b64encode(PDF).decode()}))
+    assert status == HTTPStatus.OK
+    status, _ = asyncio.run(service.dispatch("POST", "/phase1/screen", {"candidateJsonPath": json.dumps({"name": "A"})}))
+    assert status == HTTPStatus.OK
+
+
+def test_only_loopback_hosts_count_as_local():
+    assert service_module.is_loopback("127.0.0.1") and service_module.is_loopback("::1") and service_module.is_loopback("localhost")
+    assert not service_module.is_loopback("0.0.0.0") and not service_module.is_loopback("example.com")
+
+
+def test_concurrent_jobs_for_one_candidate_get_their_own_ids_and_run_directories(input_root, local_backend):
+    service = service_module.PipelineService()
+    body = {"cvBase64": base64.b64encode(PDF).decode(), "candidateId": "same", "prescreen": "off", "storeResults": False}
+
+    async def submit_both():
+        submitted = await asyncio.gather(service.dispatch("POST", "/jobs", body), service.dispatch("POST", "/jobs", body))
+        await asyncio.gather(*service._job_tasks)
+        return [service.jobs[payload["job_id"]] for _, payload in submitted]
+
+    jobs = asyncio.run(submit_both())
+    assert sorted(job["candidate_id"] for job in jobs) == ["same", "same_2"]
+    assert len({job["output_dir"] for job in jobs}) == 2
+    assert all(job["success"] for job in jobs)
+    assert all(os.path.isfile(os.path.join(job["output_dir"], service_module.UPLOADED_CV_FILE)) for job in jobs)
+
+
+def test_rejected_job_writes_no_upload(input_root, local_backend):
+    service = service_module.PipelineService()
+    body = {"cvBase64": base64.b64encode(PDF).decode(), "candidateId": "bad_options", "prescreen": "sometimes"}
+    assert status_of(service.dispatch("POST", "/jobs", body)) == HTTPStatus.BAD_REQUEST
+    assert service.jobs == {}
+    runs_root = service_module.master.RUNS_ROOT
+    assert not any(name.startswith("bad_options") for name in (os.listdir(runs_root) if os.path.isdir(runs_root) else []))
+
+
+def read(service, raw):
+    """Parse one raw request with read_request"""
+    async def parse():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await service.read_request(reader)
+    return parse()
+
+
+def test_content_length_must_be_a_non_negative_integer():
+    service = service_module.PipelineService()
+    body = b'{"a": 1}'
+    request = b"POST /jobs HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    assert asyncio.run(read(service, request)) == ("POST", "/jobs", body, True)
+    for length in (b"ten", b"-5", b"1.5"):
+        raw = b"POST /jobs HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n" + body
+        assert status_of(read(service, raw)) == HTTPStatus.BAD_REQUEST